@@ -0,0 +1,41 @@
+"""Responsibility: aggregate evaluation result files column-wise and compare variants."""
+
+import argparse
+import json
+
+from kiboedge_toolcall_kit.evaluation_columnar_metrics import load_result_columns, summarize_result_columns
+from kiboedge_toolcall_kit.io_utils import build_timestamp_suffix, write_json_file
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument(
+        "result_file_paths",
+        nargs="+",
+        help="evaluation_*.jsonl streams or summary .json files; each file stem is treated as one variant.",
+    )
+    argument_parser.add_argument(
+        "--baseline-variant",
+        default=None,
+        help="Variant (file stem) that every other variant is paired against.",
+    )
+    argument_parser.add_argument(
+        "--output-directory",
+        default="logs/evaluations",
+        help="Directory for the aggregated analysis JSON.",
+    )
+    command_line_arguments = argument_parser.parse_args()
+
+    result_columns = load_result_columns(command_line_arguments.result_file_paths)
+    analysis_report = summarize_result_columns(
+        result_columns,
+        baseline_variant_name=command_line_arguments.baseline_variant,
+    )
+    analysis_file_path = f"{command_line_arguments.output_directory}/analysis_{build_timestamp_suffix()}.json"
+    write_json_file(analysis_file_path, analysis_report)
+    print(json.dumps(analysis_report["success_rates"]["variant"], ensure_ascii=True, indent=2))
+    print(f"analysis_file_path={analysis_file_path}")
+
+
+if __name__ == "__main__":
+    main()
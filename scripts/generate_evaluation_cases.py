@@ -0,0 +1,30 @@
+"""Responsibility: generate a large synthetic evaluation case stream (JSONL) for load and regression runs."""
+
+import argparse
+import time
+
+from kiboedge_toolcall_kit.evaluation_dataset import write_synthetic_case_file
+from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--case-count", type=int, default=10_000)
+    argument_parser.add_argument("--seed", type=int, default=0, help="Same seed and tool catalog give the same file.")
+    argument_parser.add_argument("--output", default="logs/datasets/tool_call_cases_synthetic.jsonl")
+    command_line_arguments = argument_parser.parse_args()
+
+    generation_started_time = time.perf_counter()
+    written_case_count = write_synthetic_case_file(
+        output_file_path=command_line_arguments.output,
+        tool_schemas=build_tool_schemas(),
+        case_count=command_line_arguments.case_count,
+        random_seed=command_line_arguments.seed,
+    )
+    print(f"case_count={written_case_count}")
+    print(f"elapsed_seconds={time.perf_counter() - generation_started_time:.2f}")
+    print(f"case_file_path={command_line_arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
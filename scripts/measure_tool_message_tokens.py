@@ -0,0 +1,90 @@
+"""Responsibility: compare follow-up tool-message sizes across encodings on the evaluation fixture."""
+
+import argparse
+import json
+from typing import Any
+
+from kiboedge_toolcall_kit.io_utils import read_json_file
+from kiboedge_toolcall_kit.tool_message_encoding import TOOL_MESSAGE_ENCODING_NAMES, ToolMessageEncoder
+from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
+from kiboedge_toolcall_kit.tools import DummyDataStores, build_tool_executor_map
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+def build_sample_arguments(tool_schema: dict[str, Any], user_prompt: str) -> dict[str, Any]:
+    """Fill every declared argument; free-text fields reuse the (Japanese) case prompt."""
+    sample_arguments: dict[str, Any] = {}
+    for property_name, property_schema in tool_schema["function"]["parameters"]["properties"].items():
+        if "enum" in property_schema:
+            sample_arguments[property_name] = property_schema["enum"][0]
+        elif property_schema.get("type") == "object":
+            sample_arguments[property_name] = {"note": user_prompt}
+        elif property_schema.get("type") in ("integer", "number"):
+            sample_arguments[property_name] = 1
+        else:
+            sample_arguments[property_name] = user_prompt
+    return sample_arguments
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--case-file", default="tests/fixtures/tool_call_cases_30.json")
+    argument_parser.add_argument(
+        "--tiktoken-encoding",
+        default="cl100k_base",
+        help="Token counts use this tiktoken encoding when tiktoken is installed (a proxy for the served model).",
+    )
+    command_line_arguments = argument_parser.parse_args()
+
+    tool_schema_by_name = {tool_schema["function"]["name"]: tool_schema for tool_schema in build_tool_schemas()}
+    tool_executor_map = build_tool_executor_map(DummyDataStores())
+    token_encoding = None
+    if tiktoken is not None:
+        try:
+            token_encoding = tiktoken.get_encoding(command_line_arguments.tiktoken_encoding)
+        except Exception:
+            # Guard: encodings download on first use; offline hosts still get character and byte counts.
+            token_encoding = None
+
+    replayed_payloads: list[tuple[str, dict[str, Any], dict[str, Any]]] = []
+    for raw_case_object in read_json_file(command_line_arguments.case_file):
+        tool_name = raw_case_object["expected_tool_name"]
+        # Guard: no-tool cases replay nothing to the model.
+        if not raw_case_object.get("should_call_tool", True) or tool_name not in tool_schema_by_name:
+            continue
+        sample_arguments = build_sample_arguments(tool_schema_by_name[tool_name], raw_case_object["user_prompt"])
+        replayed_payloads.append((tool_name, sample_arguments, tool_executor_map[tool_name](sample_arguments)))
+
+    size_report: dict[str, dict[str, int]] = {}
+    for encoding_name in TOOL_MESSAGE_ENCODING_NAMES:
+        tool_message_encoder = ToolMessageEncoder(encoding_name=encoding_name)
+        encoded_texts = [
+            tool_message_encoder.encode_arguments(sample_arguments)
+            + tool_message_encoder.encode_tool_result(tool_name, tool_result_payload)
+            for tool_name, sample_arguments, tool_result_payload in replayed_payloads
+        ]
+        size_report[encoding_name] = {
+            "characters": sum(len(encoded_text) for encoded_text in encoded_texts),
+            "utf8_bytes": sum(len(encoded_text.encode("utf-8")) for encoded_text in encoded_texts),
+        }
+        if token_encoding is not None:
+            size_report[encoding_name]["tokens"] = sum(
+                len(token_encoding.encode(encoded_text)) for encoded_text in encoded_texts
+            )
+
+    baseline_sizes = size_report[TOOL_MESSAGE_ENCODING_NAMES[0]]
+    for encoding_name, encoding_sizes in size_report.items():
+        encoding_sizes_with_savings: dict[str, Any] = dict(encoding_sizes)
+        for size_name, size_value in encoding_sizes.items():
+            encoding_sizes_with_savings[f"{size_name}_saved_ratio"] = round(1 - size_value / baseline_sizes[size_name], 3)
+        size_report[encoding_name] = encoding_sizes_with_savings
+
+    print(json.dumps({"replayed_case_count": len(replayed_payloads), "sizes": size_report}, ensure_ascii=True, indent=2))
+
+
+if __name__ == "__main__":
+    main()
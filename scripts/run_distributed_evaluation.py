@@ -0,0 +1,135 @@
+"""Responsibility: run one evaluation across many worker processes/hosts through a shared SQLite work queue."""
+
+import argparse
+from dataclasses import asdict
+import json
+import os
+import socket
+import subprocess
+import sys
+
+from kiboedge_toolcall_kit import EvaluationRunner, RuntimeConfiguration, ToolCallEngine
+from kiboedge_toolcall_kit.evaluation_dataset import iter_evaluation_cases, parse_case_shard
+from kiboedge_toolcall_kit.evaluation_work_queue import build_evaluation_work_queue, summarize_work_queue
+from kiboedge_toolcall_kit.lfm_tool_call_parser import LfmToolCallParser
+from kiboedge_toolcall_kit.load_balancing import build_chat_client
+from kiboedge_toolcall_kit.tool_execution import build_tool_execution_lanes
+from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
+from kiboedge_toolcall_kit.tools import BUILTIN_TOOL_REGISTRY, DummyDataStores, build_tool_executor_map
+
+
+def enqueue_cases(command_line_arguments: argparse.Namespace, runtime_configuration: RuntimeConfiguration) -> None:
+    evaluation_cases = iter_evaluation_cases(
+        command_line_arguments.case_file or runtime_configuration.evaluation_case_file_path,
+        case_shard=command_line_arguments.shard,
+        sample_rate=command_line_arguments.sample_rate,
+        sample_seed=runtime_configuration.evaluation_sample_seed,
+        max_cases=command_line_arguments.max_cases,
+    )
+    with build_evaluation_work_queue(runtime_configuration, command_line_arguments.queue) as work_queue:
+        enqueued_case_count = work_queue.enqueue_cases(evaluation_cases)
+        print(f"enqueued_case_count={enqueued_case_count}")
+        print(f"case_counts_by_state={json.dumps(work_queue.count_cases_by_state())}")
+
+
+def run_worker(command_line_arguments: argparse.Namespace, runtime_configuration: RuntimeConfiguration) -> None:
+    worker_identifier = command_line_arguments.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    with build_tool_execution_lanes(runtime_configuration) as tool_execution_lanes:
+        tool_call_engine = ToolCallEngine(
+            runtime_configuration=runtime_configuration,
+            chat_client=build_chat_client(runtime_configuration),
+            tool_schemas=build_tool_schemas(),
+            tool_executor_map=build_tool_executor_map(DummyDataStores(), tool_execution_lanes),
+            parser=LfmToolCallParser(),
+            tool_argument_coercer=BUILTIN_TOOL_REGISTRY.coerce_arguments,
+        )
+        evaluation_runner = EvaluationRunner(
+            runtime_configuration=runtime_configuration,
+            tool_call_engine=tool_call_engine,
+        )
+        with build_evaluation_work_queue(runtime_configuration, command_line_arguments.queue) as work_queue:
+            completed_case_count = evaluation_runner.run_queue_worker(work_queue, worker_identifier)
+    print(f"worker_id={worker_identifier} completed_case_count={completed_case_count}")
+
+
+def summarize_queue(command_line_arguments: argparse.Namespace, runtime_configuration: RuntimeConfiguration) -> None:
+    with build_evaluation_work_queue(runtime_configuration, command_line_arguments.queue) as work_queue:
+        evaluation_summary, _, result_file_path = summarize_work_queue(work_queue)
+        print(f"case_counts_by_state={json.dumps(work_queue.count_cases_by_state())}")
+    print(json.dumps(asdict(evaluation_summary), ensure_ascii=True, indent=2))
+    print(f"result_file_path={result_file_path}")
+
+
+def run_local_workers(command_line_arguments: argparse.Namespace, runtime_configuration: RuntimeConfiguration) -> None:
+    """Enqueue, start ``--local-workers`` worker processes (backends assigned round-robin), then summarize."""
+    enqueue_cases(command_line_arguments, runtime_configuration)
+    backend_base_urls = command_line_arguments.backend_url or [runtime_configuration.base_url]
+    worker_processes = []
+    for worker_index in range(command_line_arguments.local_workers):
+        worker_command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "work",
+            "--queue",
+            command_line_arguments.queue,
+            "--worker-id",
+            f"{socket.gethostname()}-local{worker_index}",
+            "--backend-url",
+            backend_base_urls[worker_index % len(backend_base_urls)],
+            "--request-timeout-seconds",
+            str(command_line_arguments.request_timeout_seconds),
+            "--journal-mode",
+            command_line_arguments.journal_mode,
+        ]
+        if command_line_arguments.skip_warmup:
+            worker_command.append("--skip-warmup")
+        worker_processes.append(subprocess.Popen(worker_command))
+    for worker_process in worker_processes:
+        worker_process.wait()
+    summarize_queue(command_line_arguments, runtime_configuration)
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("command", choices=("enqueue", "work", "summarize", "run-local"))
+    argument_parser.add_argument("--queue", default="logs/evaluations/work_queue.sqlite3", help="Shared queue file.")
+    argument_parser.add_argument("--case-file", default=None, help="Case fixture (.json) or case stream (.jsonl).")
+    argument_parser.add_argument("--shard", type=parse_case_shard, default=None, help="Enqueue only shard i/N.")
+    argument_parser.add_argument("--sample-rate", type=float, default=1.0)
+    argument_parser.add_argument("--max-cases", type=int, default=None)
+    argument_parser.add_argument("--worker-id", default=None, help="Defaults to <hostname>-<pid>.")
+    argument_parser.add_argument("--local-workers", type=int, default=2, help="Worker processes for run-local.")
+    argument_parser.add_argument(
+        "--backend-url",
+        action="append",
+        default=None,
+        help="OpenAI-compatible base URL for this worker; for run-local, repeat to give workers their own backend.",
+    )
+    argument_parser.add_argument("--request-timeout-seconds", type=float, default=12.0)
+    argument_parser.add_argument(
+        "--journal-mode",
+        default=RuntimeConfiguration().work_queue_journal_mode,
+        help="wal on one host; delete when the queue file sits on a network share.",
+    )
+    argument_parser.add_argument("--skip-warmup", action="store_true")
+    command_line_arguments = argument_parser.parse_args()
+
+    runtime_configuration = RuntimeConfiguration(
+        request_timeout_seconds=command_line_arguments.request_timeout_seconds,
+        warmup_before_evaluation=not command_line_arguments.skip_warmup,
+        backend_base_urls=tuple(command_line_arguments.backend_url or ())
+        if command_line_arguments.command == "work"
+        else (),
+        work_queue_journal_mode=command_line_arguments.journal_mode,
+    )
+    command_handler_by_name = {
+        "enqueue": enqueue_cases,
+        "work": run_worker,
+        "summarize": summarize_queue,
+        "run-local": run_local_workers,
+    }
+    command_handler_by_name[command_line_arguments.command](command_line_arguments, runtime_configuration)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,17 @@
-"""Responsibility: run the 30-case strict-success evaluation from the command line."""
+"""Responsibility: run the strict-success evaluation (30-case fixture or a generated JSONL stream) from the command line."""
 
 import argparse
 from dataclasses import asdict
 import json
 
 from kiboedge_toolcall_kit import EvaluationRunner, RuntimeConfiguration, ToolCallEngine
+from kiboedge_toolcall_kit.evaluation_dataset import parse_case_shard
 from kiboedge_toolcall_kit.lfm_tool_call_parser import LfmToolCallParser
-from kiboedge_toolcall_kit.lmstudio_client import LmStudioChatClient
+from kiboedge_toolcall_kit.load_balancing import build_chat_client
 from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
-from kiboedge_toolcall_kit.tools import DummyDataStores, build_tool_executor_map
+from kiboedge_toolcall_kit.tool_execution import build_tool_execution_lanes
+from kiboedge_toolcall_kit.trace_logging import build_runtime_trace_logger
+from kiboedge_toolcall_kit.tools import BUILTIN_TOOL_REGISTRY, DummyDataStores, build_tool_executor_map
 
 
 def main() -> None:
@@ -19,37 +22,98 @@ def main() -> None:
         default=1,
         help="Limit number of evaluation cases for faster iteration.",
     )
+    argument_parser.add_argument(
+        "--case-file",
+        default=None,
+        help="Case fixture (.json) or generated case stream (.jsonl); defaults to the 30-case fixture.",
+    )
+    argument_parser.add_argument(
+        "--shard",
+        type=parse_case_shard,
+        default=None,
+        help="Run only shard i of N (zero-based, e.g. 0/4); shards are stable per case identifier.",
+    )
+    argument_parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=1.0,
+        help="Deterministically keep this fraction of cases (0 < rate <= 1).",
+    )
     argument_parser.add_argument(
         "--request-timeout-seconds",
         type=float,
         default=12.0,
         help="Per-request timeout to avoid heavy hangs on local PC.",
     )
+    argument_parser.add_argument(
+        "--resume",
+        default=None,
+        help="Append to an existing evaluation_*.jsonl stream and skip cases already recorded there.",
+    )
+    argument_parser.add_argument(
+        "--fsync-results",
+        action="store_true",
+        help="fsync the result stream after every case (slower, survives power loss).",
+    )
+    argument_parser.add_argument(
+        "--backend-url",
+        action="append",
+        default=None,
+        help="OpenAI-compatible base URL; repeat to load-balance across several machines.",
+    )
+    argument_parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write per-case engine traces to logs/traces/*.jsonl.gz from a background thread.",
+    )
+    argument_parser.add_argument(
+        "--skip-warmup",
+        action="store_true",
+        help="Do not wait for the model or send priming requests before the first case.",
+    )
     command_line_arguments = argument_parser.parse_args()
 
     runtime_configuration = RuntimeConfiguration(
         request_timeout_seconds=command_line_arguments.request_timeout_seconds,
+        fsync_evaluation_results=command_line_arguments.fsync_results,
+        warmup_before_evaluation=not command_line_arguments.skip_warmup,
+        backend_base_urls=tuple(command_line_arguments.backend_url or ()),
+        trace_logging_enabled=command_line_arguments.trace,
     )
     tool_schemas = build_tool_schemas()
     dummy_data_stores = DummyDataStores()
-    tool_executor_map = build_tool_executor_map(dummy_data_stores)
+    tool_execution_lanes = build_tool_execution_lanes(runtime_configuration)
+    tool_executor_map = build_tool_executor_map(dummy_data_stores, tool_execution_lanes)
+    trace_logger = build_runtime_trace_logger(runtime_configuration)
 
     tool_call_engine = ToolCallEngine(
         runtime_configuration=runtime_configuration,
-        chat_client=LmStudioChatClient(runtime_configuration),
+        chat_client=build_chat_client(runtime_configuration),
         tool_schemas=tool_schemas,
         tool_executor_map=tool_executor_map,
         parser=LfmToolCallParser(),
+        tool_argument_coercer=BUILTIN_TOOL_REGISTRY.coerce_arguments,
+        trace_logger=trace_logger,
     )
     evaluation_runner = EvaluationRunner(
         runtime_configuration=runtime_configuration,
         tool_call_engine=tool_call_engine,
     )
 
-    evaluation_summary, _, result_file_path = evaluation_runner.run_evaluation(
-        max_cases=command_line_arguments.max_cases,
-    )
+    with tool_execution_lanes:
+        evaluation_summary, _, result_file_path = evaluation_runner.run_evaluation(
+            case_file_path=command_line_arguments.case_file,
+            max_cases=command_line_arguments.max_cases,
+            resume_stream_file_path=command_line_arguments.resume,
+            case_shard=command_line_arguments.shard,
+            sample_rate=command_line_arguments.sample_rate,
+        )
     print(json.dumps(asdict(evaluation_summary), ensure_ascii=True, indent=2))
+    if evaluation_runner.warmup_report is not None:
+        print(f"warmup={json.dumps(asdict(evaluation_runner.warmup_report), ensure_ascii=True)}")
+    if trace_logger is not None:
+        trace_logger.close()
+        print(f"trace={json.dumps(asdict(trace_logger.stats), ensure_ascii=True)}")
     print(f"result_file_path={result_file_path}")
 
 
@@ -0,0 +1,156 @@
+"""Responsibility: run the long-lived OpenAI-compatible tool-calling gateway from the command line."""
+
+import argparse
+import asyncio
+from dataclasses import asdict
+import json
+
+from kiboedge_toolcall_kit import RuntimeConfiguration, ToolCallEngine
+from kiboedge_toolcall_kit.engine_warmup import prepare_engine_for_requests
+from kiboedge_toolcall_kit.lfm_tool_call_parser import LfmToolCallParser
+from kiboedge_toolcall_kit.load_balancing import (
+    BackendEndpointPool,
+    build_chat_client,
+    resolve_backend_base_urls,
+)
+from kiboedge_toolcall_kit.request_scheduler import (
+    BATCH_PRIORITY_CLASS,
+    INTERACTIVE_PRIORITY_CLASS,
+    ScheduledChatClient,
+    build_request_scheduler,
+)
+from kiboedge_toolcall_kit.serving_gateway import ToolCallGateway
+from kiboedge_toolcall_kit.speculative_execution import build_speculative_tool_executor
+from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
+from kiboedge_toolcall_kit.tool_execution import build_tool_execution_lanes
+from kiboedge_toolcall_kit.trace_logging import build_runtime_trace_logger
+from kiboedge_toolcall_kit.tools import (
+    BUILTIN_TOOL_REGISTRY,
+    READ_ONLY_TOOL_NAMES,
+    DummyDataStores,
+    build_tool_executor_map,
+)
+
+
+def main() -> None:
+    default_runtime_configuration = RuntimeConfiguration()
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--host", default=default_runtime_configuration.gateway_host)
+    argument_parser.add_argument("--port", type=int, default=default_runtime_configuration.gateway_port)
+    argument_parser.add_argument(
+        "--worker-count",
+        type=int,
+        default=default_runtime_configuration.gateway_worker_count,
+        help="Engine executions allowed in flight (keep 1 on unstable PCs).",
+    )
+    argument_parser.add_argument(
+        "--max-queued-requests",
+        type=int,
+        default=default_runtime_configuration.gateway_max_queued_requests,
+        help="Requests allowed to wait; beyond this the gateway answers 429.",
+    )
+    argument_parser.add_argument(
+        "--request-timeout-seconds",
+        type=float,
+        default=12.0,
+        help="Per-request timeout to avoid heavy hangs on local PC.",
+    )
+    argument_parser.add_argument(
+        "--backend-url",
+        action="append",
+        default=None,
+        help="OpenAI-compatible base URL; repeat to load-balance across several machines.",
+    )
+    argument_parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write per-request traces to logs/traces/*.jsonl.gz from a background thread.",
+    )
+    argument_parser.add_argument(
+        "--speculative-tools",
+        action="store_true",
+        help="Pre-execute the guessed read-only tool call while the model is still answering.",
+    )
+    argument_parser.add_argument(
+        "--skip-warmup",
+        action="store_true",
+        help="Do not wait for the model or send priming requests before serving.",
+    )
+    command_line_arguments = argument_parser.parse_args()
+
+    runtime_configuration = RuntimeConfiguration(
+        request_timeout_seconds=command_line_arguments.request_timeout_seconds,
+        gateway_host=command_line_arguments.host,
+        gateway_port=command_line_arguments.port,
+        gateway_worker_count=command_line_arguments.worker_count,
+        gateway_max_queued_requests=command_line_arguments.max_queued_requests,
+        backend_base_urls=tuple(command_line_arguments.backend_url or ()),
+        trace_logging_enabled=command_line_arguments.trace,
+        speculative_tool_execution_enabled=command_line_arguments.speculative_tools,
+    )
+    endpoint_pool = None
+    if len(resolve_backend_base_urls(runtime_configuration)) > 1:
+        endpoint_pool = BackendEndpointPool(runtime_configuration)
+        endpoint_pool.start_background_health_checks()
+    request_scheduler = build_request_scheduler(runtime_configuration)
+    tool_execution_lanes = build_tool_execution_lanes(runtime_configuration)
+    trace_logger = build_runtime_trace_logger(runtime_configuration)
+    tool_executor_map = build_tool_executor_map(DummyDataStores(), tool_execution_lanes)
+    speculative_tool_executor = build_speculative_tool_executor(
+        runtime_configuration,
+        tool_executor_map,
+        READ_ONLY_TOOL_NAMES,
+    )
+    shared_chat_client = build_chat_client(runtime_configuration, endpoint_pool)
+    tool_schemas = build_tool_schemas()
+    # One engine view per priority class; all share the client, the scheduler and the tools.
+    tool_call_engine_by_priority_class = {
+        priority_class: ToolCallEngine(
+            runtime_configuration=runtime_configuration,
+            chat_client=ScheduledChatClient(
+                chat_client=shared_chat_client,
+                request_scheduler=request_scheduler,
+                priority_class=priority_class,
+                request_timeout_seconds=runtime_configuration.request_timeout_seconds,
+            ),
+            tool_schemas=tool_schemas,
+            tool_executor_map=tool_executor_map,
+            parser=LfmToolCallParser(),
+            tool_argument_coercer=BUILTIN_TOOL_REGISTRY.coerce_arguments,
+            trace_logger=trace_logger,
+            speculative_tool_executor=speculative_tool_executor,
+        )
+        for priority_class in (INTERACTIVE_PRIORITY_CLASS, BATCH_PRIORITY_CLASS)
+    }
+    tool_call_engine = tool_call_engine_by_priority_class[INTERACTIVE_PRIORITY_CLASS]
+    if not command_line_arguments.skip_warmup:
+        # Warm-up bypasses the scheduler: a cold prime would exceed the request deadline and
+        # leave a service-time estimate that sheds the first real requests.
+        warmup_tool_call_engine = ToolCallEngine(
+            runtime_configuration=runtime_configuration,
+            chat_client=shared_chat_client,
+            tool_schemas=tool_schemas,
+            tool_executor_map=tool_executor_map,
+            parser=LfmToolCallParser(),
+        )
+        print(f"warmup={json.dumps(asdict(prepare_engine_for_requests(warmup_tool_call_engine)), ensure_ascii=True)}")
+    gateway = ToolCallGateway(
+        runtime_configuration=runtime_configuration,
+        tool_call_engine=tool_call_engine,
+        tool_call_engines_by_priority_class=tool_call_engine_by_priority_class,
+    )
+    print(f"gateway_url=http://{runtime_configuration.gateway_host}:{runtime_configuration.gateway_port}/v1")
+    try:
+        with tool_execution_lanes:
+            asyncio.run(gateway.serve_forever())
+    finally:
+        if speculative_tool_executor is not None:
+            speculative_tool_executor.shutdown()
+            print(f"speculation={json.dumps(asdict(speculative_tool_executor.stats), ensure_ascii=True)}")
+        if trace_logger is not None:
+            trace_logger.close()
+            print(f"trace={json.dumps(asdict(trace_logger.stats), ensure_ascii=True)}")
+
+
+if __name__ == "__main__":
+    main()
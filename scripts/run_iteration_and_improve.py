@@ -1,44 +1,17 @@
-"""Responsibility: run sequential prompt-variant iterations and report strict-success gains."""
+"""Responsibility: run prompt-variant x model x temperature x rendering iterations and report strict-success gains."""
 
 import argparse
 from dataclasses import asdict
 import json
 
-from kiboedge_toolcall_kit import EvaluationRunner, RuntimeConfiguration, ToolCallEngine
-from kiboedge_toolcall_kit.lfm_tool_call_parser import LfmToolCallParser
-from kiboedge_toolcall_kit.lmstudio_client import LmStudioChatClient
-from kiboedge_toolcall_kit.prompt_templates import (
-    build_strict_json_only_system_prompt,
-    build_tool_call_system_prompt,
-)
-from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
-from kiboedge_toolcall_kit.tools import DummyDataStores, build_tool_executor_map
-
-
-def _run_with_prompt_variant(
-    runtime_configuration: RuntimeConfiguration,
-    system_prompt_text: str,
-    max_cases: int | None,
-) -> dict[str, object]:
-    tool_schemas = build_tool_schemas()
-    tool_executor_map = build_tool_executor_map(DummyDataStores())
-    tool_call_engine = ToolCallEngine(
-        runtime_configuration=runtime_configuration,
-        chat_client=LmStudioChatClient(runtime_configuration),
-        tool_schemas=tool_schemas,
-        tool_executor_map=tool_executor_map,
-        parser=LfmToolCallParser(),
-        system_prompt_text=system_prompt_text,
-    )
-    evaluation_runner = EvaluationRunner(
-        runtime_configuration=runtime_configuration,
-        tool_call_engine=tool_call_engine,
-    )
-    evaluation_summary, _, result_file_path = evaluation_runner.run_evaluation(max_cases=max_cases)
-    return {"summary": asdict(evaluation_summary), "result_file_path": result_file_path}
+from kiboedge_toolcall_kit import RuntimeConfiguration
+from kiboedge_toolcall_kit.evaluation_matrix import EvaluationMatrixRunner, build_evaluation_matrix_cells
+from kiboedge_toolcall_kit.prompt_templates import PROMPT_VARIANT_BUILDERS
+from kiboedge_toolcall_kit.tool_schema_rendering import TOOL_SCHEMA_RENDERERS
 
 
 def main() -> None:
+    default_runtime_configuration = RuntimeConfiguration()
     argument_parser = argparse.ArgumentParser()
     argument_parser.add_argument(
         "--max-cases",
@@ -52,32 +25,92 @@ def main() -> None:
         default=12.0,
         help="Per-request timeout to avoid long stalls on local PC.",
     )
+    argument_parser.add_argument(
+        "--variants",
+        nargs="+",
+        default=["baseline", "strict_json"],
+        choices=sorted(PROMPT_VARIANT_BUILDERS),
+        help="Prompt variants to compare.",
+    )
+    argument_parser.add_argument(
+        "--models",
+        nargs="+",
+        default=[default_runtime_configuration.model_name],
+        help="Model names loaded in LM Studio.",
+    )
+    argument_parser.add_argument(
+        "--temperatures",
+        nargs="+",
+        type=float,
+        default=[default_runtime_configuration.response_temperature],
+        help="Sampling temperatures to compare.",
+    )
+    argument_parser.add_argument(
+        "--renderings",
+        nargs="+",
+        default=["full"],
+        choices=sorted(TOOL_SCHEMA_RENDERERS),
+        help="Tool list renderings to compare (cheaper renderings shrink prompt prefill).",
+    )
+    argument_parser.add_argument(
+        "--worker-count",
+        type=int,
+        default=1,
+        help="Shared worker pool size across all cells (keep 1 on unstable PCs).",
+    )
+    argument_parser.add_argument(
+        "--successive-halving",
+        action="store_true",
+        help="Drop the weaker half of cells after each rung of cases.",
+    )
+    argument_parser.add_argument(
+        "--halving-initial-cases",
+        type=int,
+        default=4,
+        help="Case count of the first rung; each following rung doubles it.",
+    )
+    argument_parser.add_argument(
+        "--skip-warmup",
+        action="store_true",
+        help="Do not wait for the model or send priming requests before each cell.",
+    )
     command_line_arguments = argument_parser.parse_args()
 
     runtime_configuration = RuntimeConfiguration(
         request_timeout_seconds=command_line_arguments.request_timeout_seconds,
+        evaluation_worker_count=command_line_arguments.worker_count,
+        warmup_before_evaluation=not command_line_arguments.skip_warmup,
     )
-    baseline_result = _run_with_prompt_variant(
-        runtime_configuration=runtime_configuration,
-        system_prompt_text=build_tool_call_system_prompt(),
-        max_cases=command_line_arguments.max_cases,
-    )
-    strict_prompt_result = _run_with_prompt_variant(
+    evaluation_matrix_runner = EvaluationMatrixRunner(
         runtime_configuration=runtime_configuration,
-        system_prompt_text=build_strict_json_only_system_prompt(),
-        max_cases=command_line_arguments.max_cases,
+        cells=build_evaluation_matrix_cells(
+            prompt_variant_names=command_line_arguments.variants,
+            model_names=command_line_arguments.models,
+            response_temperatures=command_line_arguments.temperatures,
+            tool_schema_rendering_names=command_line_arguments.renderings,
+        ),
+        successive_halving_enabled=command_line_arguments.successive_halving,
+        halving_initial_case_count=command_line_arguments.halving_initial_cases,
     )
+    cell_reports, report_file_path = evaluation_matrix_runner.run_matrix(max_cases=command_line_arguments.max_cases)
 
     print(
         json.dumps(
             {
-                "baseline_prompt": baseline_result,
-                "strict_json_prompt": strict_prompt_result,
+                cell_report.cell.cell_identifier: {
+                    "summary": asdict(cell_report.summary),
+                    "eliminated_after_rung": cell_report.eliminated_after_rung,
+                    "rendered_tool_character_count": cell_report.rendered_tool_character_count,
+                    "warmup": asdict(cell_report.warmup_report) if cell_report.warmup_report is not None else None,
+                    "result_stream_file_path": cell_report.result_stream_file_path,
+                }
+                for cell_report in cell_reports
             },
             ensure_ascii=True,
             indent=2,
         )
     )
+    print(f"report_file_path={report_file_path}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,68 @@
-"""Responsibility: perform lightweight smoke tests for parser and schema validation logic."""
+"""Responsibility: perform lightweight smoke tests for parsing, validation and the runtime subsystems."""
 
+import asyncio
+from dataclasses import asdict, replace
+import gzip
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from kiboedge_toolcall_kit.adaptive_concurrency import AdaptiveConcurrencyController, HostPressureSnapshot
+from kiboedge_toolcall_kit.config import RuntimeConfiguration
+from kiboedge_toolcall_kit.evaluation_runner import EvaluationRunner
+from kiboedge_toolcall_kit.evaluation_work_queue import EvaluationWorkQueue
 from kiboedge_toolcall_kit.lfm_tool_call_parser import LfmToolCallParser
-from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas
+from kiboedge_toolcall_kit.lmstudio_client import LmStudioChatClient
+from kiboedge_toolcall_kit.models import EngineRoundResult, EvaluationCase, EvaluationCaseResult, ParsedToolCall
+from kiboedge_toolcall_kit.request_scheduler import (
+    BATCH_PRIORITY_CLASS,
+    INTERACTIVE_PRIORITY_CLASS,
+    PriorityRequestScheduler,
+    RequestDeadlineExceededError,
+)
+from kiboedge_toolcall_kit.resilience import CircuitOpenError
+from kiboedge_toolcall_kit.serving_gateway import ToolCallGateway
+from kiboedge_toolcall_kit.self_consistency import SelfConsistencySampler
+from kiboedge_toolcall_kit.speculative_execution import SpeculativeToolExecutor
+from kiboedge_toolcall_kit.tool_call_session import ToolCallSessionManager
+from kiboedge_toolcall_kit.tool_execution import PROCESS_EXECUTION_LANE, THREAD_EXECUTION_LANE, ToolExecutionLanes
+from kiboedge_toolcall_kit.tool_message_encoding import ToolMessageEncoder
+from kiboedge_toolcall_kit.tool_orchestrator import ToolCallEngine
+from kiboedge_toolcall_kit.tool_schema_rendering import SIGNATURE_TEXT_TOOL_SCHEMA_RENDERING
+from kiboedge_toolcall_kit.tool_registry import ToolRegistry
+from kiboedge_toolcall_kit.tool_schemas import build_tool_schemas, build_tool_set_fingerprint
+from kiboedge_toolcall_kit.tools import READ_ONLY_TOOL_NAMES, DummyDataStores, build_tool_executor_map
+from kiboedge_toolcall_kit.trace_logging import RuntimeTraceLogger
+from kiboedge_toolcall_kit.tool_validation import describe_tool_call_violations, validate_tool_call_against_schema
+
+
+IMPORT_TIME_BUDGET_SECONDS = 0.25
+HEAVY_IMPORT_MODULE_NAMES = ("openai", "httpx", "pydantic", "numpy")
+# Fingerprint and order of the hand-written schemas the registry replaced; evaluation results key on it.
+BASELINE_TOOL_SET_FINGERPRINT = "2c433d71f4ebc8162ef0b142ef5072bd49b095c8abf6a7280fdccee22e12c4f9"
+BASELINE_TOOL_NAMES = (
+    "play_sound_effect",
+    "create_calendar_event",
+    "read_calendar_events",
+    "create_todo_task",
+    "read_todo_tasks",
+    "get_weather",
+    "get_news",
+    "read_database_record",
+    "write_database_record",
+)
+IMPORT_TIME_PROBE_SOURCE = """
+import sys, time
+import_started_time = time.perf_counter()
+from kiboedge_toolcall_kit import RuntimeConfiguration, ToolCallEngine, LfmToolCallParser
 from kiboedge_toolcall_kit.tool_validation import validate_tool_call_against_schema
+print(time.perf_counter() - import_started_time)
+print(",".join(sorted(set(sys.modules) & set(sys.argv[1:]))))
+"""
 
 
 class DummyOpenAiFunction:
@@ -28,6 +88,156 @@ class DummyOpenAiMessage:
         self.content = content
 
 
+class DummyOpenAiChoice:
+    """Simple shape-matching stub for OpenAI SDK choice payload."""
+
+    def __init__(self, message: DummyOpenAiMessage) -> None:
+        self.message = message
+
+
+class DummyOpenAiResponse:
+    """Simple shape-matching stub for OpenAI SDK chat completion payload."""
+
+    def __init__(self, messages: list[DummyOpenAiMessage]) -> None:
+        self.choices = [DummyOpenAiChoice(message) for message in messages]
+
+
+class DummyStrictServerError(Exception):
+    """Stand-in for the SDK's 400 error; only ``status_code`` is read."""
+
+    status_code = 400
+
+
+class DummyStrictOpenAiClient:
+    """OpenAI SDK stub that, like strict servers, rejects ``tool_choice`` without ``tools``.
+
+    A request ending in the user prompt gets a JSON tool call as content (what constrained
+    decoding and signature-text prompting ask for); the final-answer request gets plain text.
+    """
+
+    def __init__(self) -> None:
+        self.chat = self
+        self.completions = self
+        self.request_arguments_list: list[dict] = []
+
+    def create(self, **request_arguments) -> DummyOpenAiResponse:
+        self.request_arguments_list.append(request_arguments)
+        if "tool_choice" in request_arguments and not request_arguments.get("tools"):
+            raise DummyStrictServerError("'tool_choice' is only allowed when 'tools' are specified")
+        if request_arguments["messages"][-1]["role"] == "user":
+            return DummyOpenAiResponse(
+                [DummyOpenAiMessage(content='{"name":"get_weather","arguments":{"location":"東京","date":"明日"}}')]
+            )
+        return DummyOpenAiResponse([DummyOpenAiMessage(content="晴れです。")])
+
+
+class DummyHostPressureSampler:
+    """Host pressure sampler stub that returns a fixed snapshot."""
+
+    def __init__(self, host_pressure_snapshot: HostPressureSnapshot) -> None:
+        self.host_pressure_snapshot = host_pressure_snapshot
+
+    def sample(self) -> HostPressureSnapshot:
+        return self.host_pressure_snapshot
+
+
+class DummyScriptedChatClient:
+    """Chat client stub that replays one scripted message per request."""
+
+    def __init__(self, scripted_messages: list[DummyOpenAiMessage]) -> None:
+        self._scripted_messages = list(scripted_messages)
+        self.request_count = 0
+
+    def create_chat_completion(self, messages, tools, tool_choice="auto", **completion_options) -> DummyOpenAiResponse:
+        self.request_count += 1
+        return DummyOpenAiResponse([self._scripted_messages.pop(0)])
+
+
+class DummyToolRoutingChatClient:
+    """Chat client stub that always calls get_weather, then answers; can block or fail on demand."""
+
+    def __init__(self, request_error: Exception | None = None) -> None:
+        self.request_error = request_error
+        self.release_event = threading.Event()
+        self.release_event.set()
+        self.tool_call_request_count = 0
+        self.last_tool_call_messages: list[dict] = []
+        self._lock = threading.Lock()
+
+    def create_chat_completion(self, messages, tools, tool_choice="auto", **completion_options) -> DummyOpenAiResponse:
+        if tool_choice == "none" and self.request_error is None:
+            return DummyOpenAiResponse([DummyOpenAiMessage(content="晴れです。")])
+        with self._lock:
+            self.tool_call_request_count += 1
+            self.last_tool_call_messages = list(messages)
+        self.release_event.wait()
+        if self.request_error is not None:
+            raise self.request_error
+        return DummyOpenAiResponse(
+            [DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("get_weather", '{"location":"東京","date":"明日"}')])]
+        )
+
+
+class DummyEvaluationEngine:
+    """Engine stub for evaluation runs: raises the error scripted for a prompt, else calls get_weather."""
+
+    def __init__(self, request_error_by_user_prompt: dict[str, BaseException] | None = None) -> None:
+        self.request_error_by_user_prompt = request_error_by_user_prompt or {}
+        self.user_prompts: list[str] = []
+
+    def run_tool_call_round(self, user_prompt: str) -> EngineRoundResult:
+        self.user_prompts.append(user_prompt)
+        if user_prompt in self.request_error_by_user_prompt:
+            raise self.request_error_by_user_prompt[user_prompt]
+        return EngineRoundResult(
+            is_success=True,
+            failure_reason=None,
+            source="tool_calls",
+            tool_name="get_weather",
+            arguments={"location": user_prompt},
+        )
+
+
+def sleep_in_tool_worker(sleep_seconds: float) -> dict:
+    """Module-level tool body, so spawned process-lane workers can import it by name."""
+    time.sleep(sleep_seconds)
+    return {"status": "ok", "slept_seconds": sleep_seconds}
+
+
+def build_dummy_tool_call_engine(
+    chat_client: DummyToolRoutingChatClient,
+    runtime_configuration: RuntimeConfiguration | None = None,
+) -> ToolCallEngine:
+    return ToolCallEngine(
+        runtime_configuration=runtime_configuration or RuntimeConfiguration(),
+        chat_client=chat_client,
+        tool_schemas=build_tool_schemas(),
+        tool_executor_map=build_tool_executor_map(DummyDataStores()),
+    )
+
+
+async def send_gateway_request(port: int, method: str, path: str, payload: dict | None = None) -> tuple[int, bytes]:
+    """Send one HTTP/1.1 request with ``Connection: close`` and return the status code and body."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\nContent-Length: {len(body)}\r\n\r\n".encode(
+            "latin-1"
+        )
+        + body
+    )
+    await writer.drain()
+    response_bytes = await reader.read()
+    writer.close()
+    head_bytes, _, response_body = response_bytes.partition(b"\r\n\r\n")
+    return int(head_bytes.split(b" ")[1]), response_body
+
+
+async def post_chat_completion(port: int, user_prompt: str) -> tuple[int, bytes]:
+    chat_payload = {"model": "any", "messages": [{"role": "user", "content": user_prompt}]}
+    return await send_gateway_request(port, "POST", "/v1/chat/completions", chat_payload)
+
+
 def run_parser_smoke_tests() -> None:
     parser = LfmToolCallParser()
 
@@ -68,12 +278,675 @@ def run_validation_smoke_tests() -> None:
     )
     assert not failure_result.is_success
     assert failure_result.failure_reason == "missing_required"
+
+    enum_violation_report = describe_tool_call_violations(
+        tool_name="create_todo_task",
+        arguments={"task_title": "牛乳", "priority": "urgent"},
+        tool_schemas=tool_schemas,
+    )
+    # Out-of-enum values are reported for the repair prompt but only fail the call when enforced.
+    assert enum_violation_report.failure_reason is None
+    assert enum_violation_report.invalid_enum_values == {"priority": ("urgent", ["low", "normal", "high"])}
+    enforced_enum_report = describe_tool_call_violations(
+        tool_name="create_todo_task",
+        arguments={"task_title": "牛乳", "priority": "urgent"},
+        tool_schemas=tool_schemas,
+        enforce_enum_values=True,
+    )
+    assert enforced_enum_report.failure_reason == "schema_mismatch"
+
+    def build_todo_engine(runtime_configuration: RuntimeConfiguration, scripted_messages: list) -> tuple:
+        scripted_chat_client = DummyScriptedChatClient(scripted_messages)
+        return build_dummy_tool_call_engine(scripted_chat_client, runtime_configuration), scripted_chat_client
+
+    def build_todo_tool_call_message(priority: str) -> DummyOpenAiMessage:
+        todo_arguments = json.dumps({"task_title": "牛乳", "priority": priority})
+        return DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("create_todo_task", todo_arguments)])
+
+    default_engine, default_chat_client = build_todo_engine(
+        RuntimeConfiguration(),
+        [build_todo_tool_call_message("urgent"), DummyOpenAiMessage(content="追加しました。")],
+    )
+    default_round_result = default_engine.run_tool_call_round("牛乳を買うタスクを追加して")
+    assert default_round_result.failure_reason is None
+    assert default_chat_client.request_count == 2
+
+    enforcing_engine, enforcing_chat_client = build_todo_engine(
+        RuntimeConfiguration(schema_violation_repair_enabled=True, schema_enum_validation_enabled=True),
+        [
+            build_todo_tool_call_message("urgent"),
+            build_todo_tool_call_message("high"),
+            DummyOpenAiMessage(content="追加しました。"),
+        ],
+    )
+    enforcing_round_result = enforcing_engine.run_tool_call_round("牛乳を買うタスクを追加して")
+    assert enforcing_round_result.failure_reason is None
+    assert enforcing_round_result.executed_tool_calls[0].arguments["priority"] == "high"
+    assert enforcing_chat_client.request_count == 3
+
+    hallucinated_report = describe_tool_call_violations("get_wether", {}, tool_schemas)
+    assert hallucinated_report.nearest_tool_name == "get_weather"
     print("Validation smoke tests passed.")
 
 
+def run_tool_registry_smoke_tests() -> None:
+    tool_schemas = build_tool_schemas()
+    assert build_tool_set_fingerprint(tool_schemas) == BASELINE_TOOL_SET_FINGERPRINT
+    assert tuple(tool_schema["function"]["name"] for tool_schema in tool_schemas) == BASELINE_TOOL_NAMES
+
+    tool_registry = ToolRegistry()
+
+    @tool_registry.tool("Repeat a sound.")
+    def repeat_sound(repeat_count: int, volume_ratio: float, is_looping: bool) -> dict:
+        return {"status": "ok"}
+
+    def coerce_repeat_count(repeat_count: object) -> object:
+        return tool_registry.coerce_arguments("repeat_sound", {"repeat_count": repeat_count})["repeat_count"]
+
+    assert coerce_repeat_count("3") == 3
+    assert coerce_repeat_count(" -4 ") == -4
+    assert coerce_repeat_count(2.0) == 2
+    # Strings int() cannot parse must reach validation unchanged instead of raising here.
+    for uncoercible_text in ("+-3", "--1", "①", "²", "3.5", ""):
+        assert coerce_repeat_count(uncoercible_text) == uncoercible_text
+    coerced_arguments = tool_registry.coerce_arguments(
+        "repeat_sound", {"repeat_count": "2", "volume_ratio": "0.5", "is_looping": "yes"}
+    )
+    assert coerced_arguments == {"repeat_count": 2, "volume_ratio": 0.5, "is_looping": True}
+    print("Tool registry smoke tests passed.")
+
+
+def run_self_consistency_smoke_tests() -> None:
+    scripted_chat_client = DummyScriptedChatClient(
+        [
+            DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("get_weather", '{"location":"Tokyo"}')]),
+            DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("get_weather", '{"location":"Tokyo","date":"today"}')]),
+            DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("get_weather", '{"date":"today","location":"Tokyo"}')]),
+            DummyOpenAiMessage(tool_calls=[DummyOpenAiToolCall("get_weather", '{"location":"Osaka","date":"today"}')]),
+        ]
+    )
+    sampler = SelfConsistencySampler(
+        chat_client=scripted_chat_client,
+        parser=LfmToolCallParser(),
+        tool_schemas=build_tool_schemas(),
+        sample_count=4,
+        quorum_count=2,
+    )
+    outcome = sampler.sample_tool_call_message(messages=[], tools=[], tool_choice="auto")
+    assert outcome.reached_quorum
+    assert outcome.parsed_tool_calls[0].arguments["location"] == "Tokyo"
+    assert scripted_chat_client.request_count == 3
+    print("Self-consistency smoke tests passed.")
+
+
+def run_tool_message_encoding_smoke_tests() -> None:
+    weather_result = {"status": "ok", "location": "東京", "forecast": "sunny"}
+    ascii_text = ToolMessageEncoder("ascii_escaped").encode_tool_result("get_weather", weather_result)
+    compact_text = ToolMessageEncoder("utf8_minified").encode_tool_result("get_weather", weather_result)
+    assert "\\u6771" in ascii_text
+    assert compact_text == '{"status":"ok","location":"東京","forecast":"sunny"}'
+
+    projecting_encoder = ToolMessageEncoder("utf8_minified", {"get_weather": ("forecast",)})
+    assert projecting_encoder.encode_tool_result("get_weather", weather_result) == '{"status":"ok","forecast":"sunny"}'
+    print("Tool message encoding smoke tests passed.")
+
+
+async def _run_gateway_scenarios() -> None:
+    gateway_configuration = RuntimeConfiguration(
+        gateway_port=0,
+        gateway_worker_count=1,
+        gateway_max_queued_requests=1,
+        gateway_coalesce_identical_requests=False,
+    )
+
+    # 429: one request running, one queued, the third is shed.
+    blocking_chat_client = DummyToolRoutingChatClient()
+    blocking_chat_client.release_event.clear()
+    gateway = ToolCallGateway(gateway_configuration, build_dummy_tool_call_engine(blocking_chat_client))
+    server = await gateway.start()
+    port = server.sockets[0].getsockname()[1]
+    try:
+        running_request = asyncio.create_task(post_chat_completion(port, "天気 1"))
+        while blocking_chat_client.tool_call_request_count == 0:
+            await asyncio.sleep(0.01)
+        queued_request = asyncio.create_task(post_chat_completion(port, "天気 2"))
+        await asyncio.sleep(0.05)
+        status_code, _ = await post_chat_completion(port, "天気 3")
+        assert status_code == 429
+        blocking_chat_client.release_event.set()
+        for finished_request in await asyncio.gather(running_request, queued_request):
+            assert finished_request[0] == 200
+            assert json.loads(finished_request[1])["kiboedge"]["tool_name"] == "get_weather"
+
+        status_code, metrics_body = await send_gateway_request(port, "GET", "/metrics")
+        assert status_code == 200
+        metrics_text = metrics_body.decode("utf-8")
+        assert 'kiboedge_gateway_http_responses_total{status="429"} 1' in metrics_text
+        assert "kiboedge_gateway_rejected_requests_total 1" in metrics_text
+        assert 'kiboedge_gateway_engine_outcomes_total{outcome="success"} 2' in metrics_text
+    finally:
+        server.close()
+        await server.wait_closed()
+        await gateway.stop()
+
+    # Coalescing: identical concurrent prompts share one engine execution (get_weather is read-only).
+    blocking_chat_client = DummyToolRoutingChatClient()
+    blocking_chat_client.release_event.clear()
+    gateway = ToolCallGateway(
+        replace(gateway_configuration, gateway_coalesce_identical_requests=True, gateway_max_queued_requests=4),
+        build_dummy_tool_call_engine(blocking_chat_client),
+    )
+    server = await gateway.start()
+    port = server.sockets[0].getsockname()[1]
+    try:
+        leader_request = asyncio.create_task(post_chat_completion(port, "明日の東京の天気は？"))
+        while blocking_chat_client.tool_call_request_count == 0:
+            await asyncio.sleep(0.01)
+        follower_requests = [
+            asyncio.create_task(post_chat_completion(port, "明日の東京の天気は？")),
+            asyncio.create_task(post_chat_completion(port, " 明日の東京の天気は? ")),
+        ]
+        await asyncio.sleep(0.05)
+        blocking_chat_client.release_event.set()
+        for finished_request in await asyncio.gather(leader_request, *follower_requests):
+            assert finished_request[0] == 200
+        assert blocking_chat_client.tool_call_request_count == 1
+        assert gateway.metrics.coalesced_request_count == 2
+
+        # A leader shed by the scheduler answers its followers with the same 503 + Retry-After.
+        blocking_chat_client.release_event.clear()
+        blocking_chat_client.request_error = RequestDeadlineExceededError("shed")
+        leader_request = asyncio.create_task(post_chat_completion(port, "週末の大阪の天気は？"))
+        while blocking_chat_client.tool_call_request_count == 1:
+            await asyncio.sleep(0.01)
+        follower_request = asyncio.create_task(post_chat_completion(port, "週末の大阪の天気は？"))
+        await asyncio.sleep(0.05)
+        blocking_chat_client.release_event.set()
+        for finished_request in await asyncio.gather(leader_request, follower_request):
+            assert finished_request[0] == 503
+    finally:
+        server.close()
+        await server.wait_closed()
+        await gateway.stop()
+
+    # Priority classes: batch runs on its own engine view; unknown classes are refused.
+    batch_chat_client = DummyToolRoutingChatClient()
+    gateway = ToolCallGateway(
+        gateway_configuration,
+        build_dummy_tool_call_engine(DummyToolRoutingChatClient()),
+        tool_call_engines_by_priority_class={BATCH_PRIORITY_CLASS: build_dummy_tool_call_engine(batch_chat_client)},
+    )
+    server = await gateway.start()
+    port = server.sockets[0].getsockname()[1]
+    try:
+        batch_payload = {"messages": [{"role": "user", "content": "天気"}], "priority": BATCH_PRIORITY_CLASS}
+        status_code, _ = await send_gateway_request(port, "POST", "/v1/chat/completions", batch_payload)
+        assert status_code == 200 and batch_chat_client.tool_call_request_count == 1
+        for invalid_priority in ("urgent", {}, ["batch"]):
+            invalid_payload = {"messages": [{"role": "user", "content": "天気"}], "priority": invalid_priority}
+            status_code, _ = await send_gateway_request(port, "POST", "/v1/chat/completions", invalid_payload)
+            assert status_code == 400
+    finally:
+        server.close()
+        await server.wait_closed()
+        await gateway.stop()
+
+    # Multi-turn payloads: earlier user/assistant turns reach the model; client tool messages are refused.
+    history_chat_client = DummyToolRoutingChatClient()
+    gateway = ToolCallGateway(gateway_configuration, build_dummy_tool_call_engine(history_chat_client))
+    server = await gateway.start()
+    port = server.sockets[0].getsockname()[1]
+    try:
+        history_payload = {
+            "messages": [
+                {"role": "system", "content": "client system prompt"},
+                {"role": "user", "content": "札幌に住んでいます"},
+                {"role": "assistant", "content": "覚えました。"},
+                {"role": "user", "content": [{"type": "text", "text": "明日の天気は？"}]},
+            ]
+        }
+        status_code, _ = await send_gateway_request(port, "POST", "/v1/chat/completions", history_payload)
+        assert status_code == 200
+        sent_messages = history_chat_client.last_tool_call_messages
+        assert [message["role"] for message in sent_messages] == ["system", "user", "assistant", "user"]
+        assert sent_messages[1]["content"] == "札幌に住んでいます" and sent_messages[3]["content"] == "明日の天気は？"
+        assert "client system prompt" not in sent_messages[0]["content"]
+        tool_payload = {
+            "messages": [
+                {"role": "user", "content": "天気"},
+                {"role": "tool", "tool_call_id": "call-1", "content": "{}"},
+            ]
+        }
+        status_code, _ = await send_gateway_request(port, "POST", "/v1/chat/completions", tool_payload)
+        assert status_code == 400
+    finally:
+        server.close()
+        await server.wait_closed()
+        await gateway.stop()
+
+    # 503: deadline shedding and an open circuit both map to Service Unavailable.
+    for request_error in (RequestDeadlineExceededError("shed"), CircuitOpenError("backend", 2.5)):
+        gateway = ToolCallGateway(
+            gateway_configuration,
+            build_dummy_tool_call_engine(DummyToolRoutingChatClient(request_error=request_error)),
+        )
+        server = await gateway.start()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            status_code, _ = await post_chat_completion(port, "天気")
+            assert status_code == 503, (request_error, status_code)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await gateway.stop()
+
+
+def run_gateway_smoke_tests() -> None:
+    asyncio.run(_run_gateway_scenarios())
+    print("Gateway smoke tests passed.")
+
+
+def run_constrained_decoding_smoke_tests() -> None:
+    runtime_configuration = RuntimeConfiguration(use_constrained_decoding=True)
+    strict_openai_client = DummyStrictOpenAiClient()
+    tool_call_engine = ToolCallEngine(
+        runtime_configuration=runtime_configuration,
+        chat_client=LmStudioChatClient(runtime_configuration, openai_client=strict_openai_client),
+        tool_schemas=build_tool_schemas(),
+        tool_executor_map=build_tool_executor_map(DummyDataStores()),
+    )
+    for _ in range(2):
+        engine_round_result = tool_call_engine.run_tool_call_round("明日の東京の天気は？")
+        assert engine_round_result.is_success and engine_round_result.source == "content_constrained_json"
+    # Tool-less requests (constrained call, final answer) never carry tool_choice, so nothing was rejected.
+    for request_arguments in strict_openai_client.request_arguments_list:
+        assert "tools" not in request_arguments and "tool_choice" not in request_arguments
+    assert len(strict_openai_client.request_arguments_list) == 4
+
+    # Signature-text rendering sends no native tools either; the call comes back as content JSON.
+    runtime_configuration = RuntimeConfiguration(tool_schema_rendering=SIGNATURE_TEXT_TOOL_SCHEMA_RENDERING)
+    strict_openai_client = DummyStrictOpenAiClient()
+    tool_call_engine = ToolCallEngine(
+        runtime_configuration=runtime_configuration,
+        chat_client=LmStudioChatClient(runtime_configuration, openai_client=strict_openai_client),
+        tool_schemas=build_tool_schemas(),
+        tool_executor_map=build_tool_executor_map(DummyDataStores()),
+    )
+    engine_round_result = tool_call_engine.run_tool_call_round("明日の東京の天気は？")
+    assert engine_round_result.is_success and engine_round_result.tool_name == "get_weather"
+    for request_arguments in strict_openai_client.request_arguments_list:
+        assert "tools" not in request_arguments and "tool_choice" not in request_arguments
+    print("Constrained decoding smoke tests passed.")
+
+
+def run_scheduler_smoke_tests() -> None:
+    request_scheduler = PriorityRequestScheduler(max_in_flight_requests=1)
+    far_deadline_time = time.monotonic() + 30.0
+    slot_release_event = threading.Event()
+    granted_priority_classes: list[str] = []
+
+    holding_thread = threading.Thread(
+        target=request_scheduler.run,
+        args=(slot_release_event.wait, INTERACTIVE_PRIORITY_CLASS, far_deadline_time),
+    )
+    holding_thread.start()
+    while request_scheduler.in_flight_request_count == 0:
+        time.sleep(0.01)
+    waiting_threads = [
+        threading.Thread(
+            target=request_scheduler.run,
+            args=(lambda priority_class=priority_class: granted_priority_classes.append(priority_class), priority_class, far_deadline_time),
+        )
+        for priority_class in [INTERACTIVE_PRIORITY_CLASS] * 5 + [BATCH_PRIORITY_CLASS] * 5
+    ]
+    for waiting_thread in waiting_threads:
+        waiting_thread.start()
+    while request_scheduler.waiting_request_count < len(waiting_threads):
+        time.sleep(0.01)
+    slot_release_event.set()
+    for started_thread in [holding_thread, *waiting_threads]:
+        started_thread.join()
+    # Default weights 4:1: batch advances, but interactive gets most of the early slots.
+    assert granted_priority_classes[:5].count(INTERACTIVE_PRIORITY_CLASS) == 4
+    assert BATCH_PRIORITY_CLASS in granted_priority_classes[:5]
+
+    # After one 0.1s request, a request with a 10ms deadline cannot fit behind a busy server and is shed.
+    request_scheduler.set_max_in_flight_requests(2)
+    request_scheduler.run(lambda: time.sleep(0.1), INTERACTIVE_PRIORITY_CLASS, time.monotonic() + 30.0)
+    slot_release_event.clear()
+    holding_thread = threading.Thread(
+        target=request_scheduler.run,
+        args=(slot_release_event.wait, INTERACTIVE_PRIORITY_CLASS, far_deadline_time),
+    )
+    holding_thread.start()
+    while request_scheduler.in_flight_request_count == 0:
+        time.sleep(0.01)
+    try:
+        request_scheduler.run(lambda: None, BATCH_PRIORITY_CLASS, time.monotonic() + 0.01)
+    except RequestDeadlineExceededError:
+        pass
+    else:
+        raise AssertionError("request past its deadline was not shed")
+    slot_release_event.set()
+    holding_thread.join()
+    assert request_scheduler.shed_request_count == 1
+
+    # A call slower than its deadline window must not shed the next request on an idle server.
+    request_scheduler = PriorityRequestScheduler(max_in_flight_requests=1)
+    request_scheduler.run(lambda: time.sleep(0.3), INTERACTIVE_PRIORITY_CLASS, time.monotonic() + 0.2)
+    assert request_scheduler.estimated_service_time_seconds <= 0.2
+    for _ in range(3):
+        assert request_scheduler.run(lambda: "ok", INTERACTIVE_PRIORITY_CLASS, time.monotonic() + 0.2) == "ok"
+    assert request_scheduler.shed_request_count == 0
+    print("Scheduler smoke tests passed.")
+
+
+def run_trace_logging_smoke_tests() -> None:
+    with tempfile.TemporaryDirectory() as trace_directory_path:
+        live_calendar_events = [{"title": "定例"}]
+        with RuntimeTraceLogger(trace_directory_path, batch_size=2, flush_interval_seconds=0.05) as trace_logger:
+            for round_index in range(3):
+                trace_logger.record_engine_round(
+                    f"予定{round_index}",
+                    [{"role": "user", "content": f"予定{round_index}"}],
+                    EngineRoundResult(
+                        is_success=True,
+                        failure_reason=None,
+                        tool_name="read_calendar_events",
+                        tool_result={"events": live_calendar_events},
+                    ),
+                    latency_seconds=0.01,
+                )
+                # The store keeps changing after enqueue; the trace must show the enqueue-time view.
+                live_calendar_events.append({"title": f"追加{round_index}"})
+            trace_logger.record_engine_round("失敗", [], None, latency_seconds=0.01, error_text="TimeoutError()")
+
+        assert trace_logger.stats.written_record_count == 4 and trace_logger.stats.write_error_count == 0
+        trace_file_paths = sorted(Path(trace_directory_path).glob("*.jsonl.gz"))
+        assert len(trace_file_paths) == 1
+        # Several batches were appended as separate gzip members; gzip.open reads them all back.
+        assert trace_file_paths[0].read_bytes().count(b"\x1f\x8b\x08") >= 2
+        with gzip.open(trace_file_paths[0], mode="rt", encoding="utf-8") as trace_file:
+            trace_payloads = [json.loads(trace_line) for trace_line in trace_file]
+
+    assert [trace_payload["user_prompt"] for trace_payload in trace_payloads] == ["予定0", "予定1", "予定2", "失敗"]
+    assert [len(trace_payload["tool_result"]["events"]) for trace_payload in trace_payloads[:3]] == [1, 2, 3]
+    assert all(trace_payload["tool_name"] in BASELINE_TOOL_NAMES for trace_payload in trace_payloads[:3])
+    assert trace_payloads[3]["failure_reason"] == "request_error"
+    print("Trace logging smoke tests passed.")
+
+
+def run_speculative_execution_smoke_tests() -> None:
+    def build_parsed_tool_call(tool_name: str, arguments: dict[str, str]) -> ParsedToolCall:
+        return ParsedToolCall(tool_name=tool_name, arguments=arguments, source="smoke", raw_payload="")
+
+    user_prompt = "今日の予定は？"
+    read_tool_call = build_parsed_tool_call(
+        "read_calendar_events",
+        {"start_date": "2026-01-01", "end_date": "2026-01-01"},
+    )
+    tool_executor_map = build_tool_executor_map(DummyDataStores())
+    with SpeculativeToolExecutor(READ_ONLY_TOOL_NAMES, tool_executor_map) as speculative_tool_executor:
+        tracked_tool_executor_map = speculative_tool_executor.track_state_changing_calls(tool_executor_map)
+        # Miss: a prompt never seen has no guess, so nothing starts.
+        assert speculative_tool_executor.start(user_prompt) is None
+        speculative_tool_executor.record_outcome(user_prompt, [read_tool_call])
+
+        # Hit: the exact call is claimed and its pre-executed result returned.
+        speculative_execution = speculative_tool_executor.start(user_prompt)
+        assert speculative_execution is not None
+        assert speculative_execution.claim(read_tool_call)["status"] == "ok"
+
+        # Different arguments: not claimed, discarded by the engine at the end of the round.
+        speculative_execution = speculative_tool_executor.start(user_prompt)
+        other_read_tool_call = build_parsed_tool_call(
+            "read_calendar_events",
+            {"start_date": "2026-01-02", "end_date": "2026-01-02"},
+        )
+        assert speculative_execution.claim(other_read_tool_call) is None
+        speculative_execution.discard()
+
+        # A tracked write from another request after the speculation started makes it stale.
+        speculative_execution = speculative_tool_executor.start(user_prompt)
+        tracked_tool_executor_map["create_calendar_event"](
+            {"title": "定例", "start_datetime": "2026-01-01T10:00", "end_datetime": "2026-01-01T11:00"}
+        )
+        assert speculative_execution.claim(read_tool_call) is None
+
+        speculative_execution_stats = speculative_tool_executor.stats
+    assert speculative_execution_stats.started_count == 3
+    assert speculative_execution_stats.committed_count == 1
+    assert speculative_execution_stats.discarded_count == 2
+    print("Speculative execution smoke tests passed.")
+
+
+def run_adaptive_concurrency_smoke_tests() -> None:
+    def record_one_request(host_pressure_snapshot: HostPressureSnapshot) -> AdaptiveConcurrencyController:
+        controller = AdaptiveConcurrencyController(
+            max_concurrency_limit=2,
+            initial_pacing_delay_seconds=2.0,
+            min_pacing_delay_seconds=0.5,
+            host_pressure_sampler=DummyHostPressureSampler(host_pressure_snapshot),
+        )
+        with controller.request_slot():
+            pass
+        controller.record_request_outcome(latency_seconds=0.1, is_request_error=False)
+        return controller
+
+    # Saturated CPU during our own request is the model working, not contention.
+    busy_model_controller = record_one_request(HostPressureSnapshot(1.0, 0.5, None, None))
+    assert busy_model_controller.pacing_delay_seconds == 1.0
+    assert busy_model_controller.concurrency_limit == 2
+    contended_controller = record_one_request(HostPressureSnapshot(1.0, 0.5, 80.0, None))
+    assert contended_controller.pacing_delay_seconds == 4.0
+    assert contended_controller.concurrency_limit == 1
+    print("Adaptive concurrency smoke tests passed.")
+
+
+def run_evaluation_runner_smoke_tests() -> None:
+    with tempfile.TemporaryDirectory() as temporary_directory_path:
+        case_file_path = Path(temporary_directory_path) / "cases.jsonl"
+        case_file_path.write_text(
+            "".join(
+                json.dumps(
+                    {
+                        "case_identifier": f"case_{case_index}",
+                        "user_prompt": f"都市{case_index}",
+                        "expected_tool_name": "get_weather",
+                        "required_argument_keys": ["location"],
+                    }
+                )
+                + "\n"
+                for case_index in range(3)
+            ),
+            encoding="utf-8",
+        )
+        runtime_configuration = RuntimeConfiguration(
+            delay_between_evaluation_cases_seconds=0.0,
+            adaptive_min_pacing_delay_seconds=0.0,
+            evaluation_result_directory_path=temporary_directory_path,
+        )
+
+        # First run: case_1 hits a request error, then the process dies on case_2 mid-write.
+        interrupted_engine = DummyEvaluationEngine({"都市1": ConnectionError("refused"), "都市2": KeyboardInterrupt()})
+        try:
+            EvaluationRunner(runtime_configuration, interrupted_engine).run_evaluation(str(case_file_path))
+        except KeyboardInterrupt:
+            pass
+        else:
+            raise AssertionError("interrupted evaluation did not propagate the interrupt")
+        (stream_file_path,) = Path(temporary_directory_path).glob("evaluation_*.jsonl")
+        streamed_lines = stream_file_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(streamed_line)["failure_reason"] for streamed_line in streamed_lines] == [None, "request_error"]
+        with stream_file_path.open(mode="a", encoding="utf-8") as stream_file:
+            stream_file.write('{"case_identifier": "case_2", "is_succ')
+
+        # Resume: the completed case is skipped, the request error and the lost case run again.
+        resumed_engine = DummyEvaluationEngine()
+        evaluation_summary, evaluation_case_results, result_file_path = EvaluationRunner(
+            runtime_configuration, resumed_engine
+        ).run_evaluation(str(case_file_path), resume_stream_file_path=str(stream_file_path))
+        assert resumed_engine.user_prompts == ["都市1", "都市2"]
+        assert [case_result.case_identifier for case_result in evaluation_case_results] == ["case_0", "case_1", "case_2"]
+        assert all(case_result.is_success for case_result in evaluation_case_results)
+        assert json.loads(Path(result_file_path).read_text(encoding="utf-8"))["summary"] == asdict(evaluation_summary)
+        assert all(json.loads(streamed_line) for streamed_line in stream_file_path.read_text(encoding="utf-8").splitlines())
+    print("Evaluation runner smoke tests passed.")
+
+
+def run_tool_execution_lane_smoke_tests() -> None:
+    timed_out_result = {"status": "error", "message": "Tool timed out after 1.0s."}
+    with ToolExecutionLanes(process_worker_count=1, execution_timeout_seconds=1.0) as tool_execution_lanes:
+        # Concurrent first calls share one pool instead of each spawning their own.
+        prepared_process_executors = []
+        preparing_threads = [
+            threading.Thread(
+                target=lambda: prepared_process_executors.append(tool_execution_lanes.prepare_lane(PROCESS_EXECUTION_LANE))
+            )
+            for _ in range(2)
+        ]
+        for preparing_thread in preparing_threads:
+            preparing_thread.start()
+        for preparing_thread in preparing_threads:
+            preparing_thread.join()
+        assert prepared_process_executors[0] is prepared_process_executors[1]
+
+        for lane_name in (THREAD_EXECUTION_LANE, PROCESS_EXECUTION_LANE):
+            quick_result = tool_execution_lanes.run_tool(lane_name, sleep_in_tool_worker, {"sleep_seconds": 0.0}, {})
+            assert quick_result == {"status": "ok", "slept_seconds": 0.0}
+            timeout_started_time = time.perf_counter()
+            stuck_result = tool_execution_lanes.run_tool(lane_name, sleep_in_tool_worker, {"sleep_seconds": 3.0}, {})
+            assert stuck_result == timed_out_result
+            assert time.perf_counter() - timeout_started_time < 2.5
+
+        # The stuck process worker was killed with its pool; the next call gets a fresh one.
+        assert tool_execution_lanes.prepare_lane(PROCESS_EXECUTION_LANE) is not prepared_process_executors[0]
+        recovered_result = tool_execution_lanes.run_tool(
+            PROCESS_EXECUTION_LANE, sleep_in_tool_worker, {"sleep_seconds": 0.0}, {}
+        )
+        assert recovered_result["status"] == "ok"
+    print("Tool execution lane smoke tests passed.")
+
+
+def run_evaluation_work_queue_smoke_tests() -> None:
+    current_time = [0.0]
+    evaluation_cases = [
+        EvaluationCase(f"case_{case_index}", "明日の東京の天気は？", "get_weather", ["location"]) for case_index in range(3)
+    ]
+
+    def build_case_result(case_identifier: str, failure_reason: str | None) -> EvaluationCaseResult:
+        return EvaluationCaseResult(case_identifier, failure_reason is None, failure_reason, "tool_calls", "get_weather", None)
+
+    with tempfile.TemporaryDirectory() as temporary_directory_path:
+        with EvaluationWorkQueue(
+            str(Path(temporary_directory_path) / "work_queue.sqlite3"),
+            lease_seconds=10.0,
+            max_lease_attempts=2,
+            time_function=lambda: current_time[0],
+        ) as work_queue:
+            assert work_queue.enqueue_cases(evaluation_cases) == 3
+
+            # An expired lease moves to another worker; the first worker's late result is dropped.
+            assert work_queue.claim_next_case("worker_a").case_identifier == "case_0"
+            current_time[0] += 11.0
+            assert work_queue.claim_next_case("worker_b").case_identifier == "case_0"
+            work_queue.complete_case(build_case_result("case_0", "wrong_tool_selected"), "worker_a")
+            assert work_queue.count_cases_by_state() == {"leased": 1, "pending": 2}
+            work_queue.complete_case(build_case_result("case_0", None), "worker_b")
+
+            # A request error is retried while lease attempts remain, then stored as is.
+            assert work_queue.claim_next_case("worker_a").case_identifier == "case_1"
+            work_queue.complete_case(build_case_result("case_1", "request_error"), "worker_a")
+            assert work_queue.claim_next_case("worker_b").case_identifier == "case_1"
+            work_queue.complete_case(build_case_result("case_1", "request_error"), "worker_b")
+
+            # A case whose every lease expires is recorded as worker_lost.
+            assert work_queue.claim_next_case("worker_a").case_identifier == "case_2"
+            current_time[0] += 11.0
+            assert work_queue.claim_next_case("worker_b").case_identifier == "case_2"
+            current_time[0] += 11.0
+            assert work_queue.claim_next_case("worker_c") is None
+            assert work_queue.count_cases_by_state() == {"done": 3}
+            assert [
+                (case_result.case_identifier, case_result.failure_reason) for case_result in work_queue.read_case_results()
+            ] == [("case_0", None), ("case_1", "request_error"), ("case_2", "worker_lost")]
+    print("Evaluation work queue smoke tests passed.")
+
+
+def run_tool_call_session_smoke_tests() -> None:
+    with tempfile.TemporaryDirectory() as session_directory_path:
+        session_manager = ToolCallSessionManager(
+            build_dummy_tool_call_engine(DummyToolRoutingChatClient()),
+            session_directory_path,
+            max_resident_sessions=1,
+            max_history_tokens=250,
+            max_summary_lines=2,
+        )
+        for turn_index in range(5):
+            assert session_manager.run_turn("alice", f"天気{turn_index}").is_success
+        alice_session = session_manager.get_session("alice")
+        # Old turns were evicted into summaries; only the newest summaries are kept.
+        assert alice_session.estimated_history_tokens <= 250 and alice_session.turn_count >= 1
+        assert len(alice_session.summary_lines) == 2
+        assert alice_session.summary_lines[-1].startswith(f"- user: 天気{4 - alice_session.turn_count}")
+        alice_conversation_history = alice_session.build_conversation_history()
+
+        # A second session pushes the idle one over the resident cap into its session file.
+        session_manager.run_turn("bob", "天気")
+        assert session_manager.resident_session_count == 1 and alice_session.is_closed
+        assert session_manager.build_session_file_path("alice").exists()
+        # Identical tool results are stored once across sessions.
+        assert session_manager.tool_result_store.entry_count == 1
+
+        # Concurrent lookups of a spilled session restore it once, from its file.
+        restored_sessions = []
+        lookup_threads = [
+            threading.Thread(target=lambda: restored_sessions.append(session_manager.get_session("alice")))
+            for _ in range(4)
+        ]
+        for lookup_thread in lookup_threads:
+            lookup_thread.start()
+        for lookup_thread in lookup_threads:
+            lookup_thread.join()
+        assert len({id(restored_session) for restored_session in restored_sessions}) == 1
+        assert restored_sessions[0].build_conversation_history() == alice_conversation_history
+
+        session_manager.end_session("alice")
+        assert not session_manager.build_session_file_path("alice").exists()
+    print("Tool call session smoke tests passed.")
+
+
+def run_import_time_smoke_tests() -> None:
+    # A fresh interpreter, so modules imported by this script do not hide a regression.
+    probe_output_lines = subprocess.run(
+        [sys.executable, "-c", IMPORT_TIME_PROBE_SOURCE, *HEAVY_IMPORT_MODULE_NAMES],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+    import_seconds = float(probe_output_lines[0])
+    assert probe_output_lines[1] == "", f"public API import pulled in: {probe_output_lines[1]}"
+    assert import_seconds < IMPORT_TIME_BUDGET_SECONDS, f"public API import took {import_seconds:.3f}s"
+    print(f"Import time smoke tests passed ({import_seconds * 1000:.0f} ms).")
+
+
 def main() -> None:
     run_parser_smoke_tests()
     run_validation_smoke_tests()
+    run_tool_registry_smoke_tests()
+    run_self_consistency_smoke_tests()
+    run_tool_message_encoding_smoke_tests()
+    run_constrained_decoding_smoke_tests()
+    run_trace_logging_smoke_tests()
+    run_speculative_execution_smoke_tests()
+    run_tool_call_session_smoke_tests()
+    run_evaluation_runner_smoke_tests()
+    run_tool_execution_lane_smoke_tests()
+    run_evaluation_work_queue_smoke_tests()
+    run_adaptive_concurrency_smoke_tests()
+    run_scheduler_smoke_tests()
+    run_gateway_smoke_tests()
+    run_import_time_smoke_tests()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,46 @@
 """Responsibility: expose the public library API for robust local-LLM tool calling."""
 
-from .config import RuntimeConfiguration
-from .tool_orchestrator import ToolCallEngine
-from .evaluation_runner import EvaluationRunner
-from .models import EvaluationSummary
-from .tool_schemas import build_tool_schemas
-from .tools import DummyDataStores, build_tool_executor_map
-
-__all__ = [
-    "build_tool_executor_map",
-    "build_tool_schemas",
-    "DummyDataStores",
-    "EvaluationRunner",
-    "EvaluationSummary",
-    "RuntimeConfiguration",
-    "ToolCallEngine",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .config import RuntimeConfiguration
+    from .evaluation_runner import EvaluationRunner
+    from .lfm_tool_call_parser import LfmToolCallParser
+    from .models import EvaluationSummary
+    from .tool_orchestrator import ToolCallEngine
+    from .tool_schemas import build_tool_schemas
+    from .tool_validation import validate_tool_call_against_schema
+    from .tools import DummyDataStores, build_tool_executor_map
+
+# PEP 562: public names resolve on first access, so importing the package does not pull in
+# the OpenAI SDK for callers that only need the parser or the validators.
+_PUBLIC_ATTRIBUTE_MODULE_NAMES = {
+    "build_tool_executor_map": ".tools",
+    "build_tool_schemas": ".tool_schemas",
+    "DummyDataStores": ".tools",
+    "EvaluationRunner": ".evaluation_runner",
+    "EvaluationSummary": ".models",
+    "LfmToolCallParser": ".lfm_tool_call_parser",
+    "RuntimeConfiguration": ".config",
+    "ToolCallEngine": ".tool_orchestrator",
+    "validate_tool_call_against_schema": ".tool_validation",
+}
+
+__all__ = sorted(_PUBLIC_ATTRIBUTE_MODULE_NAMES, key=str.lower)
+
+
+def __getattr__(attribute_name: str) -> Any:
+    module_name = _PUBLIC_ATTRIBUTE_MODULE_NAMES.get(attribute_name)
+    # Guard: keep the normal AttributeError for anything outside the public API.
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {attribute_name!r}")
+    attribute_value = getattr(import_module(module_name, __name__), attribute_name)
+    globals()[attribute_name] = attribute_value
+    return attribute_value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
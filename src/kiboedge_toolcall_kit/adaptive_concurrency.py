@@ -0,0 +1,258 @@
+"""Responsibility: adapt in-flight limits and request pacing to observed latency, errors and host pressure."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Iterator
+
+from .config import RuntimeConfiguration
+
+PRESSURE_SAMPLE_INTERVAL_SECONDS = 1.0
+PACING_DELAY_RECOVERY_FACTOR = 0.5
+PACING_DELAY_BACKOFF_FACTOR = 2.0
+# An overloaded backend gets at least this long to recover, even when the configured minimum is lower.
+MIN_BACKOFF_PACING_DELAY_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class HostPressureSnapshot:
+    """Host load readings; fields are None when the platform does not expose them."""
+
+    cpu_utilization_ratio: float | None
+    memory_available_ratio: float | None
+    cpu_pressure_some_avg10_percent: float | None
+    memory_pressure_some_avg10_percent: float | None
+
+
+class HostPressureSampler:
+    """Reads CPU, memory and PSI pressure from /proc on Linux; returns empty readings elsewhere."""
+
+    def __init__(self, proc_directory_path: str = "/proc") -> None:
+        self._proc_directory = Path(proc_directory_path)
+        self._previous_cpu_times: tuple[int, int] | None = None
+
+    def sample(self) -> HostPressureSnapshot:
+        return HostPressureSnapshot(
+            cpu_utilization_ratio=self._read_cpu_utilization_ratio(),
+            memory_available_ratio=self._read_memory_available_ratio(),
+            cpu_pressure_some_avg10_percent=self._read_pressure_some_avg10("cpu"),
+            memory_pressure_some_avg10_percent=self._read_pressure_some_avg10("memory"),
+        )
+
+    def _read_cpu_utilization_ratio(self) -> float | None:
+        stat_lines = self._read_proc_lines("stat")
+        # Guard: non-Linux hosts have no /proc/stat.
+        if not stat_lines or not stat_lines[0].startswith("cpu "):
+            return None
+
+        cpu_time_values = [int(value_text) for value_text in stat_lines[0].split()[1:]]
+        idle_time = cpu_time_values[3] + (cpu_time_values[4] if len(cpu_time_values) > 4 else 0)
+        total_time = sum(cpu_time_values)
+        previous_cpu_times = self._previous_cpu_times
+        self._previous_cpu_times = (idle_time, total_time)
+        # Guard: utilization needs two readings to form a delta.
+        if previous_cpu_times is None or total_time <= previous_cpu_times[1]:
+            return None
+
+        total_time_delta = total_time - previous_cpu_times[1]
+        idle_time_delta = idle_time - previous_cpu_times[0]
+        return max(0.0, min(1.0, 1.0 - idle_time_delta / total_time_delta))
+
+    def _read_memory_available_ratio(self) -> float | None:
+        memory_values_kib: dict[str, int] = {}
+        for meminfo_line in self._read_proc_lines("meminfo"):
+            field_name, _, field_value_text = meminfo_line.partition(":")
+            field_value_parts = field_value_text.split()
+            if field_value_parts:
+                memory_values_kib[field_name] = int(field_value_parts[0])
+
+        if not memory_values_kib.get("MemTotal") or "MemAvailable" not in memory_values_kib:
+            return None
+        return memory_values_kib["MemAvailable"] / memory_values_kib["MemTotal"]
+
+    def _read_pressure_some_avg10(self, resource_name: str) -> float | None:
+        for pressure_line in self._read_proc_lines(f"pressure/{resource_name}"):
+            if not pressure_line.startswith("some "):
+                continue
+            for pressure_field in pressure_line.split()[1:]:
+                field_name, _, field_value_text = pressure_field.partition("=")
+                if field_name == "avg10":
+                    return float(field_value_text)
+        return None
+
+    def _read_proc_lines(self, relative_path: str) -> list[str]:
+        try:
+            return (self._proc_directory / relative_path).read_text(encoding="ascii").splitlines()
+        except (OSError, ValueError):
+            return []
+
+
+class AdaptiveConcurrencyController:
+    """AIMD controller for allowed in-flight requests and the pause between requests.
+
+    Each observed request either looks healthy (no error, latency under target, host not
+    under pressure), which grows the limit additively and shrinks the pacing delay, or
+    overloaded, which cuts the limit multiplicatively and backs the delay off exponentially.
+
+    CPU utilization cannot tell the model's own inference from other load, so it only counts
+    on kernels without PSI and only for sampling windows in which no request was in flight.
+    """
+
+    def __init__(
+        self,
+        min_concurrency_limit: int = 1,
+        max_concurrency_limit: int = 1,
+        target_latency_seconds: float = 8.0,
+        initial_pacing_delay_seconds: float = 2.0,
+        min_pacing_delay_seconds: float = 0.5,
+        max_pacing_delay_seconds: float = 30.0,
+        multiplicative_decrease_factor: float = 0.5,
+        cpu_pressure_threshold_percent: float = 40.0,
+        max_cpu_utilization_ratio: float = 0.95,
+        memory_pressure_threshold_percent: float = 20.0,
+        min_memory_available_ratio: float = 0.1,
+        host_pressure_sampler: HostPressureSampler | None = None,
+        on_concurrency_limit_change: Callable[[int], None] | None = None,
+    ) -> None:
+        self._min_concurrency_limit = max(1, min_concurrency_limit)
+        self._max_concurrency_limit = max(self._min_concurrency_limit, max_concurrency_limit)
+        self._target_latency_seconds = target_latency_seconds
+        self._min_pacing_delay_seconds = min_pacing_delay_seconds
+        self._max_pacing_delay_seconds = max(min_pacing_delay_seconds, max_pacing_delay_seconds)
+        self._multiplicative_decrease_factor = multiplicative_decrease_factor
+        self._cpu_pressure_threshold_percent = cpu_pressure_threshold_percent
+        self._max_cpu_utilization_ratio = max_cpu_utilization_ratio
+        self._memory_pressure_threshold_percent = memory_pressure_threshold_percent
+        self._min_memory_available_ratio = min_memory_available_ratio
+        self._host_pressure_sampler = host_pressure_sampler or HostPressureSampler()
+        self._on_concurrency_limit_change = on_concurrency_limit_change
+
+        self._condition = threading.Condition()
+        self._concurrency_limit_value = float(self._min_concurrency_limit)
+        self._pacing_delay_seconds = min(
+            self._max_pacing_delay_seconds,
+            max(self._min_pacing_delay_seconds, initial_pacing_delay_seconds),
+        )
+        self._in_flight_request_count = 0
+        self._has_request_run_since_pressure_sample = False
+        self._is_cpu_utilization_window_idle = False
+        self._last_pressure_sample_time = 0.0
+        self._last_host_pressure_snapshot = HostPressureSnapshot(None, None, None, None)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._concurrency_limit_value)
+
+    @property
+    def pacing_delay_seconds(self) -> float:
+        return self._pacing_delay_seconds
+
+    @property
+    def last_host_pressure_snapshot(self) -> HostPressureSnapshot:
+        return self._last_host_pressure_snapshot
+
+    def record_request_outcome(self, latency_seconds: float, is_request_error: bool) -> None:
+        """Feed one observed request into the AIMD update."""
+        is_host_under_pressure = self._is_host_under_pressure()
+        with self._condition:
+            previous_concurrency_limit = self.concurrency_limit
+            if is_request_error or latency_seconds > self._target_latency_seconds or is_host_under_pressure:
+                self._concurrency_limit_value = max(
+                    float(self._min_concurrency_limit),
+                    self._concurrency_limit_value * self._multiplicative_decrease_factor,
+                )
+                self._pacing_delay_seconds = min(
+                    self._max_pacing_delay_seconds,
+                    max(
+                        self._pacing_delay_seconds * PACING_DELAY_BACKOFF_FACTOR,
+                        self._min_pacing_delay_seconds,
+                        MIN_BACKOFF_PACING_DELAY_SECONDS,
+                    ),
+                )
+            else:
+                # Additive increase of roughly one slot per window of `limit` healthy requests.
+                self._concurrency_limit_value = min(
+                    float(self._max_concurrency_limit),
+                    self._concurrency_limit_value + 1.0 / self._concurrency_limit_value,
+                )
+                self._pacing_delay_seconds = max(
+                    self._min_pacing_delay_seconds,
+                    self._pacing_delay_seconds * PACING_DELAY_RECOVERY_FACTOR,
+                )
+            current_concurrency_limit = self.concurrency_limit
+            self._condition.notify_all()
+
+        if current_concurrency_limit != previous_concurrency_limit and self._on_concurrency_limit_change is not None:
+            self._on_concurrency_limit_change(current_concurrency_limit)
+
+    def wait_before_next_request(self) -> None:
+        """Sleep for the current measured backoff instead of a fixed cooldown."""
+        if self._pacing_delay_seconds > 0:
+            time.sleep(self._pacing_delay_seconds)
+
+    @contextmanager
+    def request_slot(self) -> Iterator[None]:
+        """Hold one of the currently allowed in-flight slots for the duration of a request."""
+        with self._condition:
+            while self._in_flight_request_count >= self.concurrency_limit:
+                self._condition.wait()
+            self._in_flight_request_count += 1
+            self._has_request_run_since_pressure_sample = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight_request_count -= 1
+                self._condition.notify_all()
+
+    def _is_host_under_pressure(self) -> bool:
+        # Guard: /proc reads are cheap but not free; sample at most once per interval.
+        current_time = time.monotonic()
+        if current_time - self._last_pressure_sample_time >= PRESSURE_SAMPLE_INTERVAL_SECONDS:
+            self._last_pressure_sample_time = current_time
+            with self._condition:
+                self._is_cpu_utilization_window_idle = not self._has_request_run_since_pressure_sample
+                self._has_request_run_since_pressure_sample = self._in_flight_request_count > 0
+            self._last_host_pressure_snapshot = self._host_pressure_sampler.sample()
+
+        host_pressure_snapshot = self._last_host_pressure_snapshot
+        cpu_pressure_percent = host_pressure_snapshot.cpu_pressure_some_avg10_percent
+        # Guard: utilization is only a fallback for kernels without PSI, and a window that
+        # contains our own request mostly measures the model's inference, not contention.
+        cpu_utilization_ratio = (
+            host_pressure_snapshot.cpu_utilization_ratio
+            if cpu_pressure_percent is None and self._is_cpu_utilization_window_idle
+            else None
+        )
+        memory_pressure_percent = host_pressure_snapshot.memory_pressure_some_avg10_percent
+        memory_available_ratio = host_pressure_snapshot.memory_available_ratio
+        return (
+            (cpu_pressure_percent is not None and cpu_pressure_percent > self._cpu_pressure_threshold_percent)
+            or (cpu_utilization_ratio is not None and cpu_utilization_ratio > self._max_cpu_utilization_ratio)
+            or (memory_pressure_percent is not None and memory_pressure_percent > self._memory_pressure_threshold_percent)
+            or (memory_available_ratio is not None and memory_available_ratio < self._min_memory_available_ratio)
+        )
+
+
+def build_adaptive_concurrency_controller(
+    runtime_configuration: RuntimeConfiguration,
+    max_concurrency_limit: int = 1,
+    on_concurrency_limit_change: Callable[[int], None] | None = None,
+) -> AdaptiveConcurrencyController:
+    """Create a controller whose starting pacing is the configured per-case cooldown."""
+    return AdaptiveConcurrencyController(
+        max_concurrency_limit=max_concurrency_limit,
+        target_latency_seconds=runtime_configuration.adaptive_target_latency_seconds,
+        initial_pacing_delay_seconds=runtime_configuration.delay_between_evaluation_cases_seconds,
+        min_pacing_delay_seconds=runtime_configuration.adaptive_min_pacing_delay_seconds,
+        max_pacing_delay_seconds=runtime_configuration.adaptive_max_pacing_delay_seconds,
+        cpu_pressure_threshold_percent=runtime_configuration.adaptive_cpu_pressure_threshold_percent,
+        max_cpu_utilization_ratio=runtime_configuration.adaptive_max_cpu_utilization_ratio,
+        memory_pressure_threshold_percent=runtime_configuration.adaptive_memory_pressure_threshold_percent,
+        min_memory_available_ratio=runtime_configuration.adaptive_min_memory_available_ratio,
+        on_concurrency_limit_change=on_concurrency_limit_change,
+    )
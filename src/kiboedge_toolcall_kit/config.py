@@ -10,17 +10,83 @@ class RuntimeConfiguration:
     base_url: str = "http://127.0.0.1:1234/v1"
     api_key: str = "lm-studio"
     model_name: str = "lfm2-2.6b-exp"
+    backend_base_urls: tuple[str, ...] = ()
+    backend_routing_strategy: str = "least_outstanding"
+    backend_max_consecutive_failures: int = 3
+    backend_ejection_seconds: float = 30.0
+    backend_health_check_interval_seconds: float = 10.0
     request_timeout_seconds: float = 12.0
+    request_max_retry_attempts: int = 2
+    request_retry_base_delay_seconds: float = 0.5
+    request_retry_max_delay_seconds: float = 8.0
+    request_hedge_delay_seconds: float | None = None
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout_seconds: float = 30.0
     response_temperature: float = 0.1
     max_generation_tokens: int = 256
     max_tool_call_rounds_per_request: int = 3
     max_repair_attempts: int = 2
+    max_tokens_per_request: int | None = None
+    schema_violation_repair_enabled: bool = False
+    schema_enum_validation_enabled: bool = False
+    tool_schema_rendering: str = "full"
+    tool_message_encoding: str = "utf8_minified"
+    tool_result_projection_by_tool_name: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    tool_execution_lane_by_tool_name: tuple[tuple[str, str], ...] = ()
+    tool_thread_worker_count: int = 2
+    tool_process_worker_count: int = 2
+    tool_execution_timeout_seconds: float = 30.0
+    speculative_tool_execution_enabled: bool = False
+    speculative_guess_cache_size: int = 1024
+    speculative_worker_count: int = 1
+    use_constrained_decoding: bool = False
+    self_consistency_sample_count: int = 1
+    self_consistency_quorum_count: int | None = None
     sequential_execution_only: bool = True
+    scheduler_max_in_flight_requests: int = 1
+    scheduler_interactive_weight: int = 4
+    scheduler_batch_weight: int = 1
+    warmup_before_evaluation: bool = False
+    warmup_priming_request_count: int = 2
+    warmup_request_timeout_seconds: float = 120.0
+    readiness_timeout_seconds: float = 120.0
+    readiness_poll_interval_seconds: float = 2.0
     delay_between_evaluation_cases_seconds: float = 2.0
+    adaptive_target_latency_seconds: float = 8.0
+    adaptive_min_pacing_delay_seconds: float = 0.5
+    adaptive_max_pacing_delay_seconds: float = 30.0
+    adaptive_cpu_pressure_threshold_percent: float = 40.0
+    adaptive_max_cpu_utilization_ratio: float = 0.95
+    adaptive_memory_pressure_threshold_percent: float = 20.0
+    adaptive_min_memory_available_ratio: float = 0.1
+    evaluation_worker_count: int = 1
     max_consecutive_request_errors: int = 2
+    gateway_host: str = "127.0.0.1"
+    gateway_port: int = 8088
+    gateway_worker_count: int = 1
+    gateway_max_queued_requests: int = 16
+    gateway_max_request_body_bytes: int = 1_048_576
+    gateway_coalesce_identical_requests: bool = True
     log_directory_path: str = "logs"
+    session_directory_path: str = "logs/sessions"
+    session_max_resident_count: int = 1024
+    session_max_history_tokens: int = 2048
+    session_max_summary_lines: int = 8
+    trace_logging_enabled: bool = False
+    trace_queue_capacity: int = 1024
+    trace_batch_size: int = 64
+    trace_flush_interval_seconds: float = 1.0
+    trace_max_file_bytes: int = 16 * 1024 * 1024
+    trace_max_file_count: int = 20
+    trace_overload_sample_rate: float = 0.1
     evaluation_result_directory_path: str = "logs/evaluations"
+    fsync_evaluation_results: bool = False
     evaluation_case_file_path: str = "tests/fixtures/tool_call_cases_30.json"
+    evaluation_sample_seed: int = 0
+    work_queue_lease_seconds: float = 300.0
+    work_queue_max_lease_attempts: int = 3
+    work_queue_journal_mode: str = "wal"
+    work_queue_poll_interval_seconds: float = 5.0
 
 
 DEFAULT_RUNTIME_CONFIGURATION = RuntimeConfiguration()
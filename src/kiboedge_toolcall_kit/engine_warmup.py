@@ -0,0 +1,102 @@
+"""Responsibility: wait for the served model to load and prime its prompt cache before timed requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .config import RuntimeConfiguration
+from .lmstudio_client import build_openai_client
+from .load_balancing import resolve_backend_base_urls
+from .tool_orchestrator import ToolCallEngine
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+class ModelReadinessTimeoutError(RuntimeError):
+    """Raised when a backend does not list the configured model before the readiness timeout."""
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """Readiness wait plus cold (first priming) and warm (later priming) latency."""
+
+    model_ready_wait_seconds: float
+    priming_request_count: int
+    failed_priming_request_count: int
+    cold_latency_seconds: float | None
+    warm_latency_seconds: float | None
+
+
+def is_model_listed(openai_client: OpenAI, model_name: str) -> bool:
+    """Return whether ``GET /v1/models`` on this backend lists ``model_name``."""
+    try:
+        listed_models = openai_client.models.list()
+    except Exception:
+        # Guard: a server that is still starting refuses connections; keep polling.
+        return False
+    return any(getattr(listed_model, "id", None) == model_name for listed_model in listed_models)
+
+
+def wait_for_model_ready(
+    runtime_configuration: RuntimeConfiguration,
+    openai_client_factory: Callable[[RuntimeConfiguration], OpenAI] = build_openai_client,
+    sleep_function: Callable[[float], None] = time.sleep,
+) -> float:
+    """Poll every configured backend until each lists ``model_name``; return the seconds waited.
+
+    With LM Studio's just-in-time loading ``/v1/models`` may list downloaded models that are not
+    loaded yet; the priming completions in ``warm_up_engine`` then absorb the load time.
+    """
+    started_time = time.monotonic()
+    deadline_time = started_time + runtime_configuration.readiness_timeout_seconds
+    pending_openai_clients = {
+        base_url: openai_client_factory(replace(runtime_configuration, base_url=base_url))
+        for base_url in resolve_backend_base_urls(runtime_configuration)
+    }
+    while True:
+        pending_openai_clients = {
+            base_url: openai_client
+            for base_url, openai_client in pending_openai_clients.items()
+            if not is_model_listed(openai_client, runtime_configuration.model_name)
+        }
+        if not pending_openai_clients:
+            return time.monotonic() - started_time
+        if time.monotonic() >= deadline_time:
+            raise ModelReadinessTimeoutError(
+                f"Model {runtime_configuration.model_name} not ready after "
+                f"{runtime_configuration.readiness_timeout_seconds}s on: {', '.join(pending_openai_clients)}"
+            )
+        sleep_function(runtime_configuration.readiness_poll_interval_seconds)
+
+
+def warm_up_engine(tool_call_engine: ToolCallEngine, model_ready_wait_seconds: float = 0.0) -> WarmupReport:
+    """Send priming completions with the engine's real prompt and tools, timing the first against the rest."""
+    priming_request_count = tool_call_engine.runtime_configuration.warmup_priming_request_count
+    priming_latencies: list[float | None] = []
+    for _ in range(priming_request_count):
+        request_started_time = time.monotonic()
+        try:
+            tool_call_engine.send_priming_completion()
+        except Exception:
+            # Guard: a cold load may still time out; the following priming requests measure the recovery.
+            priming_latencies.append(None)
+            continue
+        priming_latencies.append(time.monotonic() - request_started_time)
+
+    warm_latencies = [priming_latency for priming_latency in priming_latencies[1:] if priming_latency is not None]
+    return WarmupReport(
+        model_ready_wait_seconds=model_ready_wait_seconds,
+        priming_request_count=priming_request_count,
+        failed_priming_request_count=sum(priming_latency is None for priming_latency in priming_latencies),
+        cold_latency_seconds=priming_latencies[0] if priming_latencies else None,
+        warm_latency_seconds=sum(warm_latencies) / len(warm_latencies) if warm_latencies else None,
+    )
+
+
+def prepare_engine_for_requests(tool_call_engine: ToolCallEngine) -> WarmupReport:
+    """Wait for the model on every backend, then prime the engine's prompt cache."""
+    model_ready_wait_seconds = wait_for_model_ready(tool_call_engine.runtime_configuration)
+    return warm_up_engine(tool_call_engine, model_ready_wait_seconds=model_ready_wait_seconds)
@@ -0,0 +1,480 @@
+"""Responsibility: aggregate many evaluation results column-wise and compare variants statistically."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import math
+from pathlib import Path
+from typing import Any, Iterable
+
+from .io_utils import read_json_file, read_json_lines
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the analysis extra.
+    np = None
+
+DEFAULT_LATENCY_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+DEFAULT_TOKEN_PERCENTILES = (50.0, 95.0)
+DEFAULT_BOOTSTRAP_RESAMPLE_COUNT = 2000
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+MCNEMAR_EXACT_TEST_MAX_DISCORDANT_PAIRS = 1000
+GROUPING_COLUMN_NAMES = ("variant", "tag", "source", "tool", "failure_reason")
+
+
+@dataclass(frozen=True)
+class EvaluationResultColumns:
+    """Column arrays of case results; one row per (variant, case) pair."""
+
+    variant_names: Any
+    case_identifiers: Any
+    success_flags: Any
+    latency_seconds: Any
+    total_tokens: Any
+    sources: Any
+    expected_tool_names: Any
+    failure_reasons: Any
+    tag_row_indices: Any
+    tag_values: Any
+
+    @property
+    def row_count(self) -> int:
+        return int(self.success_flags.shape[0])
+
+
+@dataclass(frozen=True)
+class GroupSuccessRate:
+    """Success rate of one group with a bootstrap confidence interval."""
+
+    total_cases: int
+    successful_cases: int
+    strict_success_rate: float
+    confidence_interval_low: float
+    confidence_interval_high: float
+
+
+@dataclass(frozen=True)
+class PairedVariantComparison:
+    """Paired comparison of two variants over the cases both of them evaluated."""
+
+    baseline_variant_name: str
+    candidate_variant_name: str
+    paired_case_count: int
+    baseline_success_rate: float
+    candidate_success_rate: float
+    success_rate_difference: float
+    confidence_interval_low: float
+    confidence_interval_high: float
+    baseline_only_success_count: int
+    candidate_only_success_count: int
+    mcnemar_p_value: float
+
+
+def load_result_columns(
+    result_file_paths: list[str],
+    variant_name_by_file_path: dict[str, str] | None = None,
+) -> EvaluationResultColumns:
+    """Load result JSONL streams or summary JSON files; variant defaults to the file stem."""
+    variant_name_by_file_path = variant_name_by_file_path or {}
+    result_records: list[tuple[str, dict[str, Any]]] = []
+    for result_file_path in result_file_paths:
+        variant_name = variant_name_by_file_path.get(result_file_path, Path(result_file_path).stem)
+        for result_payload in _read_result_payloads(result_file_path):
+            result_records.append((variant_name, result_payload))
+    return build_result_columns(result_records)
+
+
+def build_result_columns(result_records: Iterable[tuple[str, dict[str, Any]]]) -> EvaluationResultColumns:
+    """Convert (variant_name, result_dict) pairs into column arrays in a single pass."""
+    _require_numpy()
+    variant_names: list[str] = []
+    case_identifiers: list[str] = []
+    success_flags: list[bool] = []
+    latency_seconds: list[float] = []
+    total_tokens: list[float] = []
+    sources: list[str] = []
+    expected_tool_names: list[str] = []
+    failure_reasons: list[str] = []
+    tag_row_indices: list[int] = []
+    tag_values: list[str] = []
+
+    for row_index, (variant_name, result_payload) in enumerate(result_records):
+        is_success = bool(result_payload.get("is_success", False))
+        variant_names.append(variant_name)
+        case_identifiers.append(str(result_payload.get("case_identifier", "")))
+        success_flags.append(is_success)
+        # Older result files carry no latency; NaN keeps them out of percentile math.
+        latency_seconds.append(float(result_payload.get("latency_seconds", math.nan)))
+        total_tokens.append(_read_total_tokens(result_payload.get("token_usage")))
+        sources.append(str(result_payload.get("source", "none")))
+        expected_tool_names.append(str(result_payload.get("expected_tool_name", "")))
+        failure_reasons.append("" if is_success else str(result_payload.get("failure_reason") or "unknown_failure"))
+        for tag in result_payload.get("tags", []):
+            tag_row_indices.append(row_index)
+            tag_values.append(str(tag))
+
+    return EvaluationResultColumns(
+        variant_names=np.array(variant_names, dtype=str),
+        case_identifiers=np.array(case_identifiers, dtype=str),
+        success_flags=np.array(success_flags, dtype=bool),
+        latency_seconds=np.array(latency_seconds, dtype=np.float64),
+        total_tokens=np.array(total_tokens, dtype=np.float64),
+        sources=np.array(sources, dtype=str),
+        expected_tool_names=np.array(expected_tool_names, dtype=str),
+        failure_reasons=np.array(failure_reasons, dtype=str),
+        tag_row_indices=np.array(tag_row_indices, dtype=np.int64),
+        tag_values=np.array(tag_values, dtype=str),
+    )
+
+
+def compute_group_success_rates(
+    result_columns: EvaluationResultColumns,
+    grouping_column_name: str,
+    resample_count: int = DEFAULT_BOOTSTRAP_RESAMPLE_COUNT,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    random_seed: int = 0,
+) -> dict[str, GroupSuccessRate]:
+    """Compute per-group strict success rates with bootstrap confidence intervals."""
+    group_values, success_flags = _select_grouping_rows(result_columns, grouping_column_name)
+    # Guard: no rows means no groups.
+    if group_values.shape[0] == 0:
+        return {}
+
+    group_names, group_codes = np.unique(group_values, return_inverse=True)
+    total_counts = np.bincount(group_codes, minlength=group_names.shape[0])
+    success_counts = np.bincount(group_codes, weights=success_flags, minlength=group_names.shape[0]).astype(np.int64)
+    success_rates = success_counts / total_counts
+    interval_lows, interval_highs = _bootstrap_binomial_rate_intervals(
+        total_counts=total_counts,
+        success_rates=success_rates,
+        resample_count=resample_count,
+        confidence_level=confidence_level,
+        random_seed=random_seed,
+    )
+    return {
+        str(group_name): GroupSuccessRate(
+            total_cases=int(total_counts[group_index]),
+            successful_cases=int(success_counts[group_index]),
+            strict_success_rate=float(success_rates[group_index]),
+            confidence_interval_low=float(interval_lows[group_index]),
+            confidence_interval_high=float(interval_highs[group_index]),
+        )
+        for group_index, group_name in enumerate(group_names)
+    }
+
+
+def compute_latency_percentiles(
+    result_columns: EvaluationResultColumns,
+    grouping_column_name: str = "variant",
+    percentiles: tuple[float, ...] = DEFAULT_LATENCY_PERCENTILES,
+) -> dict[str, dict[str, float]]:
+    """Compute latency percentiles per group, ignoring rows without a recorded latency."""
+    return _compute_group_value_statistics(
+        result_columns,
+        result_columns.latency_seconds,
+        grouping_column_name,
+        percentiles,
+        include_totals=False,
+    )
+
+
+def compute_token_usage_statistics(
+    result_columns: EvaluationResultColumns,
+    grouping_column_name: str = "variant",
+    percentiles: tuple[float, ...] = DEFAULT_TOKEN_PERCENTILES,
+) -> dict[str, dict[str, float]]:
+    """Compute mean, sum and percentiles of total tokens per case, ignoring rows without usage."""
+    return _compute_group_value_statistics(
+        result_columns,
+        result_columns.total_tokens,
+        grouping_column_name,
+        percentiles,
+        include_totals=True,
+    )
+
+
+def bootstrap_success_rate_confidence_interval(
+    success_flags: Any,
+    resample_count: int = DEFAULT_BOOTSTRAP_RESAMPLE_COUNT,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    random_seed: int = 0,
+) -> tuple[float, float]:
+    """Bootstrap a confidence interval for the mean of a boolean success array."""
+    _require_numpy()
+    success_flags = np.asarray(success_flags, dtype=bool)
+    total_counts = np.array([success_flags.shape[0]])
+    if total_counts[0] == 0:
+        return (math.nan, math.nan)
+
+    interval_lows, interval_highs = _bootstrap_binomial_rate_intervals(
+        total_counts=total_counts,
+        success_rates=np.array([success_flags.mean()]),
+        resample_count=resample_count,
+        confidence_level=confidence_level,
+        random_seed=random_seed,
+    )
+    return (float(interval_lows[0]), float(interval_highs[0]))
+
+
+def compare_variants_paired(
+    result_columns: EvaluationResultColumns,
+    baseline_variant_name: str,
+    candidate_variant_name: str,
+    resample_count: int = DEFAULT_BOOTSTRAP_RESAMPLE_COUNT,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    random_seed: int = 0,
+) -> PairedVariantComparison:
+    """Compare two variants on shared cases with a paired bootstrap and McNemar's test."""
+    baseline_success_by_case = _build_success_by_case(result_columns, baseline_variant_name)
+    candidate_success_by_case = _build_success_by_case(result_columns, candidate_variant_name)
+    shared_case_identifiers, baseline_positions, candidate_positions = np.intersect1d(
+        baseline_success_by_case[0],
+        candidate_success_by_case[0],
+        assume_unique=True,
+        return_indices=True,
+    )
+    baseline_success_flags = baseline_success_by_case[1][baseline_positions]
+    candidate_success_flags = candidate_success_by_case[1][candidate_positions]
+    paired_case_count = int(shared_case_identifiers.shape[0])
+
+    baseline_only_success_count = int(np.count_nonzero(baseline_success_flags & ~candidate_success_flags))
+    candidate_only_success_count = int(np.count_nonzero(candidate_success_flags & ~baseline_success_flags))
+    if paired_case_count == 0:
+        return PairedVariantComparison(
+            baseline_variant_name=baseline_variant_name,
+            candidate_variant_name=candidate_variant_name,
+            paired_case_count=0,
+            baseline_success_rate=math.nan,
+            candidate_success_rate=math.nan,
+            success_rate_difference=math.nan,
+            confidence_interval_low=math.nan,
+            confidence_interval_high=math.nan,
+            baseline_only_success_count=0,
+            candidate_only_success_count=0,
+            mcnemar_p_value=1.0,
+        )
+
+    # Paired differences only take -1, 0 or +1, so resampling them is one multinomial draw.
+    difference_probabilities = np.array(
+        [
+            baseline_only_success_count / paired_case_count,
+            candidate_only_success_count / paired_case_count,
+        ]
+    )
+    random_generator = np.random.default_rng(random_seed)
+    resampled_counts = random_generator.multinomial(
+        paired_case_count,
+        [difference_probabilities[0], difference_probabilities[1], 1.0 - difference_probabilities.sum()],
+        size=resample_count,
+    )
+    resampled_differences = (resampled_counts[:, 1] - resampled_counts[:, 0]) / paired_case_count
+    tail_probability = (1.0 - confidence_level) / 2.0
+    interval_low, interval_high = np.quantile(resampled_differences, [tail_probability, 1.0 - tail_probability])
+
+    baseline_success_rate = float(baseline_success_flags.mean())
+    candidate_success_rate = float(candidate_success_flags.mean())
+    return PairedVariantComparison(
+        baseline_variant_name=baseline_variant_name,
+        candidate_variant_name=candidate_variant_name,
+        paired_case_count=paired_case_count,
+        baseline_success_rate=baseline_success_rate,
+        candidate_success_rate=candidate_success_rate,
+        success_rate_difference=candidate_success_rate - baseline_success_rate,
+        confidence_interval_low=float(interval_low),
+        confidence_interval_high=float(interval_high),
+        baseline_only_success_count=baseline_only_success_count,
+        candidate_only_success_count=candidate_only_success_count,
+        mcnemar_p_value=_compute_mcnemar_p_value(
+            baseline_only_success_count,
+            candidate_only_success_count,
+        ),
+    )
+
+
+def summarize_result_columns(
+    result_columns: EvaluationResultColumns,
+    baseline_variant_name: str | None = None,
+) -> dict[str, Any]:
+    """Build a JSON-ready report of group rates, latency percentiles and paired comparisons."""
+    variant_names = [str(variant_name) for variant_name in np.unique(result_columns.variant_names)]
+    comparison_baseline_name = baseline_variant_name or (variant_names[0] if variant_names else None)
+    return {
+        "total_rows": result_columns.row_count,
+        "success_rates": {
+            grouping_column_name: {
+                group_name: asdict(group_success_rate)
+                for group_name, group_success_rate in compute_group_success_rates(
+                    result_columns,
+                    grouping_column_name,
+                ).items()
+            }
+            for grouping_column_name in ("variant", "tag", "source", "tool")
+        },
+        "failure_counts_by_variant_and_reason": _count_failures_by_variant_and_reason(result_columns),
+        "latency_percentiles_by_variant": compute_latency_percentiles(result_columns, "variant"),
+        "latency_percentiles_by_tool": compute_latency_percentiles(result_columns, "tool"),
+        "token_usage_by_variant": compute_token_usage_statistics(result_columns, "variant"),
+        "token_usage_by_tool": compute_token_usage_statistics(result_columns, "tool"),
+        "token_usage_by_tag": compute_token_usage_statistics(result_columns, "tag"),
+        "paired_comparisons": [
+            asdict(compare_variants_paired(result_columns, comparison_baseline_name, variant_name))
+            for variant_name in variant_names
+            if variant_name != comparison_baseline_name
+        ],
+    }
+
+
+def _compute_group_value_statistics(
+    result_columns: EvaluationResultColumns,
+    row_values: Any,
+    grouping_column_name: str,
+    percentiles: tuple[float, ...],
+    include_totals: bool,
+) -> dict[str, dict[str, float]]:
+    _require_numpy()
+    # Guard: tags explode rows, so values are grouped on the exploded view as well.
+    if grouping_column_name == "tag":
+        group_values = result_columns.tag_values
+        row_values = row_values[result_columns.tag_row_indices]
+    else:
+        group_values = _get_grouping_column(result_columns, grouping_column_name)
+
+    has_value_mask = ~np.isnan(row_values)
+    group_values = group_values[has_value_mask]
+    row_values = row_values[has_value_mask]
+    if group_values.shape[0] == 0:
+        return {}
+
+    group_names, group_codes = np.unique(group_values, return_inverse=True)
+    sorted_order = np.argsort(group_codes, kind="stable")
+    group_boundaries = np.searchsorted(group_codes[sorted_order], np.arange(group_names.shape[0] + 1))
+    sorted_row_values = row_values[sorted_order]
+
+    statistics_by_group: dict[str, dict[str, float]] = {}
+    for group_index, group_name in enumerate(group_names):
+        group_row_values = sorted_row_values[group_boundaries[group_index] : group_boundaries[group_index + 1]]
+        percentile_values = np.percentile(group_row_values, percentiles)
+        group_statistics = {
+            f"p{percentile:g}": float(percentile_value)
+            for percentile, percentile_value in zip(percentiles, percentile_values)
+        }
+        if include_totals:
+            group_statistics["mean"] = float(group_row_values.mean())
+            group_statistics["sum"] = float(group_row_values.sum())
+        statistics_by_group[str(group_name)] = group_statistics
+    return statistics_by_group
+
+
+def _read_total_tokens(token_usage: Any) -> float:
+    # Older result files and servers without usage carry no counts; NaN keeps them out of the stats.
+    if not isinstance(token_usage, dict) or not token_usage:
+        return math.nan
+    if "total_tokens" in token_usage:
+        return float(token_usage["total_tokens"])
+    return float(token_usage.get("prompt_tokens", 0) + token_usage.get("completion_tokens", 0))
+
+
+def _read_result_payloads(result_file_path: str) -> list[dict[str, Any]]:
+    if result_file_path.endswith(".jsonl"):
+        # Resumed streams can repeat a case; the latest line wins like in the stream reader.
+        result_payload_by_case_identifier: dict[str, dict[str, Any]] = {}
+        for result_payload in read_json_lines(result_file_path):
+            if "case_identifier" not in result_payload:
+                continue
+            result_payload_by_case_identifier.pop(result_payload["case_identifier"], None)
+            result_payload_by_case_identifier[result_payload["case_identifier"]] = result_payload
+        return list(result_payload_by_case_identifier.values())
+
+    result_file_payload = read_json_file(result_file_path)
+    return list(result_file_payload.get("results", []))
+
+
+def _require_numpy() -> None:
+    # Guard: columnar analysis is optional so the runtime stays dependency-light.
+    if np is None:
+        raise ImportError(
+            "evaluation_columnar_metrics requires numpy; install with `pip install kiboedge-toolcall-kit[analysis]`."
+        )
+
+
+def _get_grouping_column(result_columns: EvaluationResultColumns, grouping_column_name: str) -> Any:
+    if grouping_column_name == "variant":
+        return result_columns.variant_names
+    if grouping_column_name == "source":
+        return result_columns.sources
+    if grouping_column_name == "tool":
+        return result_columns.expected_tool_names
+    if grouping_column_name == "failure_reason":
+        return result_columns.failure_reasons
+    raise ValueError(f"Unknown grouping column: {grouping_column_name} (known: {', '.join(GROUPING_COLUMN_NAMES)})")
+
+
+def _select_grouping_rows(result_columns: EvaluationResultColumns, grouping_column_name: str) -> tuple[Any, Any]:
+    _require_numpy()
+    if grouping_column_name == "tag":
+        return result_columns.tag_values, result_columns.success_flags[result_columns.tag_row_indices]
+    return _get_grouping_column(result_columns, grouping_column_name), result_columns.success_flags
+
+
+def _bootstrap_binomial_rate_intervals(
+    total_counts: Any,
+    success_rates: Any,
+    resample_count: int,
+    confidence_level: float,
+    random_seed: int,
+) -> tuple[Any, Any]:
+    # Resampling n Bernoulli outcomes is exactly one Binomial(n, p) draw, so all groups
+    # bootstrap together without materializing per-row resamples.
+    random_generator = np.random.default_rng(random_seed)
+    resampled_success_counts = random_generator.binomial(
+        total_counts[:, np.newaxis],
+        success_rates[:, np.newaxis],
+        size=(total_counts.shape[0], resample_count),
+    )
+    resampled_rates = resampled_success_counts / total_counts[:, np.newaxis]
+    tail_probability = (1.0 - confidence_level) / 2.0
+    interval_bounds = np.quantile(resampled_rates, [tail_probability, 1.0 - tail_probability], axis=1)
+    return interval_bounds[0], interval_bounds[1]
+
+
+def _build_success_by_case(result_columns: EvaluationResultColumns, variant_name: str) -> tuple[Any, Any]:
+    variant_mask = result_columns.variant_names == variant_name
+    case_identifiers = result_columns.case_identifiers[variant_mask]
+    success_flags = result_columns.success_flags[variant_mask]
+    # Guard: keep the last row per case so intersect1d can assume unique identifiers.
+    reversed_case_identifiers = case_identifiers[::-1]
+    unique_case_identifiers, reversed_positions = np.unique(reversed_case_identifiers, return_index=True)
+    return unique_case_identifiers, success_flags[::-1][reversed_positions]
+
+
+def _compute_mcnemar_p_value(baseline_only_success_count: int, candidate_only_success_count: int) -> float:
+    discordant_pair_count = baseline_only_success_count + candidate_only_success_count
+    if discordant_pair_count == 0:
+        return 1.0
+
+    # Guard: past this size the exact binomial sum gets slow; the normal approximation is accurate there.
+    if discordant_pair_count > MCNEMAR_EXACT_TEST_MAX_DISCORDANT_PAIRS:
+        z_score = (abs(baseline_only_success_count - candidate_only_success_count) - 1) / math.sqrt(discordant_pair_count)
+        return min(1.0, math.erfc(max(0.0, z_score) / math.sqrt(2.0)))
+
+    smaller_discordant_count = min(baseline_only_success_count, candidate_only_success_count)
+    lower_tail_probability = sum(
+        math.comb(discordant_pair_count, success_count) for success_count in range(smaller_discordant_count + 1)
+    ) / (2**discordant_pair_count)
+    return min(1.0, 2.0 * lower_tail_probability)
+
+
+def _count_failures_by_variant_and_reason(result_columns: EvaluationResultColumns) -> dict[str, dict[str, int]]:
+    failure_mask = ~result_columns.success_flags
+    failure_pairs = np.stack(
+        [result_columns.variant_names[failure_mask], result_columns.failure_reasons[failure_mask]],
+        axis=1,
+    )
+    if failure_pairs.shape[0] == 0:
+        return {}
+
+    unique_failure_pairs, failure_pair_counts = np.unique(failure_pairs, axis=0, return_counts=True)
+    failure_counts_by_variant_and_reason: dict[str, dict[str, int]] = {}
+    for (variant_name, failure_reason), failure_count in zip(unique_failure_pairs, failure_pair_counts):
+        failure_counts_by_variant_and_reason.setdefault(str(variant_name), {})[str(failure_reason)] = int(failure_count)
+    return failure_counts_by_variant_and_reason
@@ -0,0 +1,276 @@
+"""Responsibility: generate large synthetic evaluation case sets and stream case files with sharding and sampling."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+import json
+import random
+from typing import Any, Iterable, Iterator
+import zlib
+
+from .io_utils import read_json_file, read_json_lines
+from .models import EvaluationCase
+
+SYNTHETIC_CASE_TAG = "synthetic"
+
+_LOCATION_PHRASES = ("東京", "大阪", "札幌", "福岡", "名古屋", "那覇", "仙台", "京都", "横浜", "広島")
+_DAY_PHRASES = ("今日", "明日", "明後日", "週末", "来週月曜", "来週金曜", "3/14", "2026-04-01")
+_TIME_RANGE_PHRASES = ("10時から11時", "13:00-14:00", "9時半から10時半", "15時から16時", "18:00〜19:30")
+_DATE_RANGE_PHRASES = ("今日から明日まで", "今週", "来週", "今月", "3/1から3/7まで", "週末")
+_EVENT_TITLE_PHRASES = ("チーム定例", "1on1", "ランチ", "歯医者", "顧客訪問", "オフライン会議", "提出期限")
+_TASK_TITLE_PHRASES = ("資料提出", "洗濯", "請求書確認", "経費精算", "買い物", "メール返信", "PC更新")
+_NEWS_TOPIC_PHRASES = ("AI", "経済", "セキュリティ", "スポーツ", "半導体", "宇宙", "天気")
+_NEWS_TIMEFRAME_PHRASES = ("今日", "今週", "最新", "昨日", "今月")
+_SOUND_EVENT_PHRASES = ("うれしい", "注意喚起の", "悲しい", "タスク完了っぽい", "驚いた", "エラーっぽい")
+_TABLE_KEY_PAIRS = (
+    ("users", "user_001"),
+    ("users", "user_042"),
+    ("orders", "order_1001"),
+    ("orders", "order_2002"),
+    ("settings", "theme"),
+    ("settings", "feature_x_enabled"),
+)
+_WRITE_PAYLOAD_PHRASES = ("プロフィール", "配送済み", "true", "ダークモード", "住所変更")
+_REQUEST_PREFIXES = ("", "", "すみません、", "ねえ、", "至急、", "お手数ですが")
+_REQUEST_SUFFIXES = ("して", "してください", "お願いします", "して。", "頼む", "してほしい")
+
+# Japanese phrasing for schema enum values; unknown values are used verbatim.
+_ENUM_VALUE_PHRASES = {
+    "priority": {"low": "低", "normal": "通常", "high": "高"},
+    "intensity": {"low": "控えめ", "medium": "普通", "high": "強め"},
+    "status": {"open": "未完了", "done": "完了した", "all": "すべての"},
+}
+
+
+@dataclass(frozen=True)
+class CaseShard:
+    """Selects one of ``shard_count`` stable partitions of a case file."""
+
+    shard_index: int
+    shard_count: int
+
+    def __post_init__(self) -> None:
+        # Guard: a bad --shard would otherwise run an empty or overlapping slice silently.
+        if self.shard_count < 1 or not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"Invalid shard {self.shard_index}/{self.shard_count}")
+
+    def contains(self, case_identifier: str) -> bool:
+        return zlib.crc32(case_identifier.encode("utf-8")) % self.shard_count == self.shard_index
+
+
+@dataclass(frozen=True)
+class SyntheticCaseTemplate:
+    """One phrasing pattern for a tool; ``{slot}`` names are filled from the vocabularies above.
+
+    Templates end in a suru-verb noun followed by ``{suffix}``, so every politeness variant
+    (including "して。") reads naturally; nothing may follow the suffix.
+    """
+
+    case_tag: str
+    prompt_template: str
+    required_argument_keys: tuple[str, ...]
+    optional_argument_keys: tuple[str, ...] = ()
+
+
+SYNTHETIC_CASE_TEMPLATES_BY_TOOL_NAME: dict[str, tuple[SyntheticCaseTemplate, ...]] = {
+    "play_sound_effect": (
+        SyntheticCaseTemplate("sfx", "{sound_event}効果音を{intensity}で再生{suffix}", ("event_name", "intensity")),
+        SyntheticCaseTemplate("sfx", "{sound_event}感じのサウンドを{intensity}で出力{suffix}", ("event_name", "intensity")),
+    ),
+    "create_calendar_event": (
+        SyntheticCaseTemplate(
+            "calendar_create",
+            "{day}{time_range}で{event_title}をカレンダー登録{suffix}",
+            ("title", "start_datetime", "end_datetime"),
+        ),
+        SyntheticCaseTemplate(
+            "calendar_create",
+            "{day}の{time_range}に{location}で{event_title}の予定を追加{suffix}",
+            ("title", "start_datetime", "end_datetime"),
+            ("location",),
+        ),
+    ),
+    "read_calendar_events": (
+        SyntheticCaseTemplate("calendar_read", "{date_range}の予定を確認{suffix}", ("start_date", "end_date")),
+        SyntheticCaseTemplate("calendar_read", "{date_range}のカレンダーを表示{suffix}", ("start_date", "end_date")),
+    ),
+    "create_todo_task": (
+        SyntheticCaseTemplate("todo_create", "TODOに『{task_title}』を優先度{priority}で追加{suffix}", ("task_title", "priority")),
+        SyntheticCaseTemplate(
+            "todo_create",
+            "TODOへ『{task_title}』を{day}締切、優先度{priority}で登録{suffix}",
+            ("task_title", "priority"),
+            ("due_date",),
+        ),
+    ),
+    "read_todo_tasks": (
+        SyntheticCaseTemplate("todo_read", "{status}TODOを一覧表示{suffix}", ("status",)),
+        SyntheticCaseTemplate(
+            "todo_read",
+            "{status}TODOから『{task_title}』を含むタスクを検索{suffix}",
+            ("status",),
+            ("filter_text",),
+        ),
+    ),
+    "get_weather": (
+        SyntheticCaseTemplate("weather", "{location}の{day}の天気を確認{suffix}", ("location", "date")),
+        SyntheticCaseTemplate("weather", "{day}の{location}は晴れる？天気を取得{suffix}", ("location", "date")),
+    ),
+    "get_news": (
+        SyntheticCaseTemplate("news", "{news_topic}関連の{news_timeframe}のニュースを取得{suffix}", ("topic", "timeframe")),
+        SyntheticCaseTemplate("news", "{news_topic}ニュースを{news_timeframe}分で取得{suffix}", ("topic", "timeframe")),
+    ),
+    "read_database_record": (
+        SyntheticCaseTemplate("db_read", "{table_name}テーブルの{record_key}を参照{suffix}", ("table_name", "key")),
+        SyntheticCaseTemplate("db_read", "{table_name}から{record_key}キーを取得{suffix}", ("table_name", "key")),
+    ),
+    "write_database_record": (
+        SyntheticCaseTemplate(
+            "db_write",
+            "{table_name}の{record_key}に{write_payload}を記録{suffix}",
+            ("table_name", "key", "payload"),
+        ),
+        SyntheticCaseTemplate(
+            "db_write",
+            "{table_name}へ{record_key}={write_payload}を保存{suffix}",
+            ("table_name", "key", "payload"),
+        ),
+    ),
+}
+
+
+def parse_case_shard(shard_text: str) -> CaseShard:
+    """Parse ``"i/N"`` (zero-based ``i``) as used by ``--shard``."""
+    shard_index_text, separator, shard_count_text = shard_text.partition("/")
+    if not separator:
+        raise ValueError(f"Shard must look like i/N: {shard_text}")
+    return CaseShard(shard_index=int(shard_index_text), shard_count=int(shard_count_text))
+
+
+def build_evaluation_case(raw_case_object: dict[str, Any]) -> EvaluationCase:
+    """Build one ``EvaluationCase`` from its fixture / JSONL object."""
+    return EvaluationCase(
+        case_identifier=raw_case_object["case_identifier"],
+        user_prompt=raw_case_object["user_prompt"],
+        expected_tool_name=raw_case_object["expected_tool_name"],
+        required_argument_keys=raw_case_object["required_argument_keys"],
+        optional_argument_keys=raw_case_object.get("optional_argument_keys", []),
+        should_call_tool=raw_case_object.get("should_call_tool", True),
+        tags=raw_case_object.get("tags", []),
+    )
+
+
+def iter_evaluation_cases(
+    case_file_path: str,
+    case_shard: CaseShard | None = None,
+    sample_rate: float = 1.0,
+    sample_seed: int = 0,
+    max_cases: int | None = None,
+) -> Iterator[EvaluationCase]:
+    """Yield cases lazily from a ``.jsonl`` stream (or a legacy ``.json`` list).
+
+    Shard membership and sampling hash the case identifier, so a case always lands in the
+    same shard and sample regardless of file order or how many workers read the file.
+    """
+    # Guard: a rate outside (0, 1] is almost certainly a percent/fraction mix-up.
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError(f"sample_rate must be in (0, 1]: {sample_rate}")
+
+    if Path(case_file_path).suffix == ".jsonl":
+        raw_case_objects: Iterable[dict[str, Any]] = read_json_lines(case_file_path)
+    else:
+        raw_case_objects = read_json_file(case_file_path)
+
+    sample_threshold = int(sample_rate * 0x1_0000_0000)
+    selected_cases = (
+        build_evaluation_case(raw_case_object)
+        for raw_case_object in raw_case_objects
+        if (case_shard is None or case_shard.contains(raw_case_object["case_identifier"]))
+        and (
+            sample_rate >= 1.0
+            or zlib.crc32(f"{sample_seed}:{raw_case_object['case_identifier']}".encode("utf-8")) < sample_threshold
+        )
+    )
+    return islice(selected_cases, max_cases)
+
+
+def generate_synthetic_case_objects(
+    tool_schemas: list[dict[str, Any]],
+    case_count: int,
+    random_seed: int = 0,
+) -> Iterator[dict[str, Any]]:
+    """Yield ``case_count`` fixture-shaped case objects, cycling over tools that have templates.
+
+    Enum slots draw from the tool's own schema, so generated cases follow schema changes.
+    """
+    random_generator = random.Random(random_seed)
+    enum_values_by_tool_and_slot = {
+        (tool_schema["function"]["name"], property_name): property_schema["enum"]
+        for tool_schema in tool_schemas
+        for property_name, property_schema in tool_schema["function"]["parameters"]["properties"].items()
+        if "enum" in property_schema
+    }
+    tool_names = [
+        tool_schema["function"]["name"]
+        for tool_schema in tool_schemas
+        if tool_schema["function"]["name"] in SYNTHETIC_CASE_TEMPLATES_BY_TOOL_NAME
+    ]
+    # Guard: a catalog without templates would otherwise loop forever producing nothing.
+    if not tool_names:
+        raise ValueError("No synthetic case templates match the given tool schemas")
+
+    for case_index in range(case_count):
+        tool_name = tool_names[case_index % len(tool_names)]
+        case_template = random_generator.choice(SYNTHETIC_CASE_TEMPLATES_BY_TOOL_NAME[tool_name])
+        table_name, record_key = random_generator.choice(_TABLE_KEY_PAIRS)
+        slot_values = {
+            "location": random_generator.choice(_LOCATION_PHRASES),
+            "day": random_generator.choice(_DAY_PHRASES),
+            "time_range": random_generator.choice(_TIME_RANGE_PHRASES),
+            "date_range": random_generator.choice(_DATE_RANGE_PHRASES),
+            "event_title": random_generator.choice(_EVENT_TITLE_PHRASES),
+            "task_title": random_generator.choice(_TASK_TITLE_PHRASES),
+            "news_topic": random_generator.choice(_NEWS_TOPIC_PHRASES),
+            "news_timeframe": random_generator.choice(_NEWS_TIMEFRAME_PHRASES),
+            "sound_event": random_generator.choice(_SOUND_EVENT_PHRASES),
+            "table_name": table_name,
+            "record_key": record_key,
+            "write_payload": random_generator.choice(_WRITE_PAYLOAD_PHRASES),
+            "suffix": random_generator.choice(_REQUEST_SUFFIXES),
+        }
+        enum_tags = []
+        for enum_slot_name, enum_phrase_by_value in _ENUM_VALUE_PHRASES.items():
+            enum_values = enum_values_by_tool_and_slot.get((tool_name, enum_slot_name))
+            if enum_values is None:
+                continue
+            enum_value = random_generator.choice(enum_values)
+            slot_values[enum_slot_name] = enum_phrase_by_value.get(enum_value, enum_value)
+            enum_tags.append(f"{enum_slot_name}:{enum_value}")
+
+        user_prompt = random_generator.choice(_REQUEST_PREFIXES) + case_template.prompt_template.format(**slot_values)
+        yield {
+            "case_identifier": f"syn_{case_template.case_tag}_{case_index:06d}",
+            "user_prompt": user_prompt,
+            "expected_tool_name": tool_name,
+            "required_argument_keys": list(case_template.required_argument_keys),
+            "optional_argument_keys": list(case_template.optional_argument_keys),
+            "tags": [case_template.case_tag, SYNTHETIC_CASE_TAG, *enum_tags],
+        }
+
+
+def write_synthetic_case_file(
+    output_file_path: str,
+    tool_schemas: list[dict[str, Any]],
+    case_count: int,
+    random_seed: int = 0,
+) -> int:
+    """Stream generated cases to a JSONL file and return how many were written."""
+    Path(output_file_path).parent.mkdir(parents=True, exist_ok=True)
+    written_case_count = 0
+    with Path(output_file_path).open(mode="w", encoding="utf-8") as output_file:
+        for case_object in generate_synthetic_case_objects(tool_schemas, case_count, random_seed):
+            output_file.write(json.dumps(case_object, ensure_ascii=False) + "\n")
+            written_case_count += 1
+    return written_case_count
@@ -0,0 +1,363 @@
+"""Responsibility: evaluate prompt-variant x model x temperature cells through one shared scheduler."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, replace
+import math
+import re
+import threading
+from typing import TYPE_CHECKING
+
+
+from .adaptive_concurrency import build_adaptive_concurrency_controller
+from .config import RuntimeConfiguration
+from .engine_warmup import WarmupReport
+from .evaluation_metrics import summarize_evaluation_results
+from .evaluation_result_stream import EvaluationResultStreamWriter, read_evaluation_case_results
+from .evaluation_runner import EvaluationRunner
+from .io_utils import build_timestamp_suffix, write_json_file
+from .lfm_tool_call_parser import LfmToolCallParser
+from .lmstudio_client import ChatCompletionClient, LmStudioChatClient, build_openai_client
+from .load_balancing import BackendEndpointPool, LoadBalancedChatClient, resolve_backend_base_urls
+from .models import EvaluationCase, EvaluationCaseResult, EvaluationSummary
+from .prompt_templates import build_system_prompt_for_variant
+from .rate_limiter import RequestRateLimiter
+from .resilience import build_resilient_chat_client
+from .tool_orchestrator import ToolCallEngine
+from .tool_schema_rendering import FULL_TOOL_SCHEMA_RENDERING
+from .tool_schemas import build_tool_schemas
+from .tools import DummyDataStores, build_tool_executor_map
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+CELL_SLUG_UNSAFE_CHARACTER_PATTERN = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass(frozen=True)
+class EvaluationMatrixCell:
+    """One combination of prompt variant, model, sampling temperature and tool schema rendering."""
+
+    prompt_variant_name: str
+    model_name: str
+    response_temperature: float
+    tool_schema_rendering_name: str = FULL_TOOL_SCHEMA_RENDERING
+
+    @property
+    def cell_identifier(self) -> str:
+        cell_identifier = f"{self.prompt_variant_name}|{self.model_name}|t={self.response_temperature:g}"
+        # Guard: full-schema cells keep their historical identifiers (and stream file names).
+        if self.tool_schema_rendering_name != FULL_TOOL_SCHEMA_RENDERING:
+            cell_identifier += f"|r={self.tool_schema_rendering_name}"
+        return cell_identifier
+
+
+@dataclass(frozen=True)
+class EvaluationMatrixCellReport:
+    """Final metrics of one matrix cell."""
+
+    cell: EvaluationMatrixCell
+    summary: EvaluationSummary
+    result_stream_file_path: str
+    eliminated_after_rung: int | None
+    rendered_tool_character_count: int
+    warmup_report: WarmupReport | None = None
+
+
+class _MatrixCellState:
+    """Mutable per-cell bookkeeping shared by pool workers."""
+
+    def __init__(
+        self,
+        cell: EvaluationMatrixCell,
+        evaluation_runner: EvaluationRunner,
+        result_stream_writer: EvaluationResultStreamWriter,
+        rendered_tool_character_count: int,
+    ) -> None:
+        self.cell = cell
+        self.evaluation_runner = evaluation_runner
+        self.result_stream_writer = result_stream_writer
+        self.rendered_tool_character_count = rendered_tool_character_count
+        self.lock = threading.Lock()
+        self.consecutive_request_error_count = 0
+        self.is_stopped_by_request_errors = False
+        self.eliminated_after_rung: int | None = None
+
+
+def build_evaluation_matrix_cells(
+    prompt_variant_names: list[str],
+    model_names: list[str],
+    response_temperatures: list[float],
+    tool_schema_rendering_names: list[str] | None = None,
+) -> list[EvaluationMatrixCell]:
+    """Expand variant, model, temperature and rendering lists into the full cross product."""
+    return [
+        EvaluationMatrixCell(prompt_variant_name, model_name, response_temperature, tool_schema_rendering_name)
+        for prompt_variant_name in prompt_variant_names
+        for model_name in model_names
+        for response_temperature in response_temperatures
+        for tool_schema_rendering_name in tool_schema_rendering_names or [FULL_TOOL_SCHEMA_RENDERING]
+    ]
+
+
+class EvaluationMatrixRunner:
+    """Runs every matrix cell through one worker pool and rate limiter, with optional successive halving."""
+
+    def __init__(
+        self,
+        runtime_configuration: RuntimeConfiguration,
+        cells: list[EvaluationMatrixCell],
+        successive_halving_enabled: bool = False,
+        halving_initial_case_count: int = 4,
+    ) -> None:
+        # Guard: a matrix without cells has nothing to compare.
+        if not cells:
+            raise ValueError("EvaluationMatrixRunner requires at least one cell.")
+
+        self._runtime_configuration = runtime_configuration
+        self._cells = cells
+        self._successive_halving_enabled = successive_halving_enabled
+        self._halving_initial_case_count = max(1, halving_initial_case_count)
+        self._rate_limiter = RequestRateLimiter(runtime_configuration.delay_between_evaluation_cases_seconds)
+        self._adaptive_concurrency_controller = build_adaptive_concurrency_controller(
+            runtime_configuration,
+            max_concurrency_limit=max(1, runtime_configuration.evaluation_worker_count),
+        )
+        # Guard: with several backends the cells share one health-tracked pool instead of one SDK client.
+        backend_base_urls = resolve_backend_base_urls(runtime_configuration)
+        self._shared_endpoint_pool: BackendEndpointPool | None = None
+        self._shared_openai_client: OpenAI | None = None
+        if len(backend_base_urls) > 1:
+            self._shared_endpoint_pool = BackendEndpointPool(runtime_configuration)
+        else:
+            self._shared_openai_client = build_openai_client(replace(runtime_configuration, base_url=backend_base_urls[0]))
+
+    def run_matrix(
+        self,
+        case_file_path: str | None = None,
+        max_cases: int | None = None,
+    ) -> tuple[list[EvaluationMatrixCellReport], str]:
+        """Evaluate all cells and write a comparative report; returns reports ranked best-first."""
+        timestamp_suffix = build_timestamp_suffix()
+        matrix_directory_path = f"{self._runtime_configuration.evaluation_result_directory_path}/matrix_{timestamp_suffix}"
+        cell_states = [self._build_cell_state(cell, matrix_directory_path) for cell in self._cells]
+        if self._runtime_configuration.warmup_before_evaluation:
+            for cell_state in cell_states:
+                cell_state.evaluation_runner.warm_up()
+
+        case_path = case_file_path or self._runtime_configuration.evaluation_case_file_path
+        evaluation_cases = cell_states[0].evaluation_runner.load_cases(case_path)
+        if max_cases is not None:
+            evaluation_cases = evaluation_cases[:max_cases]
+        if self._successive_halving_enabled:
+            evaluation_cases = _interleave_cases_by_tag(evaluation_cases)
+
+        rung_records: list[dict[str, object]] = []
+        surviving_cell_states = list(cell_states)
+        completed_case_count = 0
+        for rung_index, rung_case_count in enumerate(self._build_rung_case_counts(len(evaluation_cases))):
+            rung_cases = evaluation_cases[completed_case_count:rung_case_count]
+            self._run_rung(surviving_cell_states, rung_cases)
+            completed_case_count = rung_case_count
+
+            if self._successive_halving_enabled and rung_case_count < len(evaluation_cases):
+                surviving_cell_states = self._select_surviving_cells(surviving_cell_states, rung_index)
+            rung_records.append(
+                {
+                    "rung_index": rung_index,
+                    "case_count": rung_case_count,
+                    "surviving_cell_identifiers": [
+                        cell_state.cell.cell_identifier for cell_state in surviving_cell_states
+                    ],
+                }
+            )
+
+        cell_reports = [self._build_cell_report(cell_state) for cell_state in cell_states]
+        cell_reports.sort(key=_cell_report_ranking_key)
+        report_file_path = f"{matrix_directory_path}/matrix_report.json"
+        write_json_file(report_file_path, _build_comparative_report(cell_reports, rung_records))
+        return cell_reports, report_file_path
+
+    def _build_cell_state(self, cell: EvaluationMatrixCell, matrix_directory_path: str) -> _MatrixCellState:
+        cell_configuration = replace(
+            self._runtime_configuration,
+            model_name=cell.model_name,
+            response_temperature=cell.response_temperature,
+            tool_schema_rendering=cell.tool_schema_rendering_name,
+        )
+        tool_call_engine = ToolCallEngine(
+            runtime_configuration=cell_configuration,
+            chat_client=self._build_cell_chat_client(cell_configuration),
+            tool_schemas=build_tool_schemas(),
+            tool_executor_map=build_tool_executor_map(DummyDataStores()),
+            parser=LfmToolCallParser(),
+            system_prompt_text=build_system_prompt_for_variant(cell.prompt_variant_name),
+        )
+        cell_slug = CELL_SLUG_UNSAFE_CHARACTER_PATTERN.sub("_", cell.cell_identifier)
+        result_stream_writer = EvaluationResultStreamWriter(
+            stream_file_path=f"{matrix_directory_path}/{cell_slug}.jsonl",
+            fsync_enabled=self._runtime_configuration.fsync_evaluation_results,
+        )
+        return _MatrixCellState(
+            cell=cell,
+            evaluation_runner=EvaluationRunner(cell_configuration, tool_call_engine),
+            result_stream_writer=result_stream_writer,
+            rendered_tool_character_count=tool_call_engine.rendered_tool_set.rendered_character_count,
+        )
+
+    def _build_cell_chat_client(self, cell_configuration: RuntimeConfiguration) -> ChatCompletionClient:
+        backend_base_urls = resolve_backend_base_urls(cell_configuration)
+        if self._shared_endpoint_pool is not None:
+            cell_chat_client: ChatCompletionClient = LoadBalancedChatClient(cell_configuration, self._shared_endpoint_pool)
+        else:
+            cell_chat_client = LmStudioChatClient(cell_configuration, openai_client=self._shared_openai_client)
+        # Cells share one breaker per backend set, so a dead server stops every cell at once.
+        return build_resilient_chat_client(cell_configuration, cell_chat_client, circuit_name=",".join(backend_base_urls))
+
+    def _build_rung_case_counts(self, total_case_count: int) -> list[int]:
+        if not self._successive_halving_enabled or total_case_count == 0:
+            return [total_case_count]
+
+        rung_case_counts: list[int] = []
+        rung_case_count = min(self._halving_initial_case_count, total_case_count)
+        while rung_case_count < total_case_count:
+            rung_case_counts.append(rung_case_count)
+            rung_case_count *= 2
+        rung_case_counts.append(total_case_count)
+        return rung_case_counts
+
+    def _run_rung(self, cell_states: list[_MatrixCellState], rung_cases: list[EvaluationCase]) -> None:
+        # Interleave by case so every cell advances at the same pace through the shared pool.
+        scheduled_work = [
+            (cell_state, evaluation_case) for evaluation_case in rung_cases for cell_state in cell_states
+        ]
+        with ExitStack() as writer_stack:
+            for cell_state in cell_states:
+                writer_stack.enter_context(cell_state.result_stream_writer)
+            with ThreadPoolExecutor(
+                max_workers=max(1, self._runtime_configuration.evaluation_worker_count),
+                thread_name_prefix="evaluation-matrix",
+            ) as worker_pool:
+                for _ in worker_pool.map(lambda work: self._run_scheduled_case(*work), scheduled_work):
+                    pass
+
+    def _run_scheduled_case(self, cell_state: _MatrixCellState, evaluation_case: EvaluationCase) -> None:
+        # Guard: cells that hit repeated request errors stop consuming the shared pool.
+        if cell_state.is_stopped_by_request_errors:
+            return
+
+        # Workers beyond the adaptive limit wait here until the host has shown it keeps up.
+        with self._adaptive_concurrency_controller.request_slot():
+            self._rate_limiter.acquire()
+            evaluation_case_result = cell_state.evaluation_runner.run_single_case(evaluation_case)
+        self._adaptive_concurrency_controller.record_request_outcome(
+            latency_seconds=evaluation_case_result.latency_seconds,
+            is_request_error=evaluation_case_result.failure_reason == "request_error",
+        )
+        self._rate_limiter.set_minimum_interval_seconds(self._adaptive_concurrency_controller.pacing_delay_seconds)
+        with cell_state.lock:
+            cell_state.result_stream_writer.append_result(evaluation_case_result)
+            if evaluation_case_result.failure_reason == "request_error":
+                cell_state.consecutive_request_error_count += 1
+            else:
+                cell_state.consecutive_request_error_count = 0
+            if (
+                cell_state.consecutive_request_error_count
+                >= self._runtime_configuration.max_consecutive_request_errors
+            ):
+                cell_state.is_stopped_by_request_errors = True
+
+    def _select_surviving_cells(
+        self,
+        cell_states: list[_MatrixCellState],
+        rung_index: int,
+    ) -> list[_MatrixCellState]:
+        # Guard: a single remaining cell simply runs the rest of the cases.
+        if len(cell_states) <= 1:
+            return cell_states
+
+        success_rate_by_cell_identifier = {
+            cell_state.cell.cell_identifier: _read_cell_summary(cell_state).strict_success_rate
+            for cell_state in cell_states
+        }
+        ranked_success_rates = sorted(success_rate_by_cell_identifier.values(), reverse=True)
+        cutoff_success_rate = ranked_success_rates[math.ceil(len(cell_states) / 2) - 1]
+
+        surviving_cell_states: list[_MatrixCellState] = []
+        for cell_state in cell_states:
+            # Ties at the cutoff survive so equal performers are not dropped arbitrarily.
+            if success_rate_by_cell_identifier[cell_state.cell.cell_identifier] >= cutoff_success_rate:
+                surviving_cell_states.append(cell_state)
+            else:
+                cell_state.eliminated_after_rung = rung_index
+        return surviving_cell_states
+
+    def _build_cell_report(self, cell_state: _MatrixCellState) -> EvaluationMatrixCellReport:
+        return EvaluationMatrixCellReport(
+            cell=cell_state.cell,
+            summary=_read_cell_summary(cell_state),
+            result_stream_file_path=cell_state.result_stream_writer.stream_file_path,
+            eliminated_after_rung=cell_state.eliminated_after_rung,
+            rendered_tool_character_count=cell_state.rendered_tool_character_count,
+            warmup_report=cell_state.evaluation_runner.warmup_report,
+        )
+
+
+def _interleave_cases_by_tag(evaluation_cases: list[EvaluationCase]) -> list[EvaluationCase]:
+    # Fixtures are grouped by category; round-robin them so early rungs sample every category.
+    cases_by_tag: dict[str, list[EvaluationCase]] = {}
+    for evaluation_case in evaluation_cases:
+        primary_tag = evaluation_case.tags[0] if evaluation_case.tags else evaluation_case.expected_tool_name
+        cases_by_tag.setdefault(primary_tag, []).append(evaluation_case)
+
+    interleaved_cases: list[EvaluationCase] = []
+    for case_index in range(max((len(tag_cases) for tag_cases in cases_by_tag.values()), default=0)):
+        for tag_cases in cases_by_tag.values():
+            if case_index < len(tag_cases):
+                interleaved_cases.append(tag_cases[case_index])
+    return interleaved_cases
+
+
+def _read_cell_summary(cell_state: _MatrixCellState) -> EvaluationSummary:
+    evaluation_case_results: list[EvaluationCaseResult] = read_evaluation_case_results(
+        cell_state.result_stream_writer.stream_file_path
+    )
+    return summarize_evaluation_results(evaluation_case_results)
+
+
+def _cell_report_ranking_key(cell_report: EvaluationMatrixCellReport) -> tuple[float, float, int]:
+    # Cells that survived longer rank first; within a rung, higher strict success wins,
+    # and among equally accurate cells the cheaper tool rendering wins.
+    survived_rung_count = math.inf if cell_report.eliminated_after_rung is None else cell_report.eliminated_after_rung
+    return (
+        -survived_rung_count,
+        -cell_report.summary.strict_success_rate,
+        cell_report.rendered_tool_character_count,
+    )
+
+
+def _build_comparative_report(
+    cell_reports: list[EvaluationMatrixCellReport],
+    rung_records: list[dict[str, object]],
+) -> dict[str, object]:
+    best_success_rate = cell_reports[0].summary.strict_success_rate
+    return {
+        "best_cell_identifier": cell_reports[0].cell.cell_identifier,
+        "rungs": rung_records,
+        "cells": [
+            {
+                "rank": rank_index + 1,
+                "cell_identifier": cell_report.cell.cell_identifier,
+                **asdict(cell_report.cell),
+                "summary": asdict(cell_report.summary),
+                "strict_success_rate_delta_from_best": cell_report.summary.strict_success_rate - best_success_rate,
+                "eliminated_after_rung": cell_report.eliminated_after_rung,
+                "rendered_tool_character_count": cell_report.rendered_tool_character_count,
+                "warmup": asdict(cell_report.warmup_report) if cell_report.warmup_report is not None else None,
+                "result_stream_file_path": cell_report.result_stream_file_path,
+            }
+            for rank_index, cell_report in enumerate(cell_reports)
+        ],
+    }
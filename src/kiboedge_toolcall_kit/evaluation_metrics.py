@@ -1,5 +1,6 @@
-"""Responsibility: aggregate strict-success metrics and reason-level failure statistics."""
+"""Responsibility: aggregate strict-success metrics, reason-level failure statistics and token usage."""
 
+from .lmstudio_client import count_total_tokens, merge_token_usage
 from .models import EvaluationCaseResult, EvaluationSummary
 
 
@@ -17,9 +18,60 @@ def summarize_evaluation_results(evaluation_case_results: list[EvaluationCaseRes
         failure_reason = evaluation_case_result.failure_reason or "unknown_failure"
         failure_counts_by_reason[failure_reason] = failure_counts_by_reason.get(failure_reason, 0) + 1
 
+    mean_total_tokens_by_tool, mean_total_tokens_by_tag = _compute_mean_total_tokens_by_tool_and_tag(
+        evaluation_case_results
+    )
     return EvaluationSummary(
         total_cases=total_cases,
         successful_cases=successful_cases,
         strict_success_rate=strict_success_rate,
         failure_counts_by_reason=failure_counts_by_reason,
+        schema_repair_recovery_rate_by_reason=_compute_schema_repair_recovery_rates(evaluation_case_results),
+        total_token_usage=_sum_token_usage(evaluation_case_results),
+        mean_total_tokens_by_tool=mean_total_tokens_by_tool,
+        mean_total_tokens_by_tag=mean_total_tokens_by_tag,
+    )
+
+
+def _compute_schema_repair_recovery_rates(evaluation_case_results: list[EvaluationCaseResult]) -> dict[str, float]:
+    # Rate per repair request: recovered repairs / repairs attempted for that violation reason.
+    attempt_counts_by_reason: dict[str, int] = {}
+    recovered_counts_by_reason: dict[str, int] = {}
+    for evaluation_case_result in evaluation_case_results:
+        for schema_repair_attempt in evaluation_case_result.schema_repair_attempts:
+            failure_reason = schema_repair_attempt["failure_reason"]
+            attempt_counts_by_reason[failure_reason] = attempt_counts_by_reason.get(failure_reason, 0) + 1
+            if schema_repair_attempt["is_recovered"]:
+                recovered_counts_by_reason[failure_reason] = recovered_counts_by_reason.get(failure_reason, 0) + 1
+
+    return {
+        failure_reason: recovered_counts_by_reason.get(failure_reason, 0) / attempt_count
+        for failure_reason, attempt_count in attempt_counts_by_reason.items()
+    }
+
+
+def _sum_token_usage(evaluation_case_results: list[EvaluationCaseResult]) -> dict[str, int]:
+    total_token_usage: dict[str, int] = {}
+    for evaluation_case_result in evaluation_case_results:
+        merge_token_usage(total_token_usage, evaluation_case_result.token_usage)
+    return total_token_usage
+
+
+def _compute_mean_total_tokens_by_tool_and_tag(
+    evaluation_case_results: list[EvaluationCaseResult],
+) -> tuple[dict[str, float], dict[str, float]]:
+    # Guard: cases without usage (request errors, servers that omit usage) would drag means to zero.
+    token_totals_by_tool: dict[str, list[int]] = {}
+    token_totals_by_tag: dict[str, list[int]] = {}
+    for evaluation_case_result in evaluation_case_results:
+        if not evaluation_case_result.token_usage:
+            continue
+        total_token_count = count_total_tokens(evaluation_case_result.token_usage)
+        token_totals_by_tool.setdefault(evaluation_case_result.expected_tool_name, []).append(total_token_count)
+        for tag in evaluation_case_result.tags:
+            token_totals_by_tag.setdefault(tag, []).append(total_token_count)
+
+    return (
+        {tool_name: sum(token_totals) / len(token_totals) for tool_name, token_totals in token_totals_by_tool.items()},
+        {tag: sum(token_totals) / len(token_totals) for tag, token_totals in token_totals_by_tag.items()},
     )
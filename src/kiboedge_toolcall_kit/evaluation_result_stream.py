@@ -0,0 +1,66 @@
+"""Responsibility: persist evaluation case results incrementally so interrupted runs can resume."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, TextIO
+
+from .io_utils import append_json_line, discard_partial_trailing_line, read_json_lines
+from .models import EvaluationCaseResult
+
+EVALUATION_CASE_RESULT_FIELD_NAMES = frozenset(field_definition.name for field_definition in fields(EvaluationCaseResult))
+
+
+class EvaluationResultStreamWriter:
+    """Append-only JSONL writer that stores each case result as soon as it completes."""
+
+    def __init__(self, stream_file_path: str, fsync_enabled: bool = False) -> None:
+        self._stream_file_path = stream_file_path
+        self._fsync_enabled = fsync_enabled
+        self._output_file: TextIO | None = None
+
+    @property
+    def stream_file_path(self) -> str:
+        return self._stream_file_path
+
+    def __enter__(self) -> EvaluationResultStreamWriter:
+        Path(self._stream_file_path).parent.mkdir(parents=True, exist_ok=True)
+        discard_partial_trailing_line(self._stream_file_path)
+        self._output_file = Path(self._stream_file_path).open(mode="a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        if self._output_file is None:
+            return
+        self._output_file.close()
+        self._output_file = None
+
+    def append_result(self, evaluation_case_result: EvaluationCaseResult) -> None:
+        """Write one case result line and flush it immediately."""
+        # Guard: writer must be opened through the context manager.
+        if self._output_file is None:
+            raise RuntimeError("EvaluationResultStreamWriter is not open.")
+        append_json_line(self._output_file, asdict(evaluation_case_result), self._fsync_enabled)
+
+
+def evaluation_case_result_from_dict(payload: dict[str, Any]) -> EvaluationCaseResult:
+    """Rebuild a case result from its JSON form, ignoring keys this version does not know."""
+    known_field_values = {key: value for key, value in payload.items() if key in EVALUATION_CASE_RESULT_FIELD_NAMES}
+    return EvaluationCaseResult(**known_field_values)
+
+
+def read_evaluation_case_results(stream_file_path: str) -> list[EvaluationCaseResult]:
+    """Read streamed results in completion order, keeping the latest line per case identifier."""
+    # Guard: a fresh run has no stream file yet.
+    if not Path(stream_file_path).exists():
+        return []
+
+    result_by_case_identifier: dict[str, EvaluationCaseResult] = {}
+    for payload in read_json_lines(stream_file_path):
+        if "case_identifier" not in payload:
+            continue
+        evaluation_case_result = evaluation_case_result_from_dict(payload)
+        result_by_case_identifier.pop(evaluation_case_result.case_identifier, None)
+        result_by_case_identifier[evaluation_case_result.case_identifier] = evaluation_case_result
+    return list(result_by_case_identifier.values())
@@ -3,15 +3,25 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from itertools import chain
+from pathlib import Path
 import time
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
+from .adaptive_concurrency import AdaptiveConcurrencyController, build_adaptive_concurrency_controller
 from .config import RuntimeConfiguration
+from .engine_warmup import WarmupReport, prepare_engine_for_requests
+from .evaluation_dataset import CaseShard, build_evaluation_case, iter_evaluation_cases
 from .evaluation_metrics import summarize_evaluation_results
+from .evaluation_result_stream import EvaluationResultStreamWriter, read_evaluation_case_results
 from .io_utils import build_timestamp_suffix, read_json_file, write_json_file
-from .models import EvaluationCase, EvaluationCaseResult, EvaluationSummary
+from .models import EngineRoundResult, EvaluationCase, EvaluationCaseResult, EvaluationSummary
 from .tool_orchestrator import ToolCallEngine
 from .tool_validation import validate_case_expected_result
 
+if TYPE_CHECKING:
+    from .evaluation_work_queue import EvaluationWorkQueue
+
 
 class EvaluationRunner:
     """Runs fixed evaluation case set and computes strict success rate."""
@@ -20,25 +30,116 @@ class EvaluationRunner:
         self,
         runtime_configuration: RuntimeConfiguration,
         tool_call_engine: ToolCallEngine,
+        adaptive_concurrency_controller: AdaptiveConcurrencyController | None = None,
     ) -> None:
         self._runtime_configuration = runtime_configuration
         self._tool_call_engine = tool_call_engine
+        self._adaptive_concurrency_controller = (
+            adaptive_concurrency_controller or build_adaptive_concurrency_controller(runtime_configuration)
+        )
+        self._warmup_report: WarmupReport | None = None
+
+    @property
+    def warmup_report(self) -> WarmupReport | None:
+        return self._warmup_report
+
+    def warm_up(self) -> WarmupReport:
+        """Wait for the model and prime the prompt cache so the first case is not timed against a cold load."""
+        self._warmup_report = prepare_engine_for_requests(self._tool_call_engine)
+        return self._warmup_report
 
     def run_evaluation(
         self,
         case_file_path: str | None = None,
         max_cases: int | None = None,
+        resume_stream_file_path: str | None = None,
+        case_shard: CaseShard | None = None,
+        sample_rate: float = 1.0,
     ) -> tuple[EvaluationSummary, list[EvaluationCaseResult], str]:
+        """Run cases, streaming each result to JSONL, and write the summary JSON from the stream.
+
+        When ``resume_stream_file_path`` points at an earlier stream, cases already recorded
+        there are skipped (except request errors, which are run again) and new results are
+        appended to the same file. Cases are read lazily, so ``case_shard`` / ``sample_rate``
+        slices of a 100k-case JSONL stay cheap.
+        """
         case_path = case_file_path or self._runtime_configuration.evaluation_case_file_path
-        evaluation_cases = self._load_cases(case_path)
-        if max_cases is not None:
-            evaluation_cases = evaluation_cases[:max_cases]
+        evaluation_cases = self.iter_cases(case_path, case_shard, sample_rate, max_cases)
+
+        stream_file_path = resume_stream_file_path or self._build_stream_file_path()
+        # Guard: request errors say nothing about the model, so resuming runs those cases again;
+        # the newer line replaces the old one when the stream is read back.
+        completed_case_identifiers = {
+            evaluation_case_result.case_identifier
+            for evaluation_case_result in read_evaluation_case_results(stream_file_path)
+            if evaluation_case_result.failure_reason != "request_error"
+        }
+        pending_evaluation_cases: Iterator[EvaluationCase] = (
+            evaluation_case
+            for evaluation_case in evaluation_cases
+            if evaluation_case.case_identifier not in completed_case_identifiers
+        )
+        first_pending_evaluation_case = next(pending_evaluation_cases, None)
+        if first_pending_evaluation_case is not None:
+            if self._runtime_configuration.warmup_before_evaluation:
+                self.warm_up()
+            pending_evaluation_cases = chain((first_pending_evaluation_case,), pending_evaluation_cases)
+
+        with EvaluationResultStreamWriter(
+            stream_file_path=stream_file_path,
+            fsync_enabled=self._runtime_configuration.fsync_evaluation_results,
+        ) as result_stream_writer:
+            self._run_cases_with_early_stop(pending_evaluation_cases, result_stream_writer.append_result)
+
+        evaluation_case_results = read_evaluation_case_results(stream_file_path)
+        evaluation_summary = summarize_evaluation_results(evaluation_case_results)
+        result_file_path = self._write_result_file(evaluation_summary, evaluation_case_results, stream_file_path)
+        return evaluation_summary, evaluation_case_results, result_file_path
+
+    def run_queue_worker(
+        self,
+        work_queue: EvaluationWorkQueue,
+        worker_identifier: str,
+    ) -> int:
+        """Claim cases from ``work_queue`` until it drains (or requests keep failing); return cases run.
+
+        Each worker process builds its own runner, so it uses its own backend and pacing.
+        """
+        completed_case_count = 0
+
+        def store_case_result(evaluation_case_result: EvaluationCaseResult) -> None:
+            nonlocal completed_case_count
+            work_queue.complete_case(evaluation_case_result, worker_identifier)
+            completed_case_count += 1
+
+        if not work_queue.has_unfinished_cases():
+            return 0
+        # Guard: warm up before the first claim, so a slow model load cannot outlive the case lease.
+        if self._runtime_configuration.warmup_before_evaluation:
+            self.warm_up()
+        self._run_cases_with_early_stop(
+            work_queue.iter_claimed_cases(
+                worker_identifier,
+                poll_interval_seconds=self._runtime_configuration.work_queue_poll_interval_seconds,
+            ),
+            store_case_result,
+        )
+        return completed_case_count
 
-        evaluation_case_results: list[EvaluationCaseResult] = []
+    def _run_cases_with_early_stop(
+        self,
+        evaluation_cases: Iterable[EvaluationCase],
+        store_case_result: Callable[[EvaluationCaseResult], None],
+    ) -> None:
         consecutive_request_error_count = 0
         for evaluation_case in evaluation_cases:
-            evaluation_case_result = self._run_single_case(evaluation_case)
-            evaluation_case_results.append(evaluation_case_result)
+            with self._adaptive_concurrency_controller.request_slot():
+                evaluation_case_result = self.run_single_case(evaluation_case)
+            store_case_result(evaluation_case_result)
+            self._adaptive_concurrency_controller.record_request_outcome(
+                latency_seconds=evaluation_case_result.latency_seconds,
+                is_request_error=evaluation_case_result.failure_reason == "request_error",
+            )
 
             if evaluation_case_result.failure_reason == "request_error":
                 consecutive_request_error_count += 1
@@ -52,28 +153,36 @@ class EvaluationRunner:
             ):
                 break
 
-            time.sleep(self._runtime_configuration.delay_between_evaluation_cases_seconds)
+            # Measured backoff replaces the fixed cooldown: it shrinks while the host keeps up.
+            self._adaptive_concurrency_controller.wait_before_next_request()
 
-        evaluation_summary = summarize_evaluation_results(evaluation_case_results)
-        result_file_path = self._write_result_file(evaluation_summary, evaluation_case_results)
-        return evaluation_summary, evaluation_case_results, result_file_path
+    def _build_stream_file_path(self) -> str:
+        timestamp_suffix = build_timestamp_suffix()
+        return f"{self._runtime_configuration.evaluation_result_directory_path}/evaluation_{timestamp_suffix}.jsonl"
 
-    def _load_cases(self, case_file_path: str) -> list[EvaluationCase]:
-        raw_case_objects = read_json_file(case_file_path)
-        return [
-            EvaluationCase(
-                case_identifier=raw_case_object["case_identifier"],
-                user_prompt=raw_case_object["user_prompt"],
-                expected_tool_name=raw_case_object["expected_tool_name"],
-                required_argument_keys=raw_case_object["required_argument_keys"],
-                optional_argument_keys=raw_case_object.get("optional_argument_keys", []),
-                should_call_tool=raw_case_object.get("should_call_tool", True),
-                tags=raw_case_object.get("tags", []),
-            )
-            for raw_case_object in raw_case_objects
-        ]
+    def load_cases(self, case_file_path: str) -> list[EvaluationCase]:
+        """Load evaluation cases from a JSON fixture file."""
+        return [build_evaluation_case(raw_case_object) for raw_case_object in read_json_file(case_file_path)]
+
+    def iter_cases(
+        self,
+        case_file_path: str,
+        case_shard: CaseShard | None = None,
+        sample_rate: float = 1.0,
+        max_cases: int | None = None,
+    ) -> Iterator[EvaluationCase]:
+        """Stream cases from a JSON or JSONL file, keeping only this shard's sample."""
+        return iter_evaluation_cases(
+            case_file_path,
+            case_shard=case_shard,
+            sample_rate=sample_rate,
+            sample_seed=self._runtime_configuration.evaluation_sample_seed,
+            max_cases=max_cases,
+        )
 
-    def _run_single_case(self, evaluation_case: EvaluationCase) -> EvaluationCaseResult:
+    def run_single_case(self, evaluation_case: EvaluationCase) -> EvaluationCaseResult:
+        """Run one case through the engine and judge it against the strict-success criteria."""
+        start_time = time.perf_counter()
         try:
             engine_result = self._tool_call_engine.run_tool_call_round(evaluation_case.user_prompt)
         except Exception:
@@ -84,69 +193,61 @@ class EvaluationRunner:
                 source="exception",
                 expected_tool_name=evaluation_case.expected_tool_name,
                 actual_tool_name=None,
+                tags=list(evaluation_case.tags),
+                latency_seconds=time.perf_counter() - start_time,
             )
 
-        if not engine_result["is_success"]:
-            return EvaluationCaseResult(
-                case_identifier=evaluation_case.case_identifier,
-                is_success=False,
-                failure_reason=engine_result["failure_reason"],
-                source=engine_result["source"],
-                expected_tool_name=evaluation_case.expected_tool_name,
-                actual_tool_name=engine_result["tool_name"],
-            )
+        failure_reason = self._judge_engine_result(evaluation_case, engine_result)
+        return EvaluationCaseResult(
+            case_identifier=evaluation_case.case_identifier,
+            is_success=failure_reason is None,
+            failure_reason=failure_reason,
+            source=engine_result.source,
+            expected_tool_name=evaluation_case.expected_tool_name,
+            actual_tool_name=engine_result.tool_name,
+            tags=list(evaluation_case.tags),
+            latency_seconds=time.perf_counter() - start_time,
+            schema_repair_attempts=engine_result.schema_repair_attempts,
+            token_usage=engine_result.token_usage,
+            token_usage_by_stage=engine_result.token_usage_by_stage,
+        )
+
+    def _judge_engine_result(
+        self,
+        evaluation_case: EvaluationCase,
+        engine_result: EngineRoundResult,
+    ) -> str | None:
+        """Return the strict-success failure reason, or None when the case passed."""
+        if not engine_result.is_success:
+            return engine_result.failure_reason
 
         expected_validation_result = validate_case_expected_result(
             expected_tool_name=evaluation_case.expected_tool_name,
-            parsed_tool_name=engine_result["tool_name"],
+            parsed_tool_name=engine_result.tool_name,
         )
         if not expected_validation_result.is_success:
-            return EvaluationCaseResult(
-                case_identifier=evaluation_case.case_identifier,
-                is_success=False,
-                failure_reason=expected_validation_result.failure_reason,
-                source=engine_result["source"],
-                expected_tool_name=evaluation_case.expected_tool_name,
-                actual_tool_name=engine_result["tool_name"],
-            )
+            return expected_validation_result.failure_reason
 
-        missing_required_arguments = [
-            required_argument_key
+        if any(
+            required_argument_key not in engine_result.arguments
             for required_argument_key in evaluation_case.required_argument_keys
-            if required_argument_key not in engine_result["arguments"]
-        ]
-        if missing_required_arguments:
-            return EvaluationCaseResult(
-                case_identifier=evaluation_case.case_identifier,
-                is_success=False,
-                failure_reason="missing_required",
-                source=engine_result["source"],
-                expected_tool_name=evaluation_case.expected_tool_name,
-                actual_tool_name=engine_result["tool_name"],
-            )
-
-        return EvaluationCaseResult(
-            case_identifier=evaluation_case.case_identifier,
-            is_success=True,
-            failure_reason=None,
-            source=engine_result["source"],
-            expected_tool_name=evaluation_case.expected_tool_name,
-            actual_tool_name=engine_result["tool_name"],
-        )
+        ):
+            return "missing_required"
+        return None
 
     def _write_result_file(
         self,
         evaluation_summary: EvaluationSummary,
         evaluation_case_results: list[EvaluationCaseResult],
+        stream_file_path: str,
     ) -> str:
-        timestamp_suffix = build_timestamp_suffix()
-        result_file_path = (
-            f"{self._runtime_configuration.evaluation_result_directory_path}/evaluation_{timestamp_suffix}.json"
-        )
+        result_file_path = str(Path(stream_file_path).with_suffix(".json"))
         write_json_file(
             result_file_path,
             {
                 "summary": asdict(evaluation_summary),
+                "warmup": asdict(self._warmup_report) if self._warmup_report is not None else None,
+                "result_stream_file_path": stream_file_path,
                 "results": [asdict(evaluation_case_result) for evaluation_case_result in evaluation_case_results],
             },
         )
@@ -0,0 +1,278 @@
+"""Responsibility: share evaluation cases between worker processes through a leased SQLite work queue."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Callable, Iterable, Iterator
+
+from .config import RuntimeConfiguration
+from .evaluation_dataset import build_evaluation_case
+from .evaluation_metrics import summarize_evaluation_results
+from .evaluation_result_stream import evaluation_case_result_from_dict
+from .io_utils import write_json_file
+from .models import EvaluationCase, EvaluationCaseResult, EvaluationSummary
+
+PENDING_CASE_STATE = "pending"
+LEASED_CASE_STATE = "leased"
+DONE_CASE_STATE = "done"
+WORKER_LOST_FAILURE_REASON = "worker_lost"
+REQUEST_ERROR_FAILURE_REASON = "request_error"
+ENQUEUE_BATCH_SIZE = 1000
+WORK_QUEUE_JOURNAL_MODES = ("wal", "delete", "truncate", "persist")
+
+_CREATE_TABLE_STATEMENT = """
+CREATE TABLE IF NOT EXISTS evaluation_work_items (
+    case_identifier TEXT PRIMARY KEY,
+    case_json TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    attempt_count INTEGER NOT NULL DEFAULT 0,
+    result_json TEXT
+)
+"""
+_CREATE_STATE_INDEX_STATEMENT = (
+    "CREATE INDEX IF NOT EXISTS evaluation_work_items_state ON evaluation_work_items (state, lease_expires_at)"
+)
+
+
+class EvaluationWorkQueue:
+    """Case queue in one SQLite file; each worker process opens its own instance.
+
+    A worker claims a case by taking a lease. If the worker dies, the lease expires and the
+    case is handed to another worker; after ``max_lease_attempts`` lost leases the case is
+    recorded as ``worker_lost`` instead of crashing workers forever. A ``request_error`` says
+    nothing about the model, so such a case goes back to pending while it has lease attempts
+    left. WAL lets readers and
+    the single writer overlap on one host; use ``journal_mode="delete"`` on network shares,
+    where WAL's shared memory does not work.
+    """
+
+    def __init__(
+        self,
+        database_file_path: str,
+        lease_seconds: float = 300.0,
+        max_lease_attempts: int = 3,
+        journal_mode: str = "wal",
+        time_function: Callable[[], float] = time.time,
+    ) -> None:
+        # Guard: the journal mode is interpolated into a PRAGMA, so only known modes are accepted.
+        if journal_mode.lower() not in WORK_QUEUE_JOURNAL_MODES:
+            raise ValueError(f"Unknown work queue journal mode: {journal_mode}")
+        Path(database_file_path).parent.mkdir(parents=True, exist_ok=True)
+        self._database_file_path = database_file_path
+        self._lease_seconds = lease_seconds
+        self._max_lease_attempts = max(1, max_lease_attempts)
+        self._time_function = time_function
+        # isolation_level=None: transactions are explicit so claims can use BEGIN IMMEDIATE.
+        self._connection = sqlite3.connect(database_file_path, timeout=30.0, isolation_level=None)
+        self._connection.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_CREATE_TABLE_STATEMENT)
+        self._connection.execute(_CREATE_STATE_INDEX_STATEMENT)
+
+    @property
+    def database_file_path(self) -> str:
+        return self._database_file_path
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> EvaluationWorkQueue:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def enqueue_cases(self, evaluation_cases: Iterable[EvaluationCase]) -> int:
+        """Add cases in batches; cases already queued (by identifier) are left untouched."""
+        enqueued_case_count = 0
+        case_rows: list[tuple[str, str]] = []
+        for evaluation_case in evaluation_cases:
+            case_rows.append((evaluation_case.case_identifier, json.dumps(asdict(evaluation_case), ensure_ascii=True)))
+            if len(case_rows) >= ENQUEUE_BATCH_SIZE:
+                enqueued_case_count += self._insert_case_rows(case_rows)
+                case_rows = []
+        if case_rows:
+            enqueued_case_count += self._insert_case_rows(case_rows)
+        return enqueued_case_count
+
+    def claim_next_case(self, worker_identifier: str) -> EvaluationCase | None:
+        """Lease the next pending (or expired) case to ``worker_identifier``; None when nothing is claimable."""
+        current_time = self._time_function()
+        with self._immediate_transaction():
+            while True:
+                work_item_row = self._connection.execute(
+                    "SELECT case_identifier, case_json, attempt_count FROM evaluation_work_items"
+                    " WHERE state = ? OR (state = ? AND lease_expires_at < ?)"
+                    " ORDER BY rowid LIMIT 1",
+                    (PENDING_CASE_STATE, LEASED_CASE_STATE, current_time),
+                ).fetchone()
+                if work_item_row is None:
+                    return None
+
+                case_identifier, case_json, attempt_count = work_item_row
+                evaluation_case = build_evaluation_case(json.loads(case_json))
+                # Guard: a case that keeps killing workers is recorded as lost instead of retried forever.
+                if attempt_count >= self._max_lease_attempts:
+                    self._store_result(self._build_worker_lost_result(evaluation_case))
+                    continue
+
+                self._connection.execute(
+                    "UPDATE evaluation_work_items SET state = ?, lease_owner = ?, lease_expires_at = ?,"
+                    " attempt_count = attempt_count + 1 WHERE case_identifier = ?",
+                    (LEASED_CASE_STATE, worker_identifier, current_time + self._lease_seconds, case_identifier),
+                )
+                return evaluation_case
+
+    def complete_case(self, evaluation_case_result: EvaluationCaseResult, worker_identifier: str) -> None:
+        """Store the result of a case leased to ``worker_identifier``.
+
+        A late result from a worker whose expired lease was claimed by another worker is
+        ignored. A request error puts the case back to pending until its lease attempts are used
+        up; only then is the error stored as the result.
+        """
+        with self._immediate_transaction():
+            work_item_row = self._connection.execute(
+                "SELECT attempt_count FROM evaluation_work_items"
+                " WHERE case_identifier = ? AND state = ? AND lease_owner = ?",
+                (evaluation_case_result.case_identifier, LEASED_CASE_STATE, worker_identifier),
+            ).fetchone()
+            # Guard: the lease now belongs to someone else (or the case is already done).
+            if work_item_row is None:
+                return
+
+            (attempt_count,) = work_item_row
+            if (
+                evaluation_case_result.failure_reason == REQUEST_ERROR_FAILURE_REASON
+                and attempt_count < self._max_lease_attempts
+            ):
+                self._connection.execute(
+                    "UPDATE evaluation_work_items SET state = ?, lease_owner = NULL, lease_expires_at = NULL"
+                    " WHERE case_identifier = ?",
+                    (PENDING_CASE_STATE, evaluation_case_result.case_identifier),
+                )
+                return
+            self._store_result(evaluation_case_result)
+
+    def iter_claimed_cases(
+        self,
+        worker_identifier: str,
+        poll_interval_seconds: float = 5.0,
+        sleep_function: Callable[[float], None] = time.sleep,
+    ) -> Iterator[EvaluationCase]:
+        """Claim cases one at a time until every case is done.
+
+        While other workers still hold leases, this polls so that cases from crashed workers
+        are picked up once their leases expire.
+        """
+        while True:
+            evaluation_case = self.claim_next_case(worker_identifier)
+            if evaluation_case is not None:
+                yield evaluation_case
+                continue
+            if self.count_cases_by_state().get(LEASED_CASE_STATE, 0) == 0:
+                return
+            sleep_function(poll_interval_seconds)
+
+    def has_unfinished_cases(self) -> bool:
+        """Return True while any case is pending or leased."""
+        case_counts_by_state = self.count_cases_by_state()
+        return case_counts_by_state.get(PENDING_CASE_STATE, 0) + case_counts_by_state.get(LEASED_CASE_STATE, 0) > 0
+
+    def count_cases_by_state(self) -> dict[str, int]:
+        return dict(
+            self._connection.execute("SELECT state, COUNT(*) FROM evaluation_work_items GROUP BY state").fetchall()
+        )
+
+    def read_case_results(self) -> list[EvaluationCaseResult]:
+        """Return every stored result in enqueue order."""
+        return [
+            evaluation_case_result_from_dict(json.loads(result_json))
+            for (result_json,) in self._connection.execute(
+                "SELECT result_json FROM evaluation_work_items WHERE state = ? ORDER BY rowid",
+                (DONE_CASE_STATE,),
+            )
+        ]
+
+    def _insert_case_rows(self, case_rows: list[tuple[str, str]]) -> int:
+        with self._immediate_transaction():
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO evaluation_work_items (case_identifier, case_json) VALUES (?, ?)",
+                case_rows,
+            )
+        return cursor.rowcount
+
+    def _store_result(self, evaluation_case_result: EvaluationCaseResult) -> None:
+        self._connection.execute(
+            "UPDATE evaluation_work_items SET state = ?, lease_owner = NULL, lease_expires_at = NULL, result_json = ?"
+            " WHERE case_identifier = ? AND state != ?",
+            (
+                DONE_CASE_STATE,
+                json.dumps(asdict(evaluation_case_result), ensure_ascii=True),
+                evaluation_case_result.case_identifier,
+                DONE_CASE_STATE,
+            ),
+        )
+
+    def _immediate_transaction(self) -> _ImmediateTransaction:
+        return _ImmediateTransaction(self._connection)
+
+    @staticmethod
+    def _build_worker_lost_result(evaluation_case: EvaluationCase) -> EvaluationCaseResult:
+        return EvaluationCaseResult(
+            case_identifier=evaluation_case.case_identifier,
+            is_success=False,
+            failure_reason=WORKER_LOST_FAILURE_REASON,
+            source="work_queue",
+            expected_tool_name=evaluation_case.expected_tool_name,
+            actual_tool_name=None,
+            tags=list(evaluation_case.tags),
+        )
+
+
+class _ImmediateTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``; takes the write lock up front so two claims never pick the same row."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self) -> None:
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exception_type: type[BaseException] | None, *_: object) -> None:
+        self._connection.execute("ROLLBACK" if exception_type is not None else "COMMIT")
+
+
+def summarize_work_queue(work_queue: EvaluationWorkQueue) -> tuple[EvaluationSummary, list[EvaluationCaseResult], str]:
+    """Merge every worker's results into one summary JSON written next to the queue file."""
+    evaluation_case_results = work_queue.read_case_results()
+    evaluation_summary = summarize_evaluation_results(evaluation_case_results)
+    result_file_path = str(Path(work_queue.database_file_path).with_suffix(".json"))
+    write_json_file(
+        result_file_path,
+        {
+            "summary": asdict(evaluation_summary),
+            "case_counts_by_state": work_queue.count_cases_by_state(),
+            "work_queue_file_path": work_queue.database_file_path,
+            "results": [asdict(evaluation_case_result) for evaluation_case_result in evaluation_case_results],
+        },
+    )
+    return evaluation_summary, evaluation_case_results, result_file_path
+
+
+def build_evaluation_work_queue(
+    runtime_configuration: RuntimeConfiguration,
+    database_file_path: str,
+) -> EvaluationWorkQueue:
+    """Open the queue with the lease and journal settings from ``RuntimeConfiguration``."""
+    return EvaluationWorkQueue(
+        database_file_path=database_file_path,
+        lease_seconds=runtime_configuration.work_queue_lease_seconds,
+        max_lease_attempts=runtime_configuration.work_queue_max_lease_attempts,
+        journal_mode=runtime_configuration.work_queue_journal_mode,
+    )
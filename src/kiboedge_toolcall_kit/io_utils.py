@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, TextIO
 
 
 def ensure_directory(directory_path: str) -> None:
@@ -26,6 +27,52 @@ def read_json_file(file_path: str) -> Any:
         return json.load(input_file)
 
 
+def append_json_line(output_file: TextIO, payload: dict[str, Any], fsync_enabled: bool = False) -> None:
+    """Append one JSON object as a single line and flush it to the operating system."""
+    output_file.write(json.dumps(payload, ensure_ascii=True) + "\n")
+    output_file.flush()
+    if fsync_enabled:
+        os.fsync(output_file.fileno())
+
+
+def read_json_lines(file_path: str) -> Iterator[dict[str, Any]]:
+    """Yield JSON objects from a JSONL file, skipping blank or truncated lines."""
+    with Path(file_path).open(mode="r", encoding="utf-8") as input_file:
+        for line_text in input_file:
+            stripped_line_text = line_text.strip()
+            if not stripped_line_text:
+                continue
+
+            # Guard: a crash mid-write can leave one partial line behind.
+            try:
+                parsed_value = json.loads(stripped_line_text)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(parsed_value, dict):
+                yield parsed_value
+
+
+def discard_partial_trailing_line(file_path: str) -> None:
+    """Truncate an interrupted final line so later appends start on a clean line."""
+    path = Path(file_path)
+    if not path.exists():
+        return
+
+    with path.open(mode="rb+") as binary_file:
+        file_size = binary_file.seek(0, os.SEEK_END)
+        if file_size == 0:
+            return
+
+        binary_file.seek(file_size - 1)
+        if binary_file.read(1) == b"\n":
+            return
+
+        binary_file.seek(0)
+        content_bytes = binary_file.read()
+        last_newline_index = content_bytes.rfind(b"\n")
+        binary_file.truncate(last_newline_index + 1)
+
+
 def build_timestamp_suffix() -> str:
     """Build an ISO-like filesystem-safe timestamp suffix."""
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
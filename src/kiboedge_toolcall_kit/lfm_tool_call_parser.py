@@ -49,6 +49,22 @@ class LfmToolCallParser:
 
         return []
 
+    def parse_from_constrained_message(self, message: Any) -> list[ParsedToolCall]:
+        """Parse a schema-constrained ``{"name", "arguments"}`` reply, then fall back to the cascade."""
+        content_text = getattr(message, "content", None)
+        if content_text:
+            parsed_payload = self._try_parse_json_object(content_text.strip())
+            if parsed_payload is not None:
+                parsed_tool_call = self._build_parsed_tool_call_from_json_payload(
+                    parsed_payload=parsed_payload,
+                    payload_text=content_text,
+                    source="content_constrained_json",
+                )
+                if parsed_tool_call is not None:
+                    return [parsed_tool_call]
+
+        return self.parse_from_message(message)
+
     def _parse_openai_tool_calls(self, tool_calls: list[Any]) -> list[ParsedToolCall]:
         parsed_tool_calls: list[ParsedToolCall] = []
         for tool_call in tool_calls:
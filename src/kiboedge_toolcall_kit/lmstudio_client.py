@@ -1,35 +1,144 @@
 """Responsibility: call LM Studio OpenAI-compatible Chat Completions endpoint."""
 
-from typing import Any
+from __future__ import annotations
 
-from openai import OpenAI
+import threading
+from typing import TYPE_CHECKING, Any, Protocol
 
 from .config import RuntimeConfiguration
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+REJECTED_REQUEST_STATUS_CODES = (400, 422)
+RESPONSE_FORMAT_ERROR_MARKER_TEXTS = ("response_format", "json_schema", "structured output")
+TOKEN_USAGE_FIELD_NAMES = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+class ChatCompletionClient(Protocol):
+    """Interface shared by LmStudioChatClient and the wrappers layered on top of it."""
+
+    def create_chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+        **completion_options: Any,
+    ) -> Any: ...
+
 
 class LmStudioChatClient:
-    """Small wrapper around OpenAI SDK configured for LM Studio."""
+    """Small wrapper around OpenAI SDK configured for LM Studio.
+
+    The SDK client is built on first request, so constructing engines (and importing this
+    module) stays cheap for short-lived CLI runs that never reach the server.
+    """
 
-    def __init__(self, runtime_configuration: RuntimeConfiguration) -> None:
+    def __init__(
+        self,
+        runtime_configuration: RuntimeConfiguration,
+        openai_client: OpenAI | None = None,
+    ) -> None:
         self._runtime_configuration = runtime_configuration
-        self._openai_client = OpenAI(
-            base_url=runtime_configuration.base_url,
-            api_key=runtime_configuration.api_key,
-            timeout=runtime_configuration.request_timeout_seconds,
-        )
+        # Guard: callers may share one SDK client (and its connection pool) across wrappers.
+        self._openai_client = openai_client
+        self._openai_client_lock = threading.Lock()
+
+    @property
+    def openai_client(self) -> OpenAI:
+        if self._openai_client is None:
+            with self._openai_client_lock:
+                if self._openai_client is None:
+                    self._openai_client = build_openai_client(self._runtime_configuration)
+        return self._openai_client
 
     def create_chat_completion(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]],
         tool_choice: str = "auto",
+        candidate_count: int = 1,
+        response_format: dict[str, Any] | None = None,
+        max_generation_tokens: int | None = None,
+        request_timeout_seconds: float | None = None,
     ) -> Any:
-        """Send one Chat Completions request to LM Studio."""
-        return self._openai_client.chat.completions.create(
+        """Send one Chat Completions request to LM Studio.
+
+        An empty ``tools`` list sends neither ``tools`` nor ``tool_choice``: strict
+        OpenAI-compatible servers reject a ``tool_choice`` without tools with 400, which would
+        look like an unsupported ``response_format`` to constrained decoding.
+        ``candidate_count`` above one asks for ``n`` choices; servers that ignore ``n``
+        simply return a single choice. ``response_format`` requests structured output.
+        ``max_generation_tokens`` and ``request_timeout_seconds`` override the configured
+        values for this request only (used by warm-up priming).
+        """
+        optional_request_arguments: dict[str, Any] = {}
+        if tools:
+            optional_request_arguments["tools"] = tools
+            optional_request_arguments["tool_choice"] = tool_choice
+        if candidate_count > 1:
+            optional_request_arguments["n"] = candidate_count
+        if response_format is not None:
+            optional_request_arguments["response_format"] = response_format
+        if request_timeout_seconds is not None:
+            optional_request_arguments["timeout"] = request_timeout_seconds
+        return self.openai_client.chat.completions.create(
             model=self._runtime_configuration.model_name,
             messages=messages,
-            tools=tools,
-            tool_choice=tool_choice,
             temperature=self._runtime_configuration.response_temperature,
-            max_tokens=self._runtime_configuration.max_generation_tokens,
+            max_tokens=max_generation_tokens or self._runtime_configuration.max_generation_tokens,
+            **optional_request_arguments,
         )
+
+
+def is_request_rejected_by_server(request_error: Exception) -> bool:
+    """Return True when the server refused the request shape (e.g. unsupported response_format)."""
+    return getattr(request_error, "status_code", None) in REJECTED_REQUEST_STATUS_CODES
+
+
+def is_response_format_rejected_by_server(request_error: Exception) -> bool:
+    """Return True when the rejection names structured output, not e.g. an over-long prompt."""
+    if not is_request_rejected_by_server(request_error):
+        return False
+    error_text = f"{request_error} {getattr(request_error, 'body', '')}".lower()
+    return any(marker_text in error_text for marker_text in RESPONSE_FORMAT_ERROR_MARKER_TEXTS)
+
+
+def read_token_usage(response: Any) -> dict[str, int]:
+    """Return the response's ``usage`` counts; servers that omit usage yield an empty dict."""
+    response_usage = getattr(response, "usage", None)
+    if response_usage is None:
+        return {}
+    token_usage: dict[str, int] = {}
+    for usage_field_name in TOKEN_USAGE_FIELD_NAMES:
+        token_count = getattr(response_usage, usage_field_name, None)
+        if isinstance(token_count, int):
+            token_usage[usage_field_name] = token_count
+    return token_usage
+
+
+def merge_token_usage(token_usage: dict[str, int], added_token_usage: dict[str, int]) -> None:
+    """Add ``added_token_usage`` (e.g. from ``read_token_usage``) into ``token_usage`` field by field."""
+    for usage_field_name, token_count in added_token_usage.items():
+        token_usage[usage_field_name] = token_usage.get(usage_field_name, 0) + token_count
+
+
+def count_total_tokens(token_usage: dict[str, int]) -> int:
+    """Total tokens of a usage dict, summing prompt and completion when the server omits the total."""
+    if "total_tokens" in token_usage:
+        return token_usage["total_tokens"]
+    return token_usage.get("prompt_tokens", 0) + token_usage.get("completion_tokens", 0)
+
+
+def build_openai_client(runtime_configuration: RuntimeConfiguration) -> OpenAI:
+    """Create an SDK client for the configured endpoint; reuse it to keep connections warm."""
+    # Deferred import: the SDK (with httpx and pydantic) is the slowest part of package startup.
+    from openai import OpenAI
+
+    # SDK retries are disabled: resilience.ResilientChatClient owns retry and backoff policy.
+    return OpenAI(
+        base_url=runtime_configuration.base_url,
+        api_key=runtime_configuration.api_key,
+        timeout=runtime_configuration.request_timeout_seconds,
+        max_retries=0,
+    )
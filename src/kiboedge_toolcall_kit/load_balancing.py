@@ -0,0 +1,278 @@
+"""Responsibility: spread chat completions over several OpenAI-compatible backends and route around failures."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from .config import RuntimeConfiguration
+from .lmstudio_client import ChatCompletionClient, LmStudioChatClient, build_openai_client, is_request_rejected_by_server
+from .resilience import build_resilient_chat_client
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+LEAST_OUTSTANDING_ROUTING_STRATEGY = "least_outstanding"
+LATENCY_WEIGHTED_ROUTING_STRATEGY = "latency_weighted"
+BACKEND_LATENCY_SMOOTHING_FACTOR = 0.2
+
+
+class NoHealthyBackendError(RuntimeError):
+    """Raised when every backend in the pool is ejected."""
+
+
+@dataclass(frozen=True)
+class BackendEndpointSnapshot:
+    """Point-in-time view of one backend for logs and metrics."""
+
+    base_url: str
+    outstanding_request_count: int
+    smoothed_latency_seconds: float
+    consecutive_failure_count: int
+    is_ejected: bool
+
+
+class _BackendEndpoint:
+    """Mutable routing state of one backend; guarded by the pool lock."""
+
+    def __init__(self, base_url: str, openai_client: OpenAI) -> None:
+        self.base_url = base_url
+        self.openai_client = openai_client
+        self.outstanding_request_count = 0
+        self.smoothed_latency_seconds = 0.0
+        self.consecutive_failure_count = 0
+        self.ejected_until_time = 0.0
+
+
+class BackendEndpointPool:
+    """Health-tracked set of backends shared by every LoadBalancedChatClient in a process.
+
+    A backend is ejected for ``backend_ejection_seconds`` after
+    ``backend_max_consecutive_failures`` failures in a row; when the period ends it is
+    tried again, and one more failure ejects it again. Health checks poll ``/v1/models``.
+    """
+
+    def __init__(self, runtime_configuration: RuntimeConfiguration) -> None:
+        base_urls = resolve_backend_base_urls(runtime_configuration)
+        # Guard: unknown strategies would silently fall back to arbitrary routing.
+        if runtime_configuration.backend_routing_strategy not in (
+            LEAST_OUTSTANDING_ROUTING_STRATEGY,
+            LATENCY_WEIGHTED_ROUTING_STRATEGY,
+        ):
+            raise ValueError(f"Unknown backend routing strategy: {runtime_configuration.backend_routing_strategy}")
+
+        self._runtime_configuration = runtime_configuration
+        self._endpoints = [
+            _BackendEndpoint(
+                base_url=base_url,
+                openai_client=build_openai_client(replace(runtime_configuration, base_url=base_url)),
+            )
+            for base_url in base_urls
+        ]
+        self._lock = threading.Lock()
+        self._tie_breaker_counter = itertools.count()
+        self._health_check_stop_event = threading.Event()
+        self._health_check_thread: threading.Thread | None = None
+
+    @property
+    def endpoint_count(self) -> int:
+        return len(self._endpoints)
+
+    def acquire_endpoint(self) -> tuple[str, OpenAI]:
+        """Pick a backend per the routing strategy and count the request as outstanding on it."""
+        with self._lock:
+            current_time = time.monotonic()
+            eligible_endpoints = [
+                endpoint for endpoint in self._endpoints if endpoint.ejected_until_time <= current_time
+            ]
+            if not eligible_endpoints:
+                raise NoHealthyBackendError(f"No healthy backend available ({len(self._endpoints)} configured).")
+
+            # Rotating tie-breaker keeps idle equal backends from always resolving to the first;
+            # among equal costs, a backend that just failed is picked last so retries move elsewhere.
+            rotation_offset = next(self._tie_breaker_counter)
+            selected_endpoint = min(
+                eligible_endpoints,
+                key=lambda endpoint: (
+                    self._build_routing_cost(endpoint),
+                    endpoint.consecutive_failure_count,
+                    (self._endpoints.index(endpoint) - rotation_offset) % len(self._endpoints),
+                ),
+            )
+            selected_endpoint.outstanding_request_count += 1
+            return selected_endpoint.base_url, selected_endpoint.openai_client
+
+    def release_endpoint(self, base_url: str, latency_seconds: float, failed_on_backend: bool) -> None:
+        """Record the outcome of a request started with ``acquire_endpoint``."""
+        with self._lock:
+            endpoint = self._find_endpoint(base_url)
+            endpoint.outstanding_request_count -= 1
+            if failed_on_backend:
+                self._record_failure(endpoint)
+                return
+
+            endpoint.consecutive_failure_count = 0
+            if endpoint.smoothed_latency_seconds == 0.0:
+                endpoint.smoothed_latency_seconds = latency_seconds
+            else:
+                endpoint.smoothed_latency_seconds += BACKEND_LATENCY_SMOOTHING_FACTOR * (
+                    latency_seconds - endpoint.smoothed_latency_seconds
+                )
+
+    def run_health_checks(self) -> None:
+        """Probe every backend's model list; healthy ones are readmitted, failing ones ejected."""
+        for endpoint in self._endpoints:
+            try:
+                endpoint.openai_client.models.list()
+            except Exception:
+                with self._lock:
+                    self._record_failure(endpoint, eject_immediately=True)
+                continue
+            with self._lock:
+                endpoint.consecutive_failure_count = 0
+                endpoint.ejected_until_time = 0.0
+
+    def start_background_health_checks(self) -> None:
+        """Run ``run_health_checks`` every ``backend_health_check_interval_seconds`` on a daemon thread."""
+        # Guard: one checker per pool is enough.
+        if self._health_check_thread is not None:
+            return
+
+        self._health_check_stop_event.clear()
+        self._health_check_thread = threading.Thread(
+            target=self._run_health_check_loop,
+            name="backend-health-check",
+            daemon=True,
+        )
+        self._health_check_thread.start()
+
+    def stop_background_health_checks(self) -> None:
+        if self._health_check_thread is None:
+            return
+        self._health_check_stop_event.set()
+        self._health_check_thread.join()
+        self._health_check_thread = None
+
+    def build_endpoint_snapshots(self) -> list[BackendEndpointSnapshot]:
+        with self._lock:
+            current_time = time.monotonic()
+            return [
+                BackendEndpointSnapshot(
+                    base_url=endpoint.base_url,
+                    outstanding_request_count=endpoint.outstanding_request_count,
+                    smoothed_latency_seconds=endpoint.smoothed_latency_seconds,
+                    consecutive_failure_count=endpoint.consecutive_failure_count,
+                    is_ejected=endpoint.ejected_until_time > current_time,
+                )
+                for endpoint in self._endpoints
+            ]
+
+    def _run_health_check_loop(self) -> None:
+        while not self._health_check_stop_event.wait(self._runtime_configuration.backend_health_check_interval_seconds):
+            self.run_health_checks()
+
+    def _build_routing_cost(self, endpoint: _BackendEndpoint) -> float:
+        if self._runtime_configuration.backend_routing_strategy == LATENCY_WEIGHTED_ROUTING_STRATEGY:
+            # Expected wait if this request queues behind the ones already outstanding there.
+            return (endpoint.outstanding_request_count + 1) * endpoint.smoothed_latency_seconds
+        return float(endpoint.outstanding_request_count)
+
+    def _record_failure(self, endpoint: _BackendEndpoint, eject_immediately: bool = False) -> None:
+        endpoint.consecutive_failure_count += 1
+        if eject_immediately or (
+            endpoint.consecutive_failure_count >= self._runtime_configuration.backend_max_consecutive_failures
+        ):
+            endpoint.ejected_until_time = time.monotonic() + self._runtime_configuration.backend_ejection_seconds
+
+    def _find_endpoint(self, base_url: str) -> _BackendEndpoint:
+        for endpoint in self._endpoints:
+            if endpoint.base_url == base_url:
+                return endpoint
+        raise KeyError(base_url)
+
+
+def resolve_backend_base_urls(runtime_configuration: RuntimeConfiguration) -> tuple[str, ...]:
+    """Return the configured backend pool, defaulting to the single ``base_url``."""
+    return tuple(dict.fromkeys(runtime_configuration.backend_base_urls or (runtime_configuration.base_url,)))
+
+
+def is_backend_failure(request_error: Exception) -> bool:
+    """Return True for errors that say something about the backend rather than the request."""
+    if is_request_rejected_by_server(request_error):
+        return False
+    status_code = getattr(request_error, "status_code", None)
+    # Connection errors and timeouts carry no status code; 429/5xx mean the box is struggling.
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class LoadBalancedChatClient:
+    """Chat client that sends each completion to one pool backend.
+
+    It makes exactly one attempt; ``build_chat_client`` wraps it in ``ResilientChatClient``,
+    which owns retries. A failed backend counts a failure, and the routing prefers backends
+    without recent failures, so the retry usually lands on another backend.
+    """
+
+    def __init__(self, runtime_configuration: RuntimeConfiguration, endpoint_pool: BackendEndpointPool) -> None:
+        self._runtime_configuration = runtime_configuration
+        self._endpoint_pool = endpoint_pool
+        self._chat_client_by_base_url: dict[str, LmStudioChatClient] = {}
+
+    def create_chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+        **completion_options: Any,
+    ) -> Any:
+        base_url, openai_client = self._endpoint_pool.acquire_endpoint()
+        start_time = time.monotonic()
+        try:
+            response = self._get_chat_client(base_url, openai_client).create_chat_completion(
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                **completion_options,
+            )
+        except Exception as request_error:
+            self._endpoint_pool.release_endpoint(
+                base_url,
+                time.monotonic() - start_time,
+                is_backend_failure(request_error),
+            )
+            raise
+
+        self._endpoint_pool.release_endpoint(base_url, time.monotonic() - start_time, False)
+        return response
+
+    def _get_chat_client(self, base_url: str, openai_client: OpenAI) -> LmStudioChatClient:
+        chat_client = self._chat_client_by_base_url.get(base_url)
+        if chat_client is None:
+            chat_client = LmStudioChatClient(
+                replace(self._runtime_configuration, base_url=base_url),
+                openai_client=openai_client,
+            )
+            self._chat_client_by_base_url[base_url] = chat_client
+        return chat_client
+
+
+def build_chat_client(
+    runtime_configuration: RuntimeConfiguration,
+    endpoint_pool: BackendEndpointPool | None = None,
+) -> ChatCompletionClient:
+    """Return a retrying client for one backend, or for a load-balanced pool when several are configured."""
+    backend_base_urls = resolve_backend_base_urls(runtime_configuration)
+    if endpoint_pool is None and len(backend_base_urls) == 1:
+        return build_resilient_chat_client(
+            runtime_configuration,
+            LmStudioChatClient(replace(runtime_configuration, base_url=backend_base_urls[0])),
+            circuit_name=backend_base_urls[0],
+        )
+    return build_resilient_chat_client(
+        runtime_configuration,
+        LoadBalancedChatClient(runtime_configuration, endpoint_pool or BackendEndpointPool(runtime_configuration)),
+        circuit_name=",".join(backend_base_urls),
+    )
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParsedToolCall:
     """One parsed tool call candidate from a model response."""
 
@@ -37,6 +37,20 @@ class ToolValidationResult:
 
 
 @dataclass(frozen=True)
+class ToolCallViolationReport:
+    """Every schema violation of one tool call, detailed enough to ask the model for a targeted fix."""
+
+    failure_reason: str | None
+    tool_name: str
+    missing_argument_names: list[str] = field(default_factory=list)
+    unknown_argument_names: list[str] = field(default_factory=list)
+    mistyped_argument_names: list[str] = field(default_factory=list)
+    invalid_enum_values: dict[str, tuple[Any, list[Any]]] = field(default_factory=dict)
+    nearest_tool_name: str | None = None
+    is_arguments_object: bool = True
+
+
+@dataclass(frozen=True, slots=True)
 class EvaluationCaseResult:
     """Evaluation result of one case."""
 
@@ -46,6 +60,44 @@ class EvaluationCaseResult:
     source: str
     expected_tool_name: str
     actual_tool_name: str | None
+    tags: list[str] = field(default_factory=list)
+    latency_seconds: float = 0.0
+    schema_repair_attempts: list[dict[str, Any]] = field(default_factory=list)
+    token_usage: dict[str, int] = field(default_factory=dict)
+    token_usage_by_stage: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class EngineRoundResult:
+    """Outcome of one ``ToolCallEngine.run_tool_call_round`` call."""
+
+    is_success: bool
+    failure_reason: str | None
+    source: str = "none"
+    tool_name: str | None = None
+    arguments: dict[str, Any] | None = None
+    assistant_content: str | None = None
+    tool_result: dict[str, Any] | None = None
+    executed_tool_calls: list[ParsedToolCall] = field(default_factory=list)
+    schema_repair_attempts: list[dict[str, Any]] = field(default_factory=list)
+    stage_timings_seconds: dict[str, float] = field(default_factory=dict)
+    token_usage: dict[str, int] = field(default_factory=dict)
+    token_usage_by_stage: dict[str, dict[str, int]] = field(default_factory=dict)
+    # Assistant tool-call and tool messages this round added after the user prompt (not in to_dict).
+    turn_messages: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the historical result-dict shape for callers that still index by key."""
+        return {
+            "is_success": self.is_success,
+            "failure_reason": self.failure_reason,
+            "source": self.source,
+            "tool_name": self.tool_name,
+            "arguments": self.arguments,
+            "assistant_content": self.assistant_content,
+            "tool_result": self.tool_result,
+            "schema_repair_attempts": self.schema_repair_attempts,
+        }
 
 
 @dataclass(frozen=True)
@@ -56,3 +108,7 @@ class EvaluationSummary:
     successful_cases: int
     strict_success_rate: float
     failure_counts_by_reason: dict[str, int]
+    schema_repair_recovery_rate_by_reason: dict[str, float] = field(default_factory=dict)
+    total_token_usage: dict[str, int] = field(default_factory=dict)
+    mean_total_tokens_by_tool: dict[str, float] = field(default_factory=dict)
+    mean_total_tokens_by_tag: dict[str, float] = field(default_factory=dict)
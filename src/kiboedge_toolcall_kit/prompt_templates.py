@@ -1,5 +1,10 @@
 """Responsibility: provide prompt templates that stabilize LFM tool-call formatting."""
 
+import json
+from typing import Callable
+
+from .models import ToolCallViolationReport
+
 
 def build_tool_call_system_prompt() -> str:
     """Return deterministic system prompt optimized for strict JSON tool calls."""
@@ -23,6 +28,37 @@ def build_repair_prompt_for_parse_failure() -> str:
     )
 
 
+def build_repair_prompt_for_schema_violation(violation_report: ToolCallViolationReport) -> str:
+    """Return a targeted retry instruction listing exactly what was wrong with the previous call."""
+    violation_lines: list[str] = []
+    if violation_report.failure_reason == "hallucinated_tool":
+        violation_lines.append(f'- tool "{violation_report.tool_name}" does not exist.')
+        if violation_report.nearest_tool_name is not None:
+            violation_lines.append(f'- did you mean "{violation_report.nearest_tool_name}"?')
+    if not violation_report.is_arguments_object:
+        violation_lines.append("- arguments must be a JSON object.")
+    if violation_report.missing_argument_names:
+        violation_lines.append(f"- missing required arguments: {', '.join(violation_report.missing_argument_names)}")
+    if violation_report.unknown_argument_names:
+        violation_lines.append(f"- remove unknown arguments: {', '.join(violation_report.unknown_argument_names)}")
+    if violation_report.mistyped_argument_names:
+        violation_lines.append(f"- wrong value type for: {', '.join(violation_report.mistyped_argument_names)}")
+    for argument_name, (argument_value, allowed_values) in violation_report.invalid_enum_values.items():
+        allowed_values_text = ", ".join(str(allowed_value) for allowed_value in allowed_values)
+        argument_value_text = json.dumps(argument_value, ensure_ascii=False)
+        violation_lines.append(f"- {argument_name} must be one of: {allowed_values_text} (got {argument_value_text})")
+    return (
+        "Your previous tool call was invalid:\n"
+        + "\n".join(violation_lines)
+        + "\nReturn only the corrected tool call."
+    )
+
+
+def build_conversation_summary_prompt(summary_lines: list[str]) -> str:
+    """Return the context note that stands in for conversation turns evicted from a session."""
+    return "Summary of the earlier conversation (oldest first):\n" + "\n".join(summary_lines)
+
+
 def build_strict_json_only_system_prompt() -> str:
     """Return stronger prompt variant for iteration experiments."""
     return (
@@ -33,3 +69,18 @@ def build_strict_json_only_system_prompt() -> str:
         "Do not include markdown, XML tags, or explanatory text.\n"
         "Use only available tools and include all required arguments.\n"
     )
+
+
+PROMPT_VARIANT_BUILDERS: dict[str, Callable[[], str]] = {
+    "baseline": build_tool_call_system_prompt,
+    "strict_json": build_strict_json_only_system_prompt,
+}
+
+
+def build_system_prompt_for_variant(prompt_variant_name: str) -> str:
+    """Return the system prompt registered under a prompt variant name."""
+    # Guard: unknown variants should fail loudly before any model request is made.
+    if prompt_variant_name not in PROMPT_VARIANT_BUILDERS:
+        known_variant_names = ", ".join(sorted(PROMPT_VARIANT_BUILDERS))
+        raise ValueError(f"Unknown prompt variant: {prompt_variant_name} (known: {known_variant_names})")
+    return PROMPT_VARIANT_BUILDERS[prompt_variant_name]()
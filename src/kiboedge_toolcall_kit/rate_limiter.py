@@ -0,0 +1,31 @@
+"""Responsibility: pace model requests across threads with a shared minimum start interval."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RequestRateLimiter:
+    """Thread-safe limiter that spaces request starts at least a fixed interval apart."""
+
+    def __init__(self, minimum_interval_seconds: float) -> None:
+        self._minimum_interval_seconds = max(0.0, minimum_interval_seconds)
+        self._lock = threading.Lock()
+        self._next_allowed_start_time = 0.0
+
+    def set_minimum_interval_seconds(self, minimum_interval_seconds: float) -> None:
+        """Change the spacing for subsequent reservations (used by adaptive pacing)."""
+        with self._lock:
+            self._minimum_interval_seconds = max(0.0, minimum_interval_seconds)
+
+    def acquire(self) -> None:
+        """Block until the caller may start its request, reserving the slot atomically."""
+        with self._lock:
+            current_time = time.monotonic()
+            start_time = max(current_time, self._next_allowed_start_time)
+            self._next_allowed_start_time = start_time + self._minimum_interval_seconds
+
+        wait_seconds = start_time - current_time
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
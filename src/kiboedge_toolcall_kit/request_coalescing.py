@@ -0,0 +1,52 @@
+"""Responsibility: decide when concurrent identical requests may share one in-flight engine execution."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import unicodedata
+
+from .models import EngineRoundResult
+from .tool_orchestrator import ToolCallEngine
+from .tool_schemas import build_tool_set_fingerprint
+from .tools import READ_ONLY_TOOL_NAMES
+
+WHITESPACE_RUN_PATTERN = re.compile(r"\s+")
+
+
+def normalize_user_prompt(user_prompt: str) -> str:
+    """Fold width/compatibility variants and whitespace so trivially different prompts match."""
+    return WHITESPACE_RUN_PATTERN.sub(" ", unicodedata.normalize("NFKC", user_prompt)).strip()
+
+
+class ToolCallCoalescingPolicy:
+    """Decides which gateway requests may share one in-flight engine execution.
+
+    Requests share when their coalescing key matches; followers receive the leader's result
+    only when the leader executed read-only tools (or none). The asyncio single-flight itself
+    lives in ``serving_gateway.ToolCallGateway``.
+    """
+
+    def __init__(
+        self,
+        tool_call_engine: ToolCallEngine,
+        read_only_tool_names: frozenset[str] = READ_ONLY_TOOL_NAMES,
+    ) -> None:
+        self._read_only_tool_names = read_only_tool_names
+        self._prompt_independent_key_part = json.dumps(
+            [tool_call_engine.system_prompt_text, build_tool_set_fingerprint(tool_call_engine.tool_schemas)],
+            ensure_ascii=True,
+        )
+
+    def build_coalescing_key(self, user_prompt: str) -> str:
+        return hashlib.sha256(
+            f"{self._prompt_independent_key_part}\n{normalize_user_prompt(user_prompt)}".encode("utf-8")
+        ).hexdigest()
+
+    def is_result_shareable(self, engine_result: EngineRoundResult) -> bool:
+        """Return True when handing the same result to another caller has no missed side effects."""
+        return all(
+            executed_tool_call.tool_name in self._read_only_tool_names
+            for executed_tool_call in engine_result.executed_tool_calls
+        )
@@ -0,0 +1,220 @@
+"""Responsibility: order model requests by priority class and shed those that would miss their deadline."""
+
+from __future__ import annotations
+
+from collections import deque
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from .config import RuntimeConfiguration
+from .lmstudio_client import ChatCompletionClient
+
+INTERACTIVE_PRIORITY_CLASS = "interactive"
+BATCH_PRIORITY_CLASS = "batch"
+SERVICE_TIME_SMOOTHING_FACTOR = 0.2
+
+ScheduledResult = TypeVar("ScheduledResult")
+
+
+class RequestDeadlineExceededError(RuntimeError):
+    """Raised when a request is shed because it can no longer finish before its deadline."""
+
+
+class _SchedulingTicket:
+    """One waiting request; granted or shed by the dispatcher."""
+
+    def __init__(self, priority_class: str, deadline_time: float) -> None:
+        self.priority_class = priority_class
+        self.deadline_time = deadline_time
+        self.deadline_window_seconds = max(0.0, deadline_time - time.monotonic())
+        self.is_granted = False
+        self.is_shed = False
+
+
+class PriorityRequestScheduler:
+    """Client-side admission control in front of a single local model server.
+
+    Callers block in ``run`` until a slot is free. Slots go to priority classes by smooth
+    weighted round-robin, so interactive traffic gets most slots while batch work still
+    advances. A request whose deadline cannot fit the observed service time is shed with
+    ``RequestDeadlineExceededError`` instead of queueing inside the server. An idle server
+    always takes the next request, so one slow call cannot shed every later one.
+    """
+
+    def __init__(
+        self,
+        max_in_flight_requests: int = 1,
+        weight_by_priority_class: dict[str, int] | None = None,
+    ) -> None:
+        self._max_in_flight_requests = max(1, max_in_flight_requests)
+        self._weight_by_priority_class = weight_by_priority_class or {
+            INTERACTIVE_PRIORITY_CLASS: 4,
+            BATCH_PRIORITY_CLASS: 1,
+        }
+        self._condition = threading.Condition()
+        self._waiting_tickets_by_priority_class: dict[str, deque[_SchedulingTicket]] = {
+            priority_class: deque() for priority_class in self._weight_by_priority_class
+        }
+        self._current_credit_by_priority_class = {priority_class: 0 for priority_class in self._weight_by_priority_class}
+        self._in_flight_request_count = 0
+        self._estimated_service_time_seconds = 0.0
+        self.shed_request_count = 0
+
+    @property
+    def estimated_service_time_seconds(self) -> float:
+        return self._estimated_service_time_seconds
+
+    @property
+    def in_flight_request_count(self) -> int:
+        return self._in_flight_request_count
+
+    @property
+    def waiting_request_count(self) -> int:
+        with self._condition:
+            return sum(len(waiting_tickets) for waiting_tickets in self._waiting_tickets_by_priority_class.values())
+
+    def set_max_in_flight_requests(self, max_in_flight_requests: int) -> None:
+        """Change the concurrency limit at runtime (used by adaptive controllers)."""
+        with self._condition:
+            self._max_in_flight_requests = max(1, max_in_flight_requests)
+            self._dispatch_waiting_tickets()
+            self._condition.notify_all()
+
+    def run(
+        self,
+        request_callable: Callable[[], ScheduledResult],
+        priority_class: str,
+        deadline_time: float,
+    ) -> ScheduledResult:
+        """Wait for a slot, then run ``request_callable`` in the caller's thread."""
+        # Guard: unknown classes would never be dispatched.
+        if priority_class not in self._weight_by_priority_class:
+            raise ValueError(f"Unknown priority class: {priority_class}")
+
+        scheduling_ticket = _SchedulingTicket(priority_class, deadline_time)
+        with self._condition:
+            self._waiting_tickets_by_priority_class[priority_class].append(scheduling_ticket)
+            self._dispatch_waiting_tickets()
+            self._condition.notify_all()
+            while not scheduling_ticket.is_granted and not scheduling_ticket.is_shed:
+                remaining_seconds = scheduling_ticket.deadline_time - time.monotonic()
+                if remaining_seconds <= 0:
+                    self._waiting_tickets_by_priority_class[priority_class].remove(scheduling_ticket)
+                    self._shed_ticket(scheduling_ticket)
+                    break
+                self._condition.wait(timeout=remaining_seconds)
+
+        if scheduling_ticket.is_shed:
+            raise RequestDeadlineExceededError(
+                f"{priority_class} request shed: deadline cannot be met "
+                f"(estimated service time {self._estimated_service_time_seconds:.2f}s)."
+            )
+
+        start_time = time.monotonic()
+        try:
+            return request_callable()
+        finally:
+            service_time_seconds = time.monotonic() - start_time
+            with self._condition:
+                # Guard: a call that overran its deadline window says no more than "too slow".
+                self._record_service_time(min(service_time_seconds, scheduling_ticket.deadline_window_seconds))
+                self._in_flight_request_count -= 1
+                self._dispatch_waiting_tickets()
+                self._condition.notify_all()
+
+    def _dispatch_waiting_tickets(self) -> None:
+        while self._in_flight_request_count < self._max_in_flight_requests:
+            selected_priority_class = self._select_next_priority_class()
+            if selected_priority_class is None:
+                return
+
+            scheduling_ticket = self._waiting_tickets_by_priority_class[selected_priority_class].popleft()
+            # Guard: do not start work the server cannot finish before the caller gives up. With
+            # nothing in flight the request runs anyway; that also refreshes a stale estimate.
+            if (
+                self._in_flight_request_count > 0
+                and time.monotonic() + self._estimated_service_time_seconds > scheduling_ticket.deadline_time
+            ):
+                self._shed_ticket(scheduling_ticket)
+                continue
+
+            scheduling_ticket.is_granted = True
+            self._in_flight_request_count += 1
+
+    def _select_next_priority_class(self) -> str | None:
+        # Smooth weighted round-robin over classes that have waiting tickets.
+        eligible_priority_classes = [
+            priority_class
+            for priority_class, waiting_tickets in self._waiting_tickets_by_priority_class.items()
+            if waiting_tickets
+        ]
+        if not eligible_priority_classes:
+            return None
+
+        total_weight = 0
+        for priority_class in eligible_priority_classes:
+            priority_weight = self._weight_by_priority_class[priority_class]
+            self._current_credit_by_priority_class[priority_class] += priority_weight
+            total_weight += priority_weight
+        selected_priority_class = max(eligible_priority_classes, key=self._current_credit_by_priority_class.__getitem__)
+        self._current_credit_by_priority_class[selected_priority_class] -= total_weight
+        return selected_priority_class
+
+    def _shed_ticket(self, scheduling_ticket: _SchedulingTicket) -> None:
+        scheduling_ticket.is_shed = True
+        self.shed_request_count += 1
+
+    def _record_service_time(self, service_time_seconds: float) -> None:
+        if self._estimated_service_time_seconds == 0.0:
+            self._estimated_service_time_seconds = service_time_seconds
+            return
+        self._estimated_service_time_seconds += SERVICE_TIME_SMOOTHING_FACTOR * (
+            service_time_seconds - self._estimated_service_time_seconds
+        )
+
+
+def build_request_scheduler(runtime_configuration: RuntimeConfiguration) -> PriorityRequestScheduler:
+    """Create a scheduler from the configured in-flight limit and class weights."""
+    return PriorityRequestScheduler(
+        max_in_flight_requests=runtime_configuration.scheduler_max_in_flight_requests,
+        weight_by_priority_class={
+            INTERACTIVE_PRIORITY_CLASS: runtime_configuration.scheduler_interactive_weight,
+            BATCH_PRIORITY_CLASS: runtime_configuration.scheduler_batch_weight,
+        },
+    )
+
+
+class ScheduledChatClient:
+    """Chat client view that routes every completion through a shared PriorityRequestScheduler."""
+
+    def __init__(
+        self,
+        chat_client: ChatCompletionClient,
+        request_scheduler: PriorityRequestScheduler,
+        priority_class: str,
+        request_timeout_seconds: float,
+    ) -> None:
+        self._chat_client = chat_client
+        self._request_scheduler = request_scheduler
+        self._priority_class = priority_class
+        self._request_timeout_seconds = request_timeout_seconds
+
+    def create_chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+        **completion_options: Any,
+    ) -> Any:
+        # The request timeout bounds queueing plus generation, so it doubles as the deadline.
+        return self._request_scheduler.run(
+            lambda: self._chat_client.create_chat_completion(
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                **completion_options,
+            ),
+            priority_class=self._priority_class,
+            deadline_time=time.monotonic() + self._request_timeout_seconds,
+        )
@@ -0,0 +1,242 @@
+"""Responsibility: retry transient model request failures and stop calling a backend that keeps failing."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from .config import RuntimeConfiguration
+from .lmstudio_client import ChatCompletionClient
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+CLOSED_CIRCUIT_STATE = "closed"
+OPEN_CIRCUIT_STATE = "open"
+HALF_OPEN_CIRCUIT_STATE = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without contacting the backend while its circuit breaker is open."""
+
+    def __init__(self, circuit_name: str, retry_after_seconds: float) -> None:
+        super().__init__(f"Circuit '{circuit_name}' is open; retry in {retry_after_seconds:.1f}s.")
+        self.retry_after_seconds = retry_after_seconds
+
+
+def is_retryable_request_error(request_error: BaseException) -> bool:
+    """Return True for transient failures: dropped connections, timeouts, 429 and 5xx (model loading)."""
+    import openai
+
+    if isinstance(request_error, (openai.APIConnectionError, ConnectionError, TimeoutError)):
+        return True
+    return getattr(request_error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def read_retry_after_seconds(request_error: BaseException) -> float | None:
+    """Return the server's Retry-After hint in seconds when the error response carries one."""
+    error_response = getattr(request_error, "response", None)
+    retry_after_text = getattr(error_response, "headers", {}).get("retry-after") if error_response is not None else None
+    try:
+        return max(0.0, float(retry_after_text)) if retry_after_text is not None else None
+    except ValueError:
+        return None
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker counting consecutive transient failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests fail fast
+    for ``reset_timeout_seconds``. Then one probe request is let through (half-open); its
+    success closes the circuit and its failure reopens it.
+    """
+
+    def __init__(self, circuit_name: str, failure_threshold: int, reset_timeout_seconds: float) -> None:
+        self.circuit_name = circuit_name
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._lock = threading.Lock()
+        self._circuit_state = CLOSED_CIRCUIT_STATE
+        self._consecutive_failure_count = 0
+        self._opened_at_time = 0.0
+        self._is_probe_in_flight = False
+
+    @property
+    def circuit_state(self) -> str:
+        with self._lock:
+            return self._circuit_state
+
+    def before_request(self) -> None:
+        """Admit the request or raise CircuitOpenError."""
+        with self._lock:
+            if self._circuit_state == CLOSED_CIRCUIT_STATE:
+                return
+
+            remaining_open_seconds = self._opened_at_time + self._reset_timeout_seconds - time.monotonic()
+            if self._circuit_state == OPEN_CIRCUIT_STATE and remaining_open_seconds <= 0:
+                self._circuit_state = HALF_OPEN_CIRCUIT_STATE
+            # Guard: half-open admits exactly one probe; everyone else keeps failing fast.
+            if self._circuit_state == HALF_OPEN_CIRCUIT_STATE and not self._is_probe_in_flight:
+                self._is_probe_in_flight = True
+                return
+            raise CircuitOpenError(self.circuit_name, max(0.0, remaining_open_seconds))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._circuit_state = CLOSED_CIRCUIT_STATE
+            self._consecutive_failure_count = 0
+            self._is_probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failure_count += 1
+            if (
+                self._circuit_state == HALF_OPEN_CIRCUIT_STATE
+                or self._consecutive_failure_count >= self._failure_threshold
+            ):
+                self._circuit_state = OPEN_CIRCUIT_STATE
+                self._opened_at_time = time.monotonic()
+            self._is_probe_in_flight = False
+
+    def record_non_transient_outcome(self) -> None:
+        """Release a half-open probe whose request failed for reasons unrelated to backend health."""
+        with self._lock:
+            self._is_probe_in_flight = False
+
+
+_shared_circuit_breaker_lock = threading.Lock()
+_shared_circuit_breakers_by_name: dict[str, CircuitBreaker] = {}
+
+
+def get_shared_circuit_breaker(
+    circuit_name: str,
+    failure_threshold: int,
+    reset_timeout_seconds: float,
+) -> CircuitBreaker:
+    """Return the process-wide breaker for ``circuit_name`` so every engine sees the same backend state."""
+    with _shared_circuit_breaker_lock:
+        circuit_breaker = _shared_circuit_breakers_by_name.get(circuit_name)
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker(circuit_name, failure_threshold, reset_timeout_seconds)
+            _shared_circuit_breakers_by_name[circuit_name] = circuit_breaker
+        return circuit_breaker
+
+
+class ResilientChatClient:
+    """Chat client wrapper adding circuit breaking, jittered exponential retry and optional hedging."""
+
+    def __init__(
+        self,
+        chat_client: ChatCompletionClient,
+        circuit_breaker: CircuitBreaker,
+        max_retry_attempts: int = 2,
+        retry_base_delay_seconds: float = 0.5,
+        retry_max_delay_seconds: float = 8.0,
+        hedge_delay_seconds: float | None = None,
+        random_generator: random.Random | None = None,
+        sleep_function: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._chat_client = chat_client
+        self._circuit_breaker = circuit_breaker
+        self._max_retry_attempts = max(0, max_retry_attempts)
+        self._retry_base_delay_seconds = retry_base_delay_seconds
+        self._retry_max_delay_seconds = retry_max_delay_seconds
+        self._hedge_delay_seconds = hedge_delay_seconds
+        self._random_generator = random_generator or random.Random()
+        self._sleep_function = sleep_function
+        self.retried_request_count = 0
+        self.hedged_request_count = 0
+
+    def create_chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str = "auto",
+        **completion_options: Any,
+    ) -> Any:
+        request_arguments: dict[str, Any] = {
+            "messages": messages,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            **completion_options,
+        }
+        attempt_index = 0
+        while True:
+            self._circuit_breaker.before_request()
+            try:
+                response = self._send_request(request_arguments)
+            except Exception as request_error:
+                if not is_retryable_request_error(request_error):
+                    self._circuit_breaker.record_non_transient_outcome()
+                    raise
+                self._circuit_breaker.record_failure()
+                # Guard: bounded retries; the caller's own deadline/early-stop logic takes over after.
+                if attempt_index >= self._max_retry_attempts:
+                    raise
+                self._sleep_function(self._build_retry_delay_seconds(attempt_index, request_error))
+                attempt_index += 1
+                self.retried_request_count += 1
+                continue
+
+            self._circuit_breaker.record_success()
+            return response
+
+    def _build_retry_delay_seconds(self, attempt_index: int, request_error: BaseException) -> float:
+        # Full jitter keeps several clients from retrying against a recovering server in lockstep.
+        backoff_ceiling_seconds = min(self._retry_max_delay_seconds, self._retry_base_delay_seconds * 2**attempt_index)
+        retry_delay_seconds = self._random_generator.uniform(0.0, backoff_ceiling_seconds)
+        retry_after_seconds = read_retry_after_seconds(request_error)
+        if retry_after_seconds is not None:
+            retry_delay_seconds = max(retry_delay_seconds, min(retry_after_seconds, self._retry_max_delay_seconds))
+        return retry_delay_seconds
+
+    def _send_request(self, request_arguments: dict[str, Any]) -> Any:
+        if self._hedge_delay_seconds is None:
+            return self._chat_client.create_chat_completion(**request_arguments)
+
+        hedge_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hedged-request")
+        try:
+            pending_futures: set[Future[Any]] = {
+                hedge_executor.submit(self._chat_client.create_chat_completion, **request_arguments)
+            }
+            completed_futures, pending_futures = wait(pending_futures, timeout=self._hedge_delay_seconds)
+            if not completed_futures:
+                # The primary is slower than the hedge delay: race a second copy against it.
+                self.hedged_request_count += 1
+                pending_futures.add(hedge_executor.submit(self._chat_client.create_chat_completion, **request_arguments))
+
+            first_request_error: Exception | None = None
+            while True:
+                for completed_future in completed_futures:
+                    try:
+                        return completed_future.result()
+                    except Exception as request_error:
+                        first_request_error = first_request_error or request_error
+                if not pending_futures:
+                    assert first_request_error is not None
+                    raise first_request_error
+                completed_futures, pending_futures = wait(pending_futures, return_when=FIRST_COMPLETED)
+        finally:
+            # Do not wait for the losing copy once one response is in hand.
+            hedge_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_resilient_chat_client(
+    runtime_configuration: RuntimeConfiguration,
+    chat_client: ChatCompletionClient,
+    circuit_name: str,
+) -> ResilientChatClient:
+    """Wrap ``chat_client`` with the configured retry policy and the shared breaker for ``circuit_name``."""
+    return ResilientChatClient(
+        chat_client=chat_client,
+        circuit_breaker=get_shared_circuit_breaker(
+            circuit_name,
+            failure_threshold=runtime_configuration.circuit_breaker_failure_threshold,
+            reset_timeout_seconds=runtime_configuration.circuit_breaker_reset_timeout_seconds,
+        ),
+        max_retry_attempts=runtime_configuration.request_max_retry_attempts,
+        retry_base_delay_seconds=runtime_configuration.request_retry_base_delay_seconds,
+        retry_max_delay_seconds=runtime_configuration.request_retry_max_delay_seconds,
+        hedge_delay_seconds=runtime_configuration.request_hedge_delay_seconds,
+    )
@@ -0,0 +1,209 @@
+"""Responsibility: pick a tool call by majority vote over several sampled completions."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import json
+from typing import Any
+
+from .lfm_tool_call_parser import LfmToolCallParser
+from .lmstudio_client import ChatCompletionClient, merge_token_usage, read_token_usage
+from .models import ParsedToolCall
+from .tool_validation import compile_tool_schemas, validate_tool_call_against_schema
+
+ToolCallVoteKey = tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class SelfConsistencyOutcome:
+    """Winning candidate message of a self-consistency sampling round."""
+
+    message: Any
+    parsed_tool_calls: list[ParsedToolCall]
+    sampled_candidate_count: int
+    agreeing_candidate_count: int
+    reached_quorum: bool
+    token_usage: dict[str, int] = field(default_factory=dict)
+
+
+def build_tool_call_vote_key(parsed_tool_calls: list[ParsedToolCall]) -> ToolCallVoteKey:
+    """Canonicalize tool calls so equivalent argument objects vote together."""
+    return tuple(
+        (
+            parsed_tool_call.tool_name,
+            json.dumps(parsed_tool_call.arguments, ensure_ascii=False, sort_keys=True, separators=(",", ":")),
+        )
+        for parsed_tool_call in parsed_tool_calls
+    )
+
+
+class _CandidateTally:
+    """Running vote tally that remembers the first message seen for each vote key."""
+
+    def __init__(self, is_constrained: bool) -> None:
+        self.is_constrained = is_constrained
+        self.vote_count_by_key: dict[ToolCallVoteKey, int] = {}
+        self.first_candidate_by_key: dict[ToolCallVoteKey, tuple[Any, list[ParsedToolCall]]] = {}
+        self.first_invalid_candidate: tuple[Any, list[ParsedToolCall]] | None = None
+        self.first_message: Any = None
+        self.sampled_candidate_count = 0
+        self.token_usage: dict[str, int] = {}
+
+
+class SelfConsistencySampler:
+    """Requests several candidates and returns as soon as a quorum agrees on one tool call."""
+
+    def __init__(
+        self,
+        chat_client: ChatCompletionClient,
+        parser: LfmToolCallParser,
+        tool_schemas: list[dict[str, Any]],
+        sample_count: int,
+        quorum_count: int | None = None,
+        sequential_execution_only: bool = True,
+    ) -> None:
+        self._chat_client = chat_client
+        self._parser = parser
+        self._compiled_tool_schemas = compile_tool_schemas(tool_schemas)
+        self._sample_count = max(1, sample_count)
+        # Guard: default quorum is a strict majority of the requested samples.
+        self._quorum_count = min(self._sample_count, quorum_count or self._sample_count // 2 + 1)
+        self._sequential_execution_only = sequential_execution_only
+
+    def sample_tool_call_message(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str,
+        response_format: dict[str, Any] | None = None,
+    ) -> SelfConsistencyOutcome:
+        tally = _CandidateTally(is_constrained=response_format is not None)
+        request_arguments: dict[str, Any] = {"messages": messages, "tools": tools, "tool_choice": tool_choice}
+        if response_format is not None:
+            request_arguments["response_format"] = response_format
+
+        response = self._chat_client.create_chat_completion(candidate_count=self._sample_count, **request_arguments)
+        merge_token_usage(tally.token_usage, read_token_usage(response))
+        for choice in response.choices[: self._sample_count]:
+            winning_key = self._record_candidate(tally, choice.message)
+            if winning_key is not None:
+                return self._build_outcome(tally, winning_key, reached_quorum=True)
+
+        # Guard: servers that ignore `n` return one choice; top up with separate requests.
+        remaining_sample_count = self._sample_count - tally.sampled_candidate_count
+        if remaining_sample_count > 0:
+            winning_key = self._sample_remaining_candidates(tally, request_arguments, remaining_sample_count)
+            if winning_key is not None:
+                return self._build_outcome(tally, winning_key, reached_quorum=True)
+
+        return self._build_fallback_outcome(tally)
+
+    def _sample_remaining_candidates(
+        self,
+        tally: _CandidateTally,
+        request_arguments: dict[str, Any],
+        remaining_sample_count: int,
+    ) -> ToolCallVoteKey | None:
+        if self._sequential_execution_only:
+            for _ in range(remaining_sample_count):
+                response = self._chat_client.create_chat_completion(**request_arguments)
+                merge_token_usage(tally.token_usage, read_token_usage(response))
+                winning_key = self._record_candidate(tally, response.choices[0].message)
+                if winning_key is not None:
+                    return winning_key
+            return None
+
+        sample_executor = ThreadPoolExecutor(max_workers=remaining_sample_count, thread_name_prefix="self-consistency")
+        try:
+            pending_futures: set[Future[Any]] = {
+                sample_executor.submit(self._chat_client.create_chat_completion, **request_arguments)
+                for _ in range(remaining_sample_count)
+            }
+            first_request_error: Exception | None = None
+            while pending_futures:
+                completed_futures, pending_futures = wait(pending_futures, return_when=FIRST_COMPLETED)
+                for completed_future in completed_futures:
+                    try:
+                        response = completed_future.result()
+                    except Exception as request_error:
+                        first_request_error = first_request_error or request_error
+                        continue
+                    merge_token_usage(tally.token_usage, read_token_usage(response))
+                    winning_key = self._record_candidate(tally, response.choices[0].message)
+                    if winning_key is not None:
+                        return winning_key
+
+            # Guard: surface request failures only when no candidate came back at all.
+            if tally.sampled_candidate_count == 0 and first_request_error is not None:
+                raise first_request_error
+            return None
+        finally:
+            # Do not wait for slower samples once the vote is decided.
+            sample_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record_candidate(self, tally: _CandidateTally, message: Any) -> ToolCallVoteKey | None:
+        tally.sampled_candidate_count += 1
+        if tally.first_message is None:
+            tally.first_message = message
+
+        if tally.is_constrained:
+            parsed_tool_calls = self._parser.parse_from_constrained_message(message)
+        else:
+            parsed_tool_calls = self._parser.parse_from_message(message)
+        if not parsed_tool_calls:
+            return None
+
+        # Guard: only schema-valid candidates are allowed to vote.
+        if not self._are_tool_calls_valid(parsed_tool_calls):
+            if tally.first_invalid_candidate is None:
+                tally.first_invalid_candidate = (message, parsed_tool_calls)
+            return None
+
+        vote_key = build_tool_call_vote_key(parsed_tool_calls)
+        tally.vote_count_by_key[vote_key] = tally.vote_count_by_key.get(vote_key, 0) + 1
+        tally.first_candidate_by_key.setdefault(vote_key, (message, parsed_tool_calls))
+        if tally.vote_count_by_key[vote_key] >= self._quorum_count:
+            return vote_key
+        return None
+
+    def _are_tool_calls_valid(self, parsed_tool_calls: list[ParsedToolCall]) -> bool:
+        return all(
+            validate_tool_call_against_schema(
+                tool_name=parsed_tool_call.tool_name,
+                arguments=parsed_tool_call.arguments,
+                tool_schemas=self._compiled_tool_schemas,
+            ).is_success
+            for parsed_tool_call in parsed_tool_calls
+        )
+
+    def _build_outcome(
+        self,
+        tally: _CandidateTally,
+        winning_key: ToolCallVoteKey,
+        reached_quorum: bool,
+    ) -> SelfConsistencyOutcome:
+        winning_message, winning_tool_calls = tally.first_candidate_by_key[winning_key]
+        return SelfConsistencyOutcome(
+            message=winning_message,
+            parsed_tool_calls=winning_tool_calls,
+            sampled_candidate_count=tally.sampled_candidate_count,
+            agreeing_candidate_count=tally.vote_count_by_key[winning_key],
+            reached_quorum=reached_quorum,
+            token_usage=tally.token_usage,
+        )
+
+    def _build_fallback_outcome(self, tally: _CandidateTally) -> SelfConsistencyOutcome:
+        # Without a quorum, the plurality wins; dict order breaks ties by first arrival.
+        if tally.vote_count_by_key:
+            plurality_key = max(tally.vote_count_by_key, key=tally.vote_count_by_key.__getitem__)
+            return self._build_outcome(tally, plurality_key, reached_quorum=False)
+
+        # Guard: keep an invalid candidate so the engine can report the precise validation failure.
+        if tally.first_invalid_candidate is not None:
+            invalid_message, invalid_tool_calls = tally.first_invalid_candidate
+            return SelfConsistencyOutcome(
+                invalid_message, invalid_tool_calls, tally.sampled_candidate_count, 0, False, tally.token_usage
+            )
+
+        return SelfConsistencyOutcome(tally.first_message, [], tally.sampled_candidate_count, 0, False, tally.token_usage)
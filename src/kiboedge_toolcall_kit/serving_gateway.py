@@ -0,0 +1,483 @@
+"""Responsibility: serve a shared ToolCallEngine over a local OpenAI-compatible HTTP endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import itertools
+import json
+import math
+import time
+from typing import Any, Mapping
+
+from .config import RuntimeConfiguration
+from .models import EngineRoundResult
+from .request_coalescing import ToolCallCoalescingPolicy
+from .request_scheduler import INTERACTIVE_PRIORITY_CLASS, RequestDeadlineExceededError
+from .resilience import CircuitOpenError
+from .tool_orchestrator import ToolCallEngine
+
+HTTP_HEADER_TERMINATOR = b"\r\n\r\n"
+HTTP_REASON_PHRASE_BY_STATUS_CODE = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    431: "Request Header Fields Too Large",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+JSON_CONTENT_TYPE = "application/json"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+PRIORITY_CLASS_HEADER_NAME = "x-kiboedge-priority"
+QUEUE_FULL_RETRY_AFTER_SECONDS = 1
+
+
+@dataclass(frozen=True)
+class GatewayHttpRequest:
+    """Parsed HTTP/1.1 request line, headers and body."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+@dataclass(frozen=True)
+class GatewayHttpResponse:
+    """HTTP response ready to be serialized onto the connection."""
+
+    status_code: int
+    body: bytes
+    content_type: str = JSON_CONTENT_TYPE
+    extra_headers: tuple[tuple[str, str], ...] = ()
+
+
+class GatewayMetrics:
+    """In-process counters exported in Prometheus text format on /metrics."""
+
+    def __init__(self) -> None:
+        self.response_counts_by_status_code: dict[int, int] = {}
+        self.engine_outcome_counts: dict[str, int] = {}
+        self.rejected_request_count = 0
+        self.coalesced_request_count = 0
+        self.completed_request_count = 0
+        self.completed_request_latency_seconds_sum = 0.0
+
+    def record_response(self, status_code: int) -> None:
+        self.response_counts_by_status_code[status_code] = self.response_counts_by_status_code.get(status_code, 0) + 1
+
+    def record_engine_outcome(self, engine_outcome: str, latency_seconds: float) -> None:
+        self.engine_outcome_counts[engine_outcome] = self.engine_outcome_counts.get(engine_outcome, 0) + 1
+        self.completed_request_count += 1
+        self.completed_request_latency_seconds_sum += latency_seconds
+
+    def render_prometheus_text(self, queue_depth: int, in_flight_count: int) -> str:
+        metric_lines = ["# TYPE kiboedge_gateway_http_responses_total counter"]
+        for status_code, response_count in sorted(self.response_counts_by_status_code.items()):
+            metric_lines.append(f'kiboedge_gateway_http_responses_total{{status="{status_code}"}} {response_count}')
+        metric_lines.append("# TYPE kiboedge_gateway_engine_outcomes_total counter")
+        for engine_outcome, outcome_count in sorted(self.engine_outcome_counts.items()):
+            metric_lines.append(f'kiboedge_gateway_engine_outcomes_total{{outcome="{engine_outcome}"}} {outcome_count}')
+        metric_lines.extend(
+            [
+                "# TYPE kiboedge_gateway_rejected_requests_total counter",
+                f"kiboedge_gateway_rejected_requests_total {self.rejected_request_count}",
+                "# TYPE kiboedge_gateway_coalesced_requests_total counter",
+                f"kiboedge_gateway_coalesced_requests_total {self.coalesced_request_count}",
+                "# TYPE kiboedge_gateway_queue_depth gauge",
+                f"kiboedge_gateway_queue_depth {queue_depth}",
+                "# TYPE kiboedge_gateway_in_flight_requests gauge",
+                f"kiboedge_gateway_in_flight_requests {in_flight_count}",
+                "# TYPE kiboedge_gateway_request_latency_seconds summary",
+                f"kiboedge_gateway_request_latency_seconds_sum {self.completed_request_latency_seconds_sum:.6f}",
+                f"kiboedge_gateway_request_latency_seconds_count {self.completed_request_count}",
+            ]
+        )
+        return "\n".join(metric_lines) + "\n"
+
+
+class ToolCallGateway:
+    """Long-lived asyncio HTTP server that runs chat requests through one shared engine.
+
+    Requests wait in a bounded queue in front of ``gateway_worker_count`` engine workers;
+    when the queue is full the gateway answers 429 instead of piling up work. A request picks
+    its priority class with the ``X-Kiboedge-Priority`` header or a ``"priority"`` body field
+    (default ``interactive``); each class runs on its own engine view of the shared scheduler.
+    """
+
+    def __init__(
+        self,
+        runtime_configuration: RuntimeConfiguration,
+        tool_call_engine: ToolCallEngine,
+        tool_call_engines_by_priority_class: Mapping[str, ToolCallEngine] | None = None,
+    ) -> None:
+        self._runtime_configuration = runtime_configuration
+        self._tool_call_engine = tool_call_engine
+        self._tool_call_engine_by_priority_class = {
+            INTERACTIVE_PRIORITY_CLASS: tool_call_engine,
+            **(tool_call_engines_by_priority_class or {}),
+        }
+        self._metrics = GatewayMetrics()
+        self._completion_identifiers = itertools.count(1)
+        self._request_queue: asyncio.Queue[tuple[str, ToolCallEngine, asyncio.Future[Any]]] | None = None
+        self._engine_executor: ThreadPoolExecutor | None = None
+        self._worker_tasks: list[asyncio.Task[None]] = []
+        self._in_flight_count = 0
+        self._coalescing_policy: ToolCallCoalescingPolicy | None = None
+        if runtime_configuration.gateway_coalesce_identical_requests:
+            self._coalescing_policy = ToolCallCoalescingPolicy(tool_call_engine)
+        self._leader_futures_by_coalescing_key: dict[str, asyncio.Future[Any]] = {}
+
+    @property
+    def metrics(self) -> GatewayMetrics:
+        return self._metrics
+
+    async def start(self) -> asyncio.Server:
+        """Start workers and the listening socket; returns the server for embedding or tests."""
+        worker_count = max(1, self._runtime_configuration.gateway_worker_count)
+        self._request_queue = asyncio.Queue(maxsize=max(1, self._runtime_configuration.gateway_max_queued_requests))
+        self._engine_executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="gateway-engine")
+        self._worker_tasks = [asyncio.create_task(self._run_queue_worker()) for _ in range(worker_count)]
+        return await asyncio.start_server(
+            self._handle_connection,
+            host=self._runtime_configuration.gateway_host,
+            port=self._runtime_configuration.gateway_port,
+        )
+
+    async def serve_forever(self) -> None:
+        server = await self.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        for worker_task in self._worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._engine_executor is not None:
+            self._engine_executor.shutdown(wait=False, cancel_futures=True)
+            self._engine_executor = None
+
+    async def _run_queue_worker(self) -> None:
+        assert self._request_queue is not None
+        event_loop = asyncio.get_running_loop()
+        while True:
+            user_prompt, conversation_history, tool_call_engine, result_future = await self._request_queue.get()
+            self._in_flight_count += 1
+            start_time = time.perf_counter()
+            try:
+                engine_result = await event_loop.run_in_executor(
+                    self._engine_executor,
+                    tool_call_engine.run_tool_call_round,
+                    user_prompt,
+                    conversation_history,
+                )
+            except Exception as engine_error:
+                self._metrics.record_engine_outcome("request_error", time.perf_counter() - start_time)
+                if not result_future.done():
+                    result_future.set_exception(engine_error)
+            else:
+                engine_outcome = "success" if engine_result.is_success else engine_result.failure_reason
+                self._metrics.record_engine_outcome(engine_outcome, time.perf_counter() - start_time)
+                if not result_future.done():
+                    result_future.set_result(engine_result)
+            finally:
+                self._in_flight_count -= 1
+                self._request_queue.task_done()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                http_request, error_response = await self._read_http_request(reader)
+                if http_request is None and error_response is None:
+                    break
+
+                http_response = error_response or await self._dispatch_request(http_request)
+                keep_alive = http_request is not None and http_request.keep_alive and error_response is None
+                self._metrics.record_response(http_response.status_code)
+                writer.write(_serialize_http_response(http_response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_http_request(
+        self,
+        reader: asyncio.StreamReader,
+    ) -> tuple[GatewayHttpRequest | None, GatewayHttpResponse | None]:
+        try:
+            head_bytes = await reader.readuntil(HTTP_HEADER_TERMINATOR)
+        except asyncio.IncompleteReadError:
+            return None, None
+        except asyncio.LimitOverrunError:
+            return None, _build_error_response(431, "Request headers are too large.")
+
+        head_lines = head_bytes.decode("latin-1").split("\r\n")
+        request_line_parts = head_lines[0].split(" ")
+        # Guard: malformed request lines cannot be routed.
+        if len(request_line_parts) != 3:
+            return None, _build_error_response(400, "Malformed request line.")
+
+        headers: dict[str, str] = {}
+        for header_line in head_lines[1:]:
+            if ":" not in header_line:
+                continue
+            header_name, header_value = header_line.split(":", 1)
+            headers[header_name.strip().lower()] = header_value.strip()
+
+        try:
+            content_length = int(headers.get("content-length", "0"))
+        except ValueError:
+            return None, _build_error_response(400, "Invalid Content-Length header.")
+        if content_length > self._runtime_configuration.gateway_max_request_body_bytes:
+            return None, _build_error_response(413, "Request body is too large.")
+
+        body = await reader.readexactly(content_length) if content_length > 0 else b""
+        method, path, _ = request_line_parts
+        return GatewayHttpRequest(method=method.upper(), path=path.split("?", 1)[0], headers=headers, body=body), None
+
+    async def _dispatch_request(self, http_request: GatewayHttpRequest) -> GatewayHttpResponse:
+        if http_request.path == "/v1/chat/completions":
+            if http_request.method != "POST":
+                return _build_error_response(405, "Use POST for chat completions.")
+            return await self._handle_chat_completion(http_request)
+
+        if http_request.method != "GET":
+            return _build_error_response(405, "Method not allowed.")
+        if http_request.path == "/healthz":
+            return _build_json_response(200, {"status": "ok"})
+        if http_request.path == "/metrics":
+            return GatewayHttpResponse(
+                status_code=200,
+                body=self._render_metrics_text().encode("utf-8"),
+                content_type=PROMETHEUS_CONTENT_TYPE,
+            )
+        if http_request.path == "/v1/models":
+            return _build_json_response(
+                200,
+                {"object": "list", "data": [{"id": self._runtime_configuration.model_name, "object": "model"}]},
+            )
+        return _build_error_response(404, f"Unknown path: {http_request.path}")
+
+    async def _handle_chat_completion(self, http_request: GatewayHttpRequest) -> GatewayHttpResponse:
+        try:
+            request_payload = json.loads(http_request.body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return _build_error_response(400, "Request body must be JSON.")
+
+        try:
+            user_prompt, conversation_history = _split_chat_messages(request_payload)
+        except ValueError as message_error:
+            return _build_error_response(400, str(message_error))
+
+        priority_class = http_request.headers.get(PRIORITY_CLASS_HEADER_NAME) or request_payload.get(
+            "priority", INTERACTIVE_PRIORITY_CLASS
+        )
+        # Guard: a non-string body value cannot be a class name (and may not even be hashable).
+        if not isinstance(priority_class, str):
+            return _build_error_response(400, "priority must be a string.")
+        tool_call_engine = self._tool_call_engine_by_priority_class.get(priority_class)
+        # Guard: an unknown class would otherwise silently jump the interactive queue.
+        if tool_call_engine is None:
+            known_priority_classes = ", ".join(sorted(self._tool_call_engine_by_priority_class))
+            return _build_error_response(400, f"Unknown priority class: {priority_class} (known: {known_priority_classes})")
+
+        coalescing_key: str | None = None
+        # Guard: the same prompt after a different history is a different question; never share it.
+        if self._coalescing_policy is not None and not conversation_history:
+            coalescing_key = self._coalescing_policy.build_coalescing_key(user_prompt)
+            leader_future = self._leader_futures_by_coalescing_key.get(coalescing_key)
+            # Guard: an identical prompt is already running; share its result when it is read-only.
+            if leader_future is not None:
+                try:
+                    leader_result = await asyncio.shield(leader_future)
+                except Exception as engine_error:
+                    return _build_engine_error_response(engine_error)
+                if self._coalescing_policy.is_result_shareable(leader_result):
+                    self._metrics.coalesced_request_count += 1
+                    return _build_json_response(200, self._build_chat_completion_payload(leader_result))
+
+        result_future = self._enqueue_engine_execution(
+            user_prompt,
+            conversation_history,
+            tool_call_engine,
+            coalescing_key,
+        )
+        if result_future is None:
+            # Guard: shed load instead of letting the local model server queue opaquely.
+            self._metrics.rejected_request_count += 1
+            return _build_error_response(
+                429,
+                "Gateway queue is full; retry later.",
+                extra_headers=(("Retry-After", str(QUEUE_FULL_RETRY_AFTER_SECONDS)),),
+            )
+
+        try:
+            engine_result = await asyncio.shield(result_future)
+        except Exception as engine_error:
+            return _build_engine_error_response(engine_error)
+
+        return _build_json_response(200, self._build_chat_completion_payload(engine_result))
+
+    def _enqueue_engine_execution(
+        self,
+        user_prompt: str,
+        conversation_history: list[dict[str, str]],
+        tool_call_engine: ToolCallEngine,
+        coalescing_key: str | None,
+    ) -> asyncio.Future[Any] | None:
+        assert self._request_queue is not None
+        result_future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        try:
+            self._request_queue.put_nowait((user_prompt, conversation_history, tool_call_engine, result_future))
+        except asyncio.QueueFull:
+            return None
+
+        if coalescing_key is not None and coalescing_key not in self._leader_futures_by_coalescing_key:
+            self._leader_futures_by_coalescing_key[coalescing_key] = result_future
+            result_future.add_done_callback(
+                lambda _: self._leader_futures_by_coalescing_key.pop(coalescing_key, None)
+            )
+        return result_future
+
+    def _build_chat_completion_payload(self, engine_result: EngineRoundResult) -> dict[str, Any]:
+        return {
+            "id": f"chatcmpl-kiboedge-{next(self._completion_identifiers)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self._runtime_configuration.model_name,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": engine_result.assistant_content},
+                    "finish_reason": "stop",
+                }
+            ],
+            # OpenAI-style usage: every completion the engine sent for this request, repairs included.
+            "usage": engine_result.token_usage,
+            "kiboedge": {
+                "is_success": engine_result.is_success,
+                "failure_reason": engine_result.failure_reason,
+                "source": engine_result.source,
+                "tool_name": engine_result.tool_name,
+                "arguments": engine_result.arguments,
+                "tool_result": engine_result.tool_result,
+                "stage_timings_seconds": engine_result.stage_timings_seconds,
+                "token_usage_by_stage": engine_result.token_usage_by_stage,
+            },
+        }
+
+    def _render_metrics_text(self) -> str:
+        queue_depth = self._request_queue.qsize() if self._request_queue is not None else 0
+        return self._metrics.render_prometheus_text(queue_depth=queue_depth, in_flight_count=self._in_flight_count)
+
+
+def _build_engine_error_response(engine_error: Exception) -> GatewayHttpResponse:
+    """Map an engine failure to a status; leaders and coalesced followers must answer alike."""
+    if isinstance(engine_error, RequestDeadlineExceededError):
+        return _build_error_response(
+            503,
+            str(engine_error),
+            extra_headers=(("Retry-After", str(QUEUE_FULL_RETRY_AFTER_SECONDS)),),
+        )
+    if isinstance(engine_error, CircuitOpenError):
+        return _build_error_response(
+            503,
+            str(engine_error),
+            extra_headers=(("Retry-After", str(math.ceil(engine_error.retry_after_seconds) or 1)),),
+        )
+    return _build_error_response(502, f"Model request failed: {type(engine_error).__name__}")
+
+
+def _split_chat_messages(request_payload: Any) -> tuple[str, list[dict[str, str]]]:
+    """Return the last user prompt and the earlier user/assistant turns as engine history.
+
+    Client ``system`` messages are dropped (the engine owns the system prompt). Tool-call
+    and tool messages are refused, because the gateway executes tools itself.
+    """
+    if not isinstance(request_payload, dict) or not isinstance(request_payload.get("messages"), list):
+        raise ValueError("messages must be a list.")
+
+    chat_messages: list[dict[str, str]] = []
+    for message in request_payload["messages"]:
+        if not isinstance(message, dict):
+            raise ValueError("Every message must be an object.")
+        message_role = message.get("role")
+        if message_role == "system":
+            continue
+        # Guard: replaying client-side tool calls would bypass the gateway's own tool execution.
+        if message_role not in ("user", "assistant") or message.get("tool_calls"):
+            raise ValueError("Only user and assistant text messages are accepted; the gateway runs tools itself.")
+        chat_messages.append({"role": message_role, "content": _read_message_text(message.get("content"))})
+
+    # Guard: the engine needs one final user message to route.
+    if not chat_messages or chat_messages[-1]["role"] != "user" or not chat_messages[-1]["content"].strip():
+        raise ValueError("messages must end with a user message with text content.")
+    return chat_messages[-1]["content"], chat_messages[:-1]
+
+
+def _read_message_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    # OpenAI content-part arrays: keep only the text parts.
+    if isinstance(content, list):
+        return "".join(
+            content_part.get("text", "")
+            for content_part in content
+            if isinstance(content_part, dict) and content_part.get("type") == "text"
+        )
+    return ""
+
+
+def _build_json_response(
+    status_code: int,
+    payload: dict[str, Any],
+    extra_headers: tuple[tuple[str, str], ...] = (),
+) -> GatewayHttpResponse:
+    return GatewayHttpResponse(
+        status_code=status_code,
+        body=json.dumps(payload, ensure_ascii=True).encode("utf-8"),
+        extra_headers=extra_headers,
+    )
+
+
+def _build_error_response(
+    status_code: int,
+    error_message: str,
+    extra_headers: tuple[tuple[str, str], ...] = (),
+) -> GatewayHttpResponse:
+    return _build_json_response(
+        status_code,
+        {"error": {"message": error_message, "type": HTTP_REASON_PHRASE_BY_STATUS_CODE.get(status_code, "error")}},
+        extra_headers=extra_headers,
+    )
+
+
+def _serialize_http_response(http_response: GatewayHttpResponse, keep_alive: bool) -> bytes:
+    reason_phrase = HTTP_REASON_PHRASE_BY_STATUS_CODE.get(http_response.status_code, "Unknown")
+    header_lines = [
+        f"HTTP/1.1 {http_response.status_code} {reason_phrase}",
+        f"Content-Type: {http_response.content_type}",
+        f"Content-Length: {len(http_response.body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    header_lines.extend(f"{header_name}: {header_value}" for header_name, header_value in http_response.extra_headers)
+    return ("\r\n".join(header_lines) + "\r\n\r\n").encode("latin-1") + http_response.body
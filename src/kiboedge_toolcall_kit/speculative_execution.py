@@ -0,0 +1,263 @@
+"""Responsibility: pre-execute likely read-only tool calls while the model request is still running."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+from typing import Any, Callable, Protocol
+
+from .config import RuntimeConfiguration
+from .models import ParsedToolCall
+from .request_coalescing import normalize_user_prompt
+
+
+@dataclass(frozen=True)
+class SpeculatedToolCall:
+    """The call a guesser expects the model to make; arguments must already be in coerced form."""
+
+    tool_name: str
+    arguments: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class SpeculativeExecutionStats:
+    """Counters of one ``SpeculativeToolExecutor``; committed + discarded never exceeds started."""
+
+    started_count: int
+    committed_count: int
+    discarded_count: int
+
+
+class ToolCallGuesser(Protocol):
+    """Cheap local guess of the first tool call, made before the model has answered."""
+
+    def guess_tool_call(self, user_prompt: str) -> SpeculatedToolCall | None: ...
+
+    def record_executed_tool_calls(self, user_prompt: str, executed_tool_calls: list[ParsedToolCall]) -> None: ...
+
+
+class RecentToolCallGuesser:
+    """Guesses that a prompt seen before leads to the same first read-only call as last time.
+
+    Assistant traffic repeats a lot ("今日の天気は?"), so an LRU keyed by the normalized prompt
+    is a cheap, model-free intent guess. Only calls to ``read_only_tool_names`` are remembered.
+    """
+
+    def __init__(self, read_only_tool_names: frozenset[str], max_entries: int = 1024) -> None:
+        self._read_only_tool_names = read_only_tool_names
+        self._max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._tool_call_by_prompt: OrderedDict[str, SpeculatedToolCall] = OrderedDict()
+
+    def guess_tool_call(self, user_prompt: str) -> SpeculatedToolCall | None:
+        prompt_key = normalize_user_prompt(user_prompt)
+        with self._lock:
+            speculated_tool_call = self._tool_call_by_prompt.get(prompt_key)
+            if speculated_tool_call is not None:
+                self._tool_call_by_prompt.move_to_end(prompt_key)
+            return speculated_tool_call
+
+    def record_executed_tool_calls(self, user_prompt: str, executed_tool_calls: list[ParsedToolCall]) -> None:
+        prompt_key = normalize_user_prompt(user_prompt)
+        # Guard: a prompt whose first call changes state is never worth speculating on; forget it.
+        if not executed_tool_calls or executed_tool_calls[0].tool_name not in self._read_only_tool_names:
+            with self._lock:
+                self._tool_call_by_prompt.pop(prompt_key, None)
+            return
+
+        first_tool_call = executed_tool_calls[0]
+        with self._lock:
+            self._tool_call_by_prompt[prompt_key] = SpeculatedToolCall(
+                tool_name=first_tool_call.tool_name,
+                arguments=dict(first_tool_call.arguments),
+            )
+            self._tool_call_by_prompt.move_to_end(prompt_key)
+            while len(self._tool_call_by_prompt) > self._max_entries:
+                self._tool_call_by_prompt.popitem(last=False)
+
+
+class SpeculativeExecution:
+    """One in-flight speculated call; its result is used at most once, and only on an exact match."""
+
+    def __init__(
+        self,
+        speculated_tool_call: SpeculatedToolCall,
+        tool_result_future: Future[dict[str, Any]],
+        read_only_tool_names: frozenset[str],
+        on_settled: Callable[[bool], None],
+        started_write_generation: int = 0,
+        read_write_generation: Callable[[], int] = lambda: 0,
+    ) -> None:
+        self.speculated_tool_call = speculated_tool_call
+        self._tool_result_future = tool_result_future
+        self._read_only_tool_names = read_only_tool_names
+        self._on_settled = on_settled
+        self._started_write_generation = started_write_generation
+        self._read_write_generation = read_write_generation
+        self._is_settled = False
+
+    def claim(self, parsed_tool_call: ParsedToolCall) -> dict[str, Any] | None:
+        """Return the speculated result when ``parsed_tool_call`` is the speculated call, else None.
+
+        Call this before executing every tool call of the request. A state-changing call that
+        does not match discards the speculation, because the pre-executed read may now be stale.
+        So does any tracked write, from any request, that started after the speculation did.
+        """
+        if self._is_settled:
+            return None
+        if self._read_write_generation() != self._started_write_generation:
+            self.discard()
+            return None
+        if (
+            parsed_tool_call.tool_name == self.speculated_tool_call.tool_name
+            and parsed_tool_call.arguments == self.speculated_tool_call.arguments
+        ):
+            self._settle(is_committed=True)
+            return self._tool_result_future.result()
+        if parsed_tool_call.tool_name not in self._read_only_tool_names:
+            self.discard()
+        return None
+
+    def discard(self) -> None:
+        """Drop an unclaimed result; a call that has not started yet is cancelled."""
+        if self._is_settled:
+            return
+        self._tool_result_future.cancel()
+        self._settle(is_committed=False)
+
+    def _settle(self, is_committed: bool) -> None:
+        self._is_settled = True
+        self._on_settled(is_committed)
+
+
+class SpeculativeToolExecutor:
+    """Starts the guessed read-only call on a small thread pool when a request arrives.
+
+    The engine claims the result only if the final parsed call has the same tool name and
+    arguments; otherwise the result is discarded. Write tools are never speculated, so a
+    wrong guess costs one wasted read and never a side effect. Writes made through a map
+    returned by ``track_state_changing_calls`` advance a write generation that invalidates
+    every speculation started before them; writes that bypass it are not seen.
+    """
+
+    def __init__(
+        self,
+        read_only_tool_names: frozenset[str],
+        tool_executor_map: dict[str, Any],
+        tool_call_guesser: ToolCallGuesser | None = None,
+        worker_count: int = 1,
+    ) -> None:
+        self._read_only_tool_names = read_only_tool_names
+        self._tool_executor_map = tool_executor_map
+        self._tool_call_guesser = (
+            tool_call_guesser if tool_call_guesser is not None else RecentToolCallGuesser(read_only_tool_names)
+        )
+        self._thread_pool_executor = ThreadPoolExecutor(
+            max_workers=max(1, worker_count),
+            thread_name_prefix="tool-speculation",
+        )
+        self._counter_lock = threading.Lock()
+        self._started_count = 0
+        self._committed_count = 0
+        self._discarded_count = 0
+        self._write_generation = 0
+
+    @property
+    def stats(self) -> SpeculativeExecutionStats:
+        with self._counter_lock:
+            return SpeculativeExecutionStats(
+                started_count=self._started_count,
+                committed_count=self._committed_count,
+                discarded_count=self._discarded_count,
+            )
+
+    def start(self, user_prompt: str) -> SpeculativeExecution | None:
+        """Start the guessed call in the background; None when there is no safe guess."""
+        speculated_tool_call = self._tool_call_guesser.guess_tool_call(user_prompt)
+        # Guard: only read-only tools the engine can actually run are ever executed speculatively.
+        if (
+            speculated_tool_call is None
+            or speculated_tool_call.tool_name not in self._read_only_tool_names
+            or speculated_tool_call.tool_name not in self._tool_executor_map
+        ):
+            return None
+
+        tool_executor = self._tool_executor_map[speculated_tool_call.tool_name]
+        # Guard: the generation is read before the call starts, so a concurrent write always invalidates it.
+        started_write_generation = self._read_write_generation()
+        tool_result_future = self._thread_pool_executor.submit(tool_executor, dict(speculated_tool_call.arguments))
+        with self._counter_lock:
+            self._started_count += 1
+        return SpeculativeExecution(
+            speculated_tool_call,
+            tool_result_future,
+            self._read_only_tool_names,
+            self._record_settled_execution,
+            started_write_generation,
+            self._read_write_generation,
+        )
+
+    def track_state_changing_calls(self, tool_executor_map: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of ``tool_executor_map`` whose non-read-only tools advance the write generation."""
+        return {
+            tool_name: (
+                tool_executor
+                if tool_name in self._read_only_tool_names
+                else self._build_write_tracking_executor(tool_executor)
+            )
+            for tool_name, tool_executor in tool_executor_map.items()
+        }
+
+    def record_outcome(self, user_prompt: str, executed_tool_calls: list[ParsedToolCall]) -> None:
+        """Teach the guesser which calls this prompt really led to."""
+        self._tool_call_guesser.record_executed_tool_calls(user_prompt, executed_tool_calls)
+
+    def shutdown(self) -> None:
+        self._thread_pool_executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> SpeculativeToolExecutor:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.shutdown()
+
+    def _build_write_tracking_executor(self, tool_executor: Callable[[dict[str, Any]], dict[str, Any]]) -> Any:
+        def run_write_tracked_tool(arguments: dict[str, Any]) -> dict[str, Any]:
+            # Advanced before the write runs, so a read racing with it is never committed.
+            with self._counter_lock:
+                self._write_generation += 1
+            return tool_executor(arguments)
+
+        return run_write_tracked_tool
+
+    def _read_write_generation(self) -> int:
+        with self._counter_lock:
+            return self._write_generation
+
+    def _record_settled_execution(self, is_committed: bool) -> None:
+        with self._counter_lock:
+            if is_committed:
+                self._committed_count += 1
+            else:
+                self._discarded_count += 1
+
+
+def build_speculative_tool_executor(
+    runtime_configuration: RuntimeConfiguration,
+    tool_executor_map: dict[str, Any],
+    read_only_tool_names: frozenset[str],
+) -> SpeculativeToolExecutor | None:
+    """Create the executor with a recent-prompt guesser, or None when speculation is off."""
+    if not runtime_configuration.speculative_tool_execution_enabled:
+        return None
+    return SpeculativeToolExecutor(
+        read_only_tool_names=read_only_tool_names,
+        tool_executor_map=tool_executor_map,
+        tool_call_guesser=RecentToolCallGuesser(
+            read_only_tool_names,
+            max_entries=runtime_configuration.speculative_guess_cache_size,
+        ),
+        worker_count=runtime_configuration.speculative_worker_count,
+    )
@@ -0,0 +1,540 @@
+"""Responsibility: keep multi-turn conversation state under token and memory caps, with cheap persistence."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+from .config import RuntimeConfiguration
+from .io_utils import read_json_lines
+from .models import EngineRoundResult
+from .prompt_templates import build_conversation_summary_prompt
+from .tool_orchestrator import ToolCallEngine
+
+SESSION_FILE_FORMAT_VERSION = 1
+# Cheap token estimate without a tokenizer: ~3 UTF-8 bytes per token fits both Japanese and English.
+ESTIMATED_UTF8_BYTES_PER_TOKEN = 3
+ESTIMATED_TOKENS_PER_MESSAGE = 4
+SUMMARY_FIELD_MAX_CHARACTERS = 60
+SUMMARY_ACKNOWLEDGEMENT_TEXT = "OK."
+
+
+class ClosedSessionError(RuntimeError):
+    """Raised when a turn is run on a session its manager has already spilled or ended."""
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Approximate the prompt tokens one chat message costs."""
+    message_text = message.get("content") or ""
+    if message.get("tool_calls"):
+        message_text += json.dumps(message["tool_calls"], ensure_ascii=False, separators=(",", ":"))
+    return ESTIMATED_TOKENS_PER_MESSAGE + len(message_text.encode("utf-8")) // ESTIMATED_UTF8_BYTES_PER_TOKEN
+
+
+class ToolResultStore:
+    """Content-addressed, reference-counted tool message contents shared by all sessions of a manager.
+
+    Sessions keep only the reference, so the same weather or database payload seen by
+    thousands of sessions is held once; an entry is freed when its last reference is released.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._content_by_reference: dict[str, str] = {}
+        self._reference_count_by_reference: dict[str, int] = {}
+        self._stored_byte_count = 0
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._content_by_reference)
+
+    @property
+    def stored_byte_count(self) -> int:
+        return self._stored_byte_count
+
+    def put(self, content: str) -> str:
+        """Store ``content`` (or add a reference to the identical stored copy) and return its reference."""
+        content_reference = hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+        with self._lock:
+            if content_reference not in self._content_by_reference:
+                self._content_by_reference[content_reference] = content
+                self._stored_byte_count += len(content.encode("utf-8"))
+            self._reference_count_by_reference[content_reference] = (
+                self._reference_count_by_reference.get(content_reference, 0) + 1
+            )
+        return content_reference
+
+    def get(self, content_reference: str) -> str:
+        return self._content_by_reference[content_reference]
+
+    def release(self, content_reference: str) -> None:
+        with self._lock:
+            remaining_reference_count = self._reference_count_by_reference.get(content_reference, 0) - 1
+            if remaining_reference_count > 0:
+                self._reference_count_by_reference[content_reference] = remaining_reference_count
+                return
+            self._reference_count_by_reference.pop(content_reference, None)
+            released_content = self._content_by_reference.pop(content_reference, None)
+            if released_content is not None:
+                self._stored_byte_count -= len(released_content.encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class SessionTurn:
+    """One successful user turn; tool messages carry ``content_reference`` instead of ``content``."""
+
+    user_prompt: str
+    tool_call_messages: tuple[dict[str, Any], ...]
+    assistant_content: str
+    estimated_tokens: int
+
+
+class ToolCallSession:
+    """Conversation history for one user, replayed into ``ToolCallEngine`` on every turn.
+
+    Only successful turns are kept. When the estimated history exceeds ``max_history_tokens``,
+    the oldest turns are evicted into one-line summaries (at most ``max_summary_lines``,
+    oldest dropped first), so the prompt stays bounded however long the conversation runs.
+    Turns of one session run one at a time; different sessions run concurrently.
+    """
+
+    def __init__(
+        self,
+        session_identifier: str,
+        tool_call_engine: ToolCallEngine,
+        tool_result_store: ToolResultStore,
+        max_history_tokens: int = 2048,
+        max_summary_lines: int = 8,
+    ) -> None:
+        self.session_identifier = session_identifier
+        self._tool_call_engine = tool_call_engine
+        self._tool_result_store = tool_result_store
+        self._max_history_tokens = max_history_tokens
+        self._max_summary_lines = max(0, max_summary_lines)
+        self._turn_lock = threading.Lock()
+        self._turns: list[SessionTurn] = []
+        self._summary_lines: list[str] = []
+        self._completed_turn_count = 0
+        self._is_closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    @property
+    def is_running_turn(self) -> bool:
+        return self._turn_lock.locked()
+
+    @property
+    def turn_count(self) -> int:
+        return len(self._turns)
+
+    @property
+    def summary_lines(self) -> list[str]:
+        return list(self._summary_lines)
+
+    @property
+    def estimated_history_tokens(self) -> int:
+        return self._estimate_summary_tokens() + sum(turn.estimated_tokens for turn in self._turns)
+
+    def run_turn(self, user_prompt: str) -> EngineRoundResult:
+        """Run one user turn with the stored history and keep it when it succeeds."""
+        with self._turn_lock:
+            # Guard: a session evicted by its manager no longer owns its tool result references.
+            if self._is_closed:
+                raise ClosedSessionError(f"Session {self.session_identifier} is closed.")
+            engine_round_result = self._tool_call_engine.run_tool_call_round(
+                user_prompt,
+                conversation_history=self.build_conversation_history(),
+            )
+            if engine_round_result.is_success:
+                self._append_turn(
+                    user_prompt,
+                    engine_round_result.turn_messages,
+                    engine_round_result.assistant_content or "",
+                )
+            return engine_round_result
+
+    def build_conversation_history(self) -> list[dict[str, Any]]:
+        """Return the messages replayed between the system prompt and the next user prompt."""
+        conversation_history: list[dict[str, Any]] = []
+        if self._summary_lines:
+            conversation_history.append(
+                {"role": "user", "content": build_conversation_summary_prompt(self._summary_lines)}
+            )
+            conversation_history.append({"role": "assistant", "content": SUMMARY_ACKNOWLEDGEMENT_TEXT})
+        for turn in self._turns:
+            conversation_history.append({"role": "user", "content": turn.user_prompt})
+            conversation_history.extend(
+                self._resolve_tool_call_message(tool_call_message) for tool_call_message in turn.tool_call_messages
+            )
+            conversation_history.append({"role": "assistant", "content": turn.assistant_content})
+        return conversation_history
+
+    def close(self) -> None:
+        """Release every tool result reference; the session cannot run turns afterwards."""
+        with self._turn_lock:
+            self._close_unlocked()
+
+    def write_session_file(self, session_file_path: str) -> None:
+        """Write the session as self-contained JSONL, replacing any older file atomically."""
+        with self._turn_lock:
+            self._write_session_file_unlocked(session_file_path)
+
+    def spill_if_idle(self, session_file_path: str) -> bool:
+        """Write and close the session unless a turn is running; True when it was spilled."""
+        if not self._turn_lock.acquire(blocking=False):
+            return False
+        try:
+            self._write_session_file_unlocked(session_file_path)
+            self._close_unlocked()
+        finally:
+            self._turn_lock.release()
+        return True
+
+    @classmethod
+    def read_session_file(
+        cls,
+        session_file_path: str,
+        tool_call_engine: ToolCallEngine,
+        tool_result_store: ToolResultStore,
+        max_history_tokens: int = 2048,
+        max_summary_lines: int = 8,
+    ) -> ToolCallSession:
+        """Restore a session written by ``write_session_file``; tool results rejoin the shared store."""
+        session: ToolCallSession | None = None
+        content_by_reference: dict[str, str] = {}
+        for session_record in read_json_lines(session_file_path):
+            record_type = session_record.get("record")
+            if record_type == "session":
+                # Guard: a newer file layout is refused rather than half-read.
+                if session_record.get("format_version") != SESSION_FILE_FORMAT_VERSION:
+                    raise ValueError(f"Unsupported session file format: {session_record.get('format_version')}")
+                session = cls(
+                    session_record["session_identifier"],
+                    tool_call_engine,
+                    tool_result_store,
+                    max_history_tokens=max_history_tokens,
+                    max_summary_lines=max_summary_lines,
+                )
+                session._summary_lines = list(session_record.get("summary_lines", []))
+                session._completed_turn_count = session_record.get("completed_turn_count", 0)
+            elif record_type == "tool_result":
+                content_by_reference[session_record["content_reference"]] = session_record["content"]
+            elif record_type == "turn" and session is not None:
+                tool_call_messages = []
+                for tool_call_message in session_record["tool_call_messages"]:
+                    if "content_reference" in tool_call_message:
+                        tool_call_message = {
+                            **tool_call_message,
+                            "content_reference": tool_result_store.put(
+                                content_by_reference[tool_call_message["content_reference"]]
+                            ),
+                        }
+                    tool_call_messages.append(tool_call_message)
+                session._turns.append(
+                    SessionTurn(
+                        user_prompt=session_record["user_prompt"],
+                        tool_call_messages=tuple(tool_call_messages),
+                        assistant_content=session_record["assistant_content"],
+                        estimated_tokens=session_record["estimated_tokens"],
+                    )
+                )
+        if session is None:
+            raise ValueError(f"Session file has no session header: {session_file_path}")
+        return session
+
+    def _append_turn(self, user_prompt: str, turn_messages: list[dict[str, Any]], assistant_content: str) -> None:
+        tool_call_messages: list[dict[str, Any]] = []
+        estimated_tokens = estimate_message_tokens({"content": user_prompt}) + estimate_message_tokens(
+            {"content": assistant_content}
+        )
+        self._completed_turn_count += 1
+        # The engine numbers tool call ids per request, so replayed turns get a session-wide prefix.
+        tool_call_identifier_prefix = f"turn-{self._completed_turn_count}-"
+        for turn_message in turn_messages:
+            estimated_tokens += estimate_message_tokens(turn_message)
+            if turn_message["role"] == "tool":
+                turn_message = {
+                    "role": "tool",
+                    "tool_call_id": tool_call_identifier_prefix + turn_message["tool_call_id"],
+                    "content_reference": self._tool_result_store.put(turn_message["content"]),
+                }
+            elif turn_message.get("tool_calls"):
+                turn_message = {
+                    **turn_message,
+                    "tool_calls": [
+                        {**tool_call, "id": tool_call_identifier_prefix + tool_call["id"]}
+                        for tool_call in turn_message["tool_calls"]
+                    ],
+                }
+            tool_call_messages.append(turn_message)
+        self._turns.append(
+            SessionTurn(
+                user_prompt=user_prompt,
+                tool_call_messages=tuple(tool_call_messages),
+                assistant_content=assistant_content,
+                estimated_tokens=estimated_tokens,
+            )
+        )
+        self._evict_turns_over_budget()
+
+    def _evict_turns_over_budget(self) -> None:
+        # Guard: the latest turn is always kept, even when it alone exceeds the budget.
+        while len(self._turns) > 1 and self.estimated_history_tokens > self._max_history_tokens:
+            evicted_turn = self._turns.pop(0)
+            self._release_turn(evicted_turn)
+            self._summary_lines.append(_summarize_turn(evicted_turn))
+            if len(self._summary_lines) > self._max_summary_lines:
+                del self._summary_lines[: len(self._summary_lines) - self._max_summary_lines]
+
+    def _estimate_summary_tokens(self) -> int:
+        if not self._summary_lines:
+            return 0
+        return estimate_message_tokens(
+            {"content": build_conversation_summary_prompt(self._summary_lines)}
+        ) + estimate_message_tokens({"content": SUMMARY_ACKNOWLEDGEMENT_TEXT})
+
+    def _resolve_tool_call_message(self, tool_call_message: dict[str, Any]) -> dict[str, Any]:
+        if "content_reference" not in tool_call_message:
+            return tool_call_message
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call_message["tool_call_id"],
+            "content": self._tool_result_store.get(tool_call_message["content_reference"]),
+        }
+
+    def _release_turn(self, turn: SessionTurn) -> None:
+        for tool_call_message in turn.tool_call_messages:
+            if "content_reference" in tool_call_message:
+                self._tool_result_store.release(tool_call_message["content_reference"])
+
+    def _close_unlocked(self) -> None:
+        if self._is_closed:
+            return
+        self._is_closed = True
+        for turn in self._turns:
+            self._release_turn(turn)
+
+    def _write_session_file_unlocked(self, session_file_path: str) -> None:
+        session_records: list[dict[str, Any]] = [
+            {
+                "record": "session",
+                "format_version": SESSION_FILE_FORMAT_VERSION,
+                "session_identifier": self.session_identifier,
+                "summary_lines": self._summary_lines,
+                "completed_turn_count": self._completed_turn_count,
+            }
+        ]
+        written_references: set[str] = set()
+        for turn in self._turns:
+            for tool_call_message in turn.tool_call_messages:
+                content_reference = tool_call_message.get("content_reference")
+                if content_reference is not None and content_reference not in written_references:
+                    written_references.add(content_reference)
+                    session_records.append(
+                        {
+                            "record": "tool_result",
+                            "content_reference": content_reference,
+                            "content": self._tool_result_store.get(content_reference),
+                        }
+                    )
+            session_records.append(
+                {
+                    "record": "turn",
+                    "user_prompt": turn.user_prompt,
+                    "tool_call_messages": list(turn.tool_call_messages),
+                    "assistant_content": turn.assistant_content,
+                    "estimated_tokens": turn.estimated_tokens,
+                }
+            )
+
+        Path(session_file_path).parent.mkdir(parents=True, exist_ok=True)
+        temporary_file_path = f"{session_file_path}.tmp"
+        with open(temporary_file_path, mode="w", encoding="utf-8") as session_file:
+            for session_record in session_records:
+                session_file.write(json.dumps(session_record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(temporary_file_path, session_file_path)
+
+
+class ToolCallSessionManager:
+    """Keeps at most ``max_resident_sessions`` sessions in memory; the rest live in session files.
+
+    The least recently used idle session is written to ``session_directory_path`` and dropped
+    when the cap is exceeded, and restored transparently on its next turn. Session files are
+    read and written outside the manager lock; while one is in flight, other callers for the
+    same identifier wait on its pending event instead of touching the file.
+    """
+
+    def __init__(
+        self,
+        tool_call_engine: ToolCallEngine,
+        session_directory_path: str,
+        max_resident_sessions: int = 1024,
+        max_history_tokens: int = 2048,
+        max_summary_lines: int = 8,
+    ) -> None:
+        self._tool_call_engine = tool_call_engine
+        self._session_directory_path = Path(session_directory_path)
+        self._max_resident_sessions = max(1, max_resident_sessions)
+        self._max_history_tokens = max_history_tokens
+        self._max_summary_lines = max_summary_lines
+        self.tool_result_store = ToolResultStore()
+        self._lock = threading.Lock()
+        self._session_by_identifier: OrderedDict[str, ToolCallSession] = OrderedDict()
+        # Identifiers whose session file is being read or written right now.
+        self._pending_file_event_by_identifier: dict[str, threading.Event] = {}
+
+    @property
+    def resident_session_count(self) -> int:
+        return len(self._session_by_identifier)
+
+    def run_turn(self, session_identifier: str, user_prompt: str) -> EngineRoundResult:
+        while True:
+            session = self.get_session(session_identifier)
+            try:
+                return session.run_turn(user_prompt)
+            except ClosedSessionError:
+                # Guard: the session was spilled between lookup and turn; the retry restores it from its file.
+                continue
+
+    def get_session(self, session_identifier: str) -> ToolCallSession:
+        """Return the resident session, restoring it from its file or creating it when needed."""
+        while True:
+            with self._lock:
+                session = self._session_by_identifier.get(session_identifier)
+                if session is not None:
+                    self._session_by_identifier.move_to_end(session_identifier)
+                    return session
+                pending_file_event = self._pending_file_event_by_identifier.get(session_identifier)
+                if pending_file_event is None:
+                    pending_file_event = threading.Event()
+                    self._pending_file_event_by_identifier[session_identifier] = pending_file_event
+                    break
+            # Guard: another thread is loading or spilling this session; wait, then look again.
+            pending_file_event.wait()
+
+        spill_candidate_sessions: list[ToolCallSession] = []
+        try:
+            session = self._load_or_create_session(session_identifier)
+            with self._lock:
+                self._session_by_identifier[session_identifier] = session
+                spill_candidate_sessions = self._claim_spill_candidates_unlocked(session_identifier)
+        finally:
+            with self._lock:
+                del self._pending_file_event_by_identifier[session_identifier]
+            pending_file_event.set()
+        self._spill_sessions(spill_candidate_sessions)
+        return session
+
+    def end_session(self, session_identifier: str) -> None:
+        """Forget a session for good, including its session file."""
+        while True:
+            with self._lock:
+                pending_file_event = self._pending_file_event_by_identifier.get(session_identifier)
+                if pending_file_event is None:
+                    session = self._session_by_identifier.pop(session_identifier, None)
+                    break
+            # Guard: a spill in flight would otherwise rewrite the file after it is deleted.
+            pending_file_event.wait()
+        if session is not None:
+            session.close()
+        self.build_session_file_path(session_identifier).unlink(missing_ok=True)
+
+    def write_all_sessions(self) -> int:
+        """Write every resident session to its file (e.g. on shutdown); returns the number written."""
+        with self._lock:
+            resident_sessions = list(self._session_by_identifier.values())
+        for session in resident_sessions:
+            session.write_session_file(str(self.build_session_file_path(session.session_identifier)))
+        return len(resident_sessions)
+
+    def build_session_file_path(self, session_identifier: str) -> Path:
+        # Session identifiers come from clients, so the file name is a hash rather than the raw value.
+        session_file_name = hashlib.sha256(session_identifier.encode("utf-8")).hexdigest()[:32]
+        return self._session_directory_path / f"{session_file_name}.jsonl"
+
+    def _load_or_create_session(self, session_identifier: str) -> ToolCallSession:
+        session_file_path = self.build_session_file_path(session_identifier)
+        if session_file_path.exists():
+            return ToolCallSession.read_session_file(
+                str(session_file_path),
+                self._tool_call_engine,
+                self.tool_result_store,
+                max_history_tokens=self._max_history_tokens,
+                max_summary_lines=self._max_summary_lines,
+            )
+        return ToolCallSession(
+            session_identifier,
+            self._tool_call_engine,
+            self.tool_result_store,
+            max_history_tokens=self._max_history_tokens,
+            max_summary_lines=self._max_summary_lines,
+        )
+
+    def _claim_spill_candidates_unlocked(self, loaded_session_identifier: str) -> list[ToolCallSession]:
+        """Move the least recently used idle sessions over the cap to pending; caller holds ``_lock``."""
+        spill_candidate_sessions: list[ToolCallSession] = []
+        for session_identifier, session in list(self._session_by_identifier.items()):
+            if len(self._session_by_identifier) <= self._max_resident_sessions:
+                break
+            # Guard: a session in the middle of a turn is skipped; the next idle one is spilled instead.
+            if session.is_running_turn or session_identifier == loaded_session_identifier:
+                continue
+            del self._session_by_identifier[session_identifier]
+            self._pending_file_event_by_identifier[session_identifier] = threading.Event()
+            spill_candidate_sessions.append(session)
+        return spill_candidate_sessions
+
+    def _spill_sessions(self, spill_candidate_sessions: list[ToolCallSession]) -> None:
+        for session in spill_candidate_sessions:
+            session_identifier = session.session_identifier
+            try:
+                is_spilled = session.spill_if_idle(str(self.build_session_file_path(session_identifier)))
+            except OSError:
+                is_spilled = False
+            with self._lock:
+                # Guard: a turn that started after the claim keeps its session resident rather than losing it.
+                if not is_spilled:
+                    self._session_by_identifier[session_identifier] = session
+                pending_file_event = self._pending_file_event_by_identifier.pop(session_identifier)
+            pending_file_event.set()
+
+
+def build_tool_call_session_manager(
+    runtime_configuration: RuntimeConfiguration,
+    tool_call_engine: ToolCallEngine,
+) -> ToolCallSessionManager:
+    """Create a manager with the caps and session directory from ``RuntimeConfiguration``."""
+    return ToolCallSessionManager(
+        tool_call_engine=tool_call_engine,
+        session_directory_path=runtime_configuration.session_directory_path,
+        max_resident_sessions=runtime_configuration.session_max_resident_count,
+        max_history_tokens=runtime_configuration.session_max_history_tokens,
+        max_summary_lines=runtime_configuration.session_max_summary_lines,
+    )
+
+
+def _summarize_turn(turn: SessionTurn) -> str:
+    tool_call_texts = []
+    for tool_call_message in turn.tool_call_messages:
+        for tool_call in tool_call_message.get("tool_calls", []):
+            tool_call_texts.append(f"{tool_call['function']['name']}({tool_call['function']['arguments']})")
+    summary_fields = [f"user: {_truncate_text(turn.user_prompt)}"]
+    if tool_call_texts:
+        summary_fields.append(f"called: {_truncate_text(', '.join(tool_call_texts))}")
+    summary_fields.append(f"answer: {_truncate_text(turn.assistant_content)}")
+    return "- " + " / ".join(summary_fields)
+
+
+def _truncate_text(text: str) -> str:
+    single_line_text = " ".join(text.split())
+    if len(single_line_text) <= SUMMARY_FIELD_MAX_CHARACTERS:
+        return single_line_text
+    return single_line_text[: SUMMARY_FIELD_MAX_CHARACTERS - 1] + "…"
@@ -0,0 +1,193 @@
+"""Responsibility: run tool functions inline, on a bounded thread pool, or on a warm process pool."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from importlib import import_module
+import multiprocessing
+import threading
+from typing import Any, Callable, Mapping
+
+from .config import RuntimeConfiguration
+
+INLINE_EXECUTION_LANE = "inline"
+THREAD_EXECUTION_LANE = "thread"
+PROCESS_EXECUTION_LANE = "process"
+TOOL_EXECUTION_LANE_NAMES = (INLINE_EXECUTION_LANE, THREAD_EXECUTION_LANE, PROCESS_EXECUTION_LANE)
+
+_worker_tool_function_by_reference: dict[tuple[str, str], Callable[..., dict[str, Any]]] = {}
+
+
+class ToolExecutionLanes:
+    """Owns the worker pools behind the ``thread`` and ``process`` execution lanes.
+
+    Pools are created when a lane is first prepared. Process workers start with the
+    ``spawn`` method, import the tool modules up front and stay warm. Only the tool's module
+    name, qualified name and argument dict cross the process boundary.
+    """
+
+    def __init__(
+        self,
+        thread_worker_count: int = 2,
+        process_worker_count: int = 2,
+        execution_timeout_seconds: float = 30.0,
+        lane_override_by_tool_name: Mapping[str, str] | None = None,
+    ) -> None:
+        self._thread_worker_count = max(1, thread_worker_count)
+        self._process_worker_count = max(1, process_worker_count)
+        self._execution_timeout_seconds = execution_timeout_seconds
+        self._lane_override_by_tool_name = dict(lane_override_by_tool_name or {})
+        for lane_name in self._lane_override_by_tool_name.values():
+            validate_execution_lane_name(lane_name)
+        self._lock = threading.Lock()
+        # Serializes process pool startup only, so spawning workers never blocks the other lanes.
+        self._process_executor_start_lock = threading.Lock()
+        self._thread_executor: ThreadPoolExecutor | None = None
+        self._process_executor: ProcessPoolExecutor | None = None
+        self._process_tool_module_names: set[str] = set()
+
+    def resolve_lane(self, tool_name: str, declared_lane_name: str) -> str:
+        """Return the configured override for ``tool_name``, else the lane declared in the registry."""
+        return self._lane_override_by_tool_name.get(tool_name, declared_lane_name)
+
+    def prepare_lane(self, lane_name: str, tool_module_names: tuple[str, ...] = ()) -> Executor | None:
+        """Create (and for processes, pre-spawn) the pool behind ``lane_name`` and return it; None for inline."""
+        if lane_name == THREAD_EXECUTION_LANE:
+            with self._lock:
+                if self._thread_executor is None:
+                    self._thread_executor = ThreadPoolExecutor(
+                        max_workers=self._thread_worker_count,
+                        thread_name_prefix="tool-lane",
+                    )
+                return self._thread_executor
+        if lane_name == PROCESS_EXECUTION_LANE:
+            with self._lock:
+                self._process_tool_module_names.update(tool_module_names)
+                if self._process_executor is not None:
+                    return self._process_executor
+            with self._process_executor_start_lock:
+                with self._lock:
+                    # Guard: another thread may have started the pool while this one waited.
+                    if self._process_executor is not None:
+                        return self._process_executor
+                    process_tool_module_names = tuple(sorted(self._process_tool_module_names))
+                process_executor = self._start_process_executor(process_tool_module_names)
+                with self._lock:
+                    self._process_executor = process_executor
+                return process_executor
+        return None
+
+    def run_tool(
+        self,
+        lane_name: str,
+        tool_function: Callable[..., dict[str, Any]],
+        arguments: dict[str, Any],
+        bound_dependencies: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Run one tool call on ``lane_name`` and wait for its result; pool failures become error results."""
+        lane_executor = self.prepare_lane(lane_name, (tool_function.__module__,))
+        if lane_executor is None:
+            return tool_function(**arguments, **bound_dependencies)
+
+        if lane_name == THREAD_EXECUTION_LANE:
+            tool_future = lane_executor.submit(lambda: tool_function(**arguments, **bound_dependencies))
+        else:
+            try:
+                tool_future = lane_executor.submit(
+                    _run_tool_function_in_worker,
+                    tool_function.__module__,
+                    tool_function.__qualname__,
+                    arguments,
+                )
+            except BrokenProcessPool:
+                self._discard_process_executor(lane_executor)
+                return {"status": "error", "message": "Tool worker pool crashed; retry the call."}
+
+        try:
+            return tool_future.result(timeout=self._execution_timeout_seconds)
+        except FutureTimeoutError:
+            # Guard: the engine thread must not hang on a stuck tool. A stuck process worker is
+            # killed with its pool (other calls in flight on it get the crashed-pool error) so
+            # hung workers cannot use up the pool or block shutdown; a thread cannot be killed.
+            if lane_name == PROCESS_EXECUTION_LANE:
+                self._discard_process_executor(lane_executor, terminate_workers=True)
+            return {"status": "error", "message": f"Tool timed out after {self._execution_timeout_seconds}s."}
+        except BrokenProcessPool:
+            self._discard_process_executor(lane_executor)
+            return {"status": "error", "message": "Tool worker pool crashed; retry the call."}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread_executor, self._thread_executor = self._thread_executor, None
+            process_executor, self._process_executor = self._process_executor, None
+        for executor in (thread_executor, process_executor):
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ToolExecutionLanes:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.shutdown()
+
+    def _start_process_executor(self, tool_module_names: tuple[str, ...]) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs engine threads can deadlock on inherited locks.
+        process_executor = ProcessPoolExecutor(
+            max_workers=self._process_worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_import_tool_modules,
+            initargs=(tool_module_names,),
+        )
+        warmup_futures = [process_executor.submit(_noop) for _ in range(self._process_worker_count)]
+        for warmup_future in warmup_futures:
+            warmup_future.result()
+        return process_executor
+
+    def _discard_process_executor(self, broken_executor: Executor, terminate_workers: bool = False) -> None:
+        # Guard: only the pool that failed is dropped, never a fresh one another thread already started.
+        with self._lock:
+            if self._process_executor is broken_executor:
+                self._process_executor = None
+        if terminate_workers:
+            # ProcessPoolExecutor has no public way to stop a running call before Python 3.14.
+            for worker_process in list((getattr(broken_executor, "_processes", None) or {}).values()):
+                worker_process.terminate()
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def validate_execution_lane_name(lane_name: str) -> None:
+    # Guard: a typo would otherwise silently run a heavy tool inline.
+    if lane_name not in TOOL_EXECUTION_LANE_NAMES:
+        raise ValueError(f"Unknown tool execution lane: {lane_name} (known: {', '.join(TOOL_EXECUTION_LANE_NAMES)})")
+
+
+def build_tool_execution_lanes(runtime_configuration: RuntimeConfiguration) -> ToolExecutionLanes:
+    """Create lanes sized by ``tool_thread_worker_count`` / ``tool_process_worker_count``."""
+    return ToolExecutionLanes(
+        thread_worker_count=runtime_configuration.tool_thread_worker_count,
+        process_worker_count=runtime_configuration.tool_process_worker_count,
+        execution_timeout_seconds=runtime_configuration.tool_execution_timeout_seconds,
+        lane_override_by_tool_name=dict(runtime_configuration.tool_execution_lane_by_tool_name),
+    )
+
+
+def _import_tool_modules(tool_module_names: tuple[str, ...]) -> None:
+    for tool_module_name in tool_module_names:
+        import_module(tool_module_name)
+
+
+def _noop() -> None:
+    return None
+
+
+def _run_tool_function_in_worker(module_name: str, qualified_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    function_reference = (module_name, qualified_name)
+    tool_function = _worker_tool_function_by_reference.get(function_reference)
+    if tool_function is None:
+        tool_function = import_module(module_name)
+        for attribute_name in qualified_name.split("."):
+            tool_function = getattr(tool_function, attribute_name)
+        _worker_tool_function_by_reference[function_reference] = tool_function
+    return tool_function(**arguments)
@@ -0,0 +1,76 @@
+"""Responsibility: serialize tool-call arguments and tool results into compact follow-up message text."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping
+
+from .config import RuntimeConfiguration
+
+ASCII_ESCAPED_TOOL_MESSAGE_ENCODING = "ascii_escaped"
+UTF8_TOOL_MESSAGE_ENCODING = "utf8"
+UTF8_MINIFIED_TOOL_MESSAGE_ENCODING = "utf8_minified"
+TOOL_MESSAGE_ENCODING_NAMES = (
+    ASCII_ESCAPED_TOOL_MESSAGE_ENCODING,
+    UTF8_TOOL_MESSAGE_ENCODING,
+    UTF8_MINIFIED_TOOL_MESSAGE_ENCODING,
+)
+ALWAYS_PROJECTED_RESULT_FIELD_NAMES = ("status",)
+
+
+class ToolMessageEncoder:
+    """Encodes what the engine replays to the model after a tool call.
+
+    ``ascii_escaped`` is the historical format, where each Japanese character becomes a
+    six-character ``\\uXXXX`` escape. ``utf8`` passes characters through and
+    ``utf8_minified`` also drops the spaces after separators. A per-tool field projection
+    trims result fields the model does not need to phrase its answer; ``status`` is always kept.
+    """
+
+    def __init__(
+        self,
+        encoding_name: str = UTF8_MINIFIED_TOOL_MESSAGE_ENCODING,
+        projected_result_fields_by_tool_name: Mapping[str, tuple[str, ...]] | None = None,
+    ) -> None:
+        # Guard: a typo would otherwise silently fall back to the verbose format.
+        if encoding_name not in TOOL_MESSAGE_ENCODING_NAMES:
+            raise ValueError(f"Unknown tool message encoding: {encoding_name}")
+
+        self._encoding_name = encoding_name
+        self._projected_result_fields_by_tool_name = dict(projected_result_fields_by_tool_name or {})
+
+    @property
+    def encoding_name(self) -> str:
+        return self._encoding_name
+
+    def encode_arguments(self, arguments: dict[str, Any]) -> str:
+        return self._dump_json(arguments)
+
+    def encode_tool_result(self, tool_name: str, tool_result_payload: dict[str, Any]) -> str:
+        return self._dump_json(self.project_tool_result(tool_name, tool_result_payload))
+
+    def project_tool_result(self, tool_name: str, tool_result_payload: dict[str, Any]) -> dict[str, Any]:
+        """Keep only the configured fields for ``tool_name``; unconfigured tools pass through unchanged."""
+        projected_field_names = self._projected_result_fields_by_tool_name.get(tool_name)
+        if projected_field_names is None:
+            return tool_result_payload
+        return {
+            field_name: field_value
+            for field_name, field_value in tool_result_payload.items()
+            if field_name in projected_field_names or field_name in ALWAYS_PROJECTED_RESULT_FIELD_NAMES
+        }
+
+    def _dump_json(self, payload: Any) -> str:
+        if self._encoding_name == ASCII_ESCAPED_TOOL_MESSAGE_ENCODING:
+            return json.dumps(payload, ensure_ascii=True)
+        if self._encoding_name == UTF8_TOOL_MESSAGE_ENCODING:
+            return json.dumps(payload, ensure_ascii=False)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_tool_message_encoder(runtime_configuration: RuntimeConfiguration) -> ToolMessageEncoder:
+    """Create the encoder selected by ``tool_message_encoding`` and ``tool_result_projection_by_tool_name``."""
+    return ToolMessageEncoder(
+        encoding_name=runtime_configuration.tool_message_encoding,
+        projected_result_fields_by_tool_name=dict(runtime_configuration.tool_result_projection_by_tool_name),
+    )
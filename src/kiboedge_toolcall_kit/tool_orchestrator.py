@@ -2,15 +2,107 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 import json
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
 from .config import RuntimeConfiguration
 from .lfm_tool_call_parser import LfmToolCallParser
-from .lmstudio_client import LmStudioChatClient
-from .models import ParsedToolCall
-from .prompt_templates import build_repair_prompt_for_parse_failure, build_tool_call_system_prompt
-from .tool_validation import validate_tool_call_against_schema
+from .lmstudio_client import (
+    ChatCompletionClient,
+    count_total_tokens,
+    is_request_rejected_by_server,
+    is_response_format_rejected_by_server,
+    merge_token_usage,
+    read_token_usage,
+)
+from .models import EngineRoundResult, ParsedToolCall, ToolCallViolationReport
+from .prompt_templates import (
+    build_repair_prompt_for_parse_failure,
+    build_repair_prompt_for_schema_violation,
+    build_tool_call_system_prompt,
+)
+from .self_consistency import SelfConsistencySampler
+from .tool_message_encoding import build_tool_message_encoder
+from .tool_schema_rendering import RenderedToolSet, render_tool_set
+from .tool_schemas import build_tool_call_response_format
+from .tool_validation import (
+    compile_tool_schemas,
+    describe_tool_call_violations,
+    validate_tool_call_against_schema,
+)
+
+if TYPE_CHECKING:
+    from .speculative_execution import SpeculativeExecution, SpeculativeToolExecutor
+    from .trace_logging import RuntimeTraceLogger
+
+WARMUP_PRIMING_USER_PROMPT = "ping"
+TOOL_CALL_REQUEST_STAGE = "tool_call_request"
+SCHEMA_REPAIR_STAGE = "schema_repair"
+TOOL_EXECUTION_STAGE = "tool_execution"
+FINAL_ANSWER_REQUEST_STAGE = "final_answer_request"
+TOKEN_BUDGET_EXCEEDED_FAILURE_REASON = "token_budget_exceeded"
+
+
+class _ToolCallRoundState:
+    """Per-request bookkeeping threaded through the engine helpers; the engine itself is shared."""
+
+    __slots__ = (
+        "messages",
+        "executed_tool_calls",
+        "last_tool_result",
+        "schema_repair_attempts",
+        "speculative_execution",
+        "stage_timings_seconds",
+        "token_usage",
+        "token_usage_by_stage",
+        "turn_start_index",
+    )
+
+    def __init__(self, messages: list[dict[str, Any]]) -> None:
+        self.messages = messages
+        self.turn_start_index = len(messages)
+        self.executed_tool_calls: list[ParsedToolCall] = []
+        self.last_tool_result: dict[str, Any] | None = None
+        self.schema_repair_attempts: list[dict[str, Any]] = []
+        self.speculative_execution: SpeculativeExecution | None = None
+        self.stage_timings_seconds: dict[str, float] = {}
+        self.token_usage: dict[str, int] = {}
+        self.token_usage_by_stage: dict[str, dict[str, int]] = {}
+
+    def record_token_usage(self, stage_name: str, added_token_usage: dict[str, int]) -> None:
+        merge_token_usage(self.token_usage, added_token_usage)
+        merge_token_usage(self.token_usage_by_stage.setdefault(stage_name, {}), added_token_usage)
+
+    def record_stage_time(self, stage_name: str, stage_started_time: float) -> None:
+        elapsed_seconds = time.perf_counter() - stage_started_time
+        self.stage_timings_seconds[stage_name] = self.stage_timings_seconds.get(stage_name, 0.0) + elapsed_seconds
+
+    def build_result(
+        self,
+        failure_reason: str | None,
+        reported_tool_call: ParsedToolCall | None = None,
+        assistant_content: str | None = None,
+    ) -> EngineRoundResult:
+        is_success = failure_reason is None
+        return EngineRoundResult(
+            is_success=is_success,
+            failure_reason=failure_reason,
+            source=reported_tool_call.source if reported_tool_call is not None else "none",
+            tool_name=reported_tool_call.tool_name if reported_tool_call is not None else None,
+            arguments=reported_tool_call.arguments if reported_tool_call is not None else None,
+            assistant_content=assistant_content,
+            tool_result=self.last_tool_result if is_success else None,
+            executed_tool_calls=self.executed_tool_calls,
+            schema_repair_attempts=self.schema_repair_attempts,
+            stage_timings_seconds=self.stage_timings_seconds,
+            token_usage=self.token_usage,
+            token_usage_by_stage=self.token_usage_by_stage,
+            turn_messages=[
+                message for message in self.messages[self.turn_start_index :] if message["role"] in ("assistant", "tool")
+            ],
+        )
 
 
 class ToolCallEngine:
@@ -19,52 +111,140 @@ class ToolCallEngine:
     def __init__(
         self,
         runtime_configuration: RuntimeConfiguration,
-        chat_client: LmStudioChatClient,
+        chat_client: ChatCompletionClient,
         tool_schemas: list[dict[str, Any]],
         tool_executor_map: dict[str, Any],
         parser: LfmToolCallParser | None = None,
         system_prompt_text: str | None = None,
+        tool_argument_coercer: Callable[[str, dict[str, Any]], dict[str, Any]] | None = None,
+        trace_logger: RuntimeTraceLogger | None = None,
+        speculative_tool_executor: SpeculativeToolExecutor | None = None,
     ) -> None:
         self._runtime_configuration = runtime_configuration
         self._chat_client = chat_client
         self._tool_schemas = tool_schemas
-        self._tool_executor_map = tool_executor_map
+        self._compiled_tool_schemas = compile_tool_schemas(tool_schemas)
+        # Optional: e.g. ToolRegistry.coerce_arguments turns "3" into 3 before validation.
+        self._tool_argument_coercer = tool_argument_coercer
+        # Optional: writes through an engine with speculation invalidate stale speculated reads.
+        self._tool_executor_map = (
+            speculative_tool_executor.track_state_changing_calls(tool_executor_map)
+            if speculative_tool_executor is not None
+            else tool_executor_map
+        )
+        # Optional: traces are queued, never written on the request path.
+        self._trace_logger = trace_logger
+        # Optional: pre-executes a guessed read-only call while the model request is in flight.
+        self._speculative_tool_executor = speculative_tool_executor
         self._parser = parser if parser is not None else LfmToolCallParser()
-        self._system_prompt_text = system_prompt_text or build_tool_call_system_prompt()
+        # Guard: rendering is resolved once here; validation below always uses the full schemas.
+        self._rendered_tool_set = render_tool_set(tool_schemas, runtime_configuration.tool_schema_rendering)
+        self._system_prompt_text = (
+            system_prompt_text or build_tool_call_system_prompt()
+        ) + self._rendered_tool_set.system_prompt_suffix
+        self._tool_message_encoder = build_tool_message_encoder(runtime_configuration)
+        # Guard: the oneOf response schema is compiled once, and dropped if the server rejects it.
+        self._tool_call_response_format: dict[str, Any] | None = None
+        if runtime_configuration.use_constrained_decoding:
+            self._tool_call_response_format = build_tool_call_response_format(tool_schemas)
+        self._self_consistency_sampler: SelfConsistencySampler | None = None
+        if runtime_configuration.self_consistency_sample_count > 1:
+            self._self_consistency_sampler = SelfConsistencySampler(
+                chat_client=chat_client,
+                parser=self._parser,
+                tool_schemas=tool_schemas,
+                sample_count=runtime_configuration.self_consistency_sample_count,
+                quorum_count=runtime_configuration.self_consistency_quorum_count,
+                sequential_execution_only=runtime_configuration.sequential_execution_only,
+            )
+
+    @property
+    def runtime_configuration(self) -> RuntimeConfiguration:
+        return self._runtime_configuration
+
+    @property
+    def system_prompt_text(self) -> str:
+        return self._system_prompt_text
+
+    @property
+    def tool_schemas(self) -> list[dict[str, Any]]:
+        return self._tool_schemas
+
+    @property
+    def rendered_tool_set(self) -> RenderedToolSet:
+        return self._rendered_tool_set
 
     def run_tool_call_round(
         self,
         user_prompt: str,
-    ) -> dict[str, Any]:
-        messages: list[dict[str, Any]] = [
-            {"role": "system", "content": self._system_prompt_text},
-            {"role": "user", "content": user_prompt},
-        ]
+        conversation_history: list[dict[str, Any]] | None = None,
+    ) -> EngineRoundResult:
+        """Run one user turn; ``conversation_history`` (earlier turns) goes between the system prompt and it."""
+        round_state = _ToolCallRoundState(
+            [
+                {"role": "system", "content": self._system_prompt_text},
+                *(conversation_history or ()),
+                {"role": "user", "content": user_prompt},
+            ]
+        )
+        if self._trace_logger is None:
+            return self._run_tool_call_round(user_prompt, round_state)
 
+        round_started_time = time.perf_counter()
+        try:
+            engine_round_result = self._run_tool_call_round(user_prompt, round_state)
+        except Exception as request_error:
+            self._trace_logger.record_engine_round(
+                user_prompt,
+                round_state.messages,
+                None,
+                latency_seconds=time.perf_counter() - round_started_time,
+                error_text=repr(request_error),
+            )
+            raise
+        self._trace_logger.record_engine_round(
+            user_prompt,
+            round_state.messages,
+            engine_round_result,
+            latency_seconds=time.perf_counter() - round_started_time,
+        )
+        return engine_round_result
+
+    def _run_tool_call_round(self, user_prompt: str, round_state: _ToolCallRoundState) -> EngineRoundResult:
+        if self._speculative_tool_executor is None:
+            return self._run_tool_call_loop(user_prompt, round_state)
+
+        round_state.speculative_execution = self._speculative_tool_executor.start(user_prompt)
+        try:
+            engine_round_result = self._run_tool_call_loop(user_prompt, round_state)
+        finally:
+            if round_state.speculative_execution is not None:
+                round_state.speculative_execution.discard()
+        if engine_round_result.is_success:
+            self._speculative_tool_executor.record_outcome(user_prompt, round_state.executed_tool_calls)
+        return engine_round_result
+
+    def _run_tool_call_loop(self, user_prompt: str, round_state: _ToolCallRoundState) -> EngineRoundResult:
         repair_attempt_count = 0
-        executed_tool_calls: list[ParsedToolCall] = []
         for tool_call_round_index in range(self._runtime_configuration.max_tool_call_rounds_per_request):
-            response = self._chat_client.create_chat_completion(
-                messages=messages,
-                tools=self._tool_schemas,
-                tool_choice="auto",
-            )
-            message = response.choices[0].message
-            parsed_tool_calls = self._parser.parse_from_message(message)
+            # Guard: once the per-request token budget is spent, no further round or repair retry is sent.
+            if tool_call_round_index > 0 and self._is_token_budget_exhausted(round_state):
+                return round_state.build_result(TOKEN_BUDGET_EXCEEDED_FAILURE_REASON)
+
+            stage_started_time = time.perf_counter()
+            message, parsed_tool_calls = self._request_tool_call_message(round_state)
+            parsed_tool_calls = self._coerce_tool_call_arguments(parsed_tool_calls)
+            round_state.record_stage_time(TOOL_CALL_REQUEST_STAGE, stage_started_time)
 
             # Guard: parse failure should trigger bounded repair retries.
             if not parsed_tool_calls:
                 if repair_attempt_count >= self._runtime_configuration.max_repair_attempts:
-                    return {
-                        "is_success": False,
-                        "failure_reason": "parse_failure",
-                        "source": "none",
-                        "tool_name": None,
-                        "arguments": None,
-                        "assistant_content": getattr(message, "content", None),
-                    }
+                    return round_state.build_result(
+                        "parse_failure",
+                        assistant_content=getattr(message, "content", None),
+                    )
 
-                messages.append(
+                round_state.messages.append(
                     {
                         "role": "user",
                         "content": build_repair_prompt_for_parse_failure(),
@@ -73,84 +253,277 @@ class ToolCallEngine:
                 repair_attempt_count += 1
                 continue
 
-            executed_in_this_round = self._execute_parsed_tool_calls_sequentially(
+            # Guard: invalid calls get a cheap targeted repair before they can end the request.
+            if self._runtime_configuration.schema_violation_repair_enabled:
+                stage_started_time = time.perf_counter()
+                parsed_tool_calls, repair_attempt_count = self._repair_schema_violations(
+                    user_prompt=user_prompt,
+                    parsed_tool_calls=parsed_tool_calls,
+                    repair_attempt_count=repair_attempt_count,
+                    round_state=round_state,
+                )
+                round_state.record_stage_time(SCHEMA_REPAIR_STAGE, stage_started_time)
+
+            stage_started_time = time.perf_counter()
+            rejected_tool_call, rejection_reason = self._execute_parsed_tool_calls_sequentially(
                 parsed_tool_calls=parsed_tool_calls,
-                messages=messages,
+                round_state=round_state,
                 tool_call_round_index=tool_call_round_index,
             )
-            if not executed_in_this_round["is_success"]:
-                return executed_in_this_round
-
-            executed_tool_calls.extend(executed_in_this_round["executed_tool_calls"])
+            round_state.record_stage_time(TOOL_EXECUTION_STAGE, stage_started_time)
+            if rejected_tool_call is not None:
+                return round_state.build_result(rejection_reason, reported_tool_call=rejected_tool_call)
 
             # Guard: after successful tool execution, ask model for final answer without tools.
-            final_response = self._chat_client.create_chat_completion(messages=messages, tools=[], tool_choice="none")
-            if not executed_tool_calls:
+            stage_started_time = time.perf_counter()
+            final_response = self._chat_client.create_chat_completion(
+                messages=round_state.messages,
+                tools=[],
+                tool_choice="none",
+            )
+            round_state.record_stage_time(FINAL_ANSWER_REQUEST_STAGE, stage_started_time)
+            round_state.record_token_usage(FINAL_ANSWER_REQUEST_STAGE, read_token_usage(final_response))
+            if not round_state.executed_tool_calls:
                 continue
-            last_tool_call = executed_tool_calls[-1]
-            return {
-                "is_success": True,
-                "failure_reason": None,
-                "source": last_tool_call.source,
-                "tool_name": last_tool_call.tool_name,
-                "arguments": last_tool_call.arguments,
-                "assistant_content": final_response.choices[0].message.content,
-            }
+            return round_state.build_result(
+                None,
+                reported_tool_call=round_state.executed_tool_calls[-1],
+                assistant_content=final_response.choices[0].message.content,
+            )
 
-        return {
-            "is_success": False,
-            "failure_reason": "max_tool_round_exceeded",
-            "source": "none",
-            "tool_name": None,
-            "arguments": None,
-            "assistant_content": None,
-        }
+        return round_state.build_result("max_tool_round_exceeded")
+
+    def send_priming_completion(self) -> None:
+        """Send the real system prompt and tool list with a one-token budget to fill the server's prompt cache."""
+        self._chat_client.create_chat_completion(
+            messages=[
+                {"role": "system", "content": self._system_prompt_text},
+                {"role": "user", "content": WARMUP_PRIMING_USER_PROMPT},
+            ],
+            tools=self._rendered_tool_set.request_tool_schemas,
+            tool_choice=self._rendered_tool_set.request_tool_choice,
+            max_generation_tokens=1,
+            request_timeout_seconds=self._runtime_configuration.warmup_request_timeout_seconds,
+        )
+
+    def _request_tool_call_message(self, round_state: _ToolCallRoundState) -> tuple[Any, list[ParsedToolCall]]:
+        if self._tool_call_response_format is not None:
+            try:
+                return self._request_constrained_tool_call_message(round_state, self._tool_call_response_format)
+            except Exception as request_error:
+                if not is_request_rejected_by_server(request_error):
+                    raise
+                # Guard: servers without structured output fall back to the parser cascade for good.
+                if is_response_format_rejected_by_server(request_error):
+                    self._tool_call_response_format = None
+                    return self._request_unconstrained_tool_call_message(round_state)
+                # An unexplained 400/422 may be about this request only: retry once without
+                # response_format, and give up on constrained decoding only if that works.
+                unconstrained_tool_call_message = self._request_unconstrained_tool_call_message(round_state)
+                self._tool_call_response_format = None
+                return unconstrained_tool_call_message
+
+        return self._request_unconstrained_tool_call_message(round_state)
+
+    def _request_unconstrained_tool_call_message(
+        self,
+        round_state: _ToolCallRoundState,
+    ) -> tuple[Any, list[ParsedToolCall]]:
+        # Guard: self-consistency mode votes over several candidates instead of trusting one.
+        if self._self_consistency_sampler is not None:
+            self_consistency_outcome = self._self_consistency_sampler.sample_tool_call_message(
+                messages=round_state.messages,
+                tools=self._rendered_tool_set.request_tool_schemas,
+                tool_choice=self._rendered_tool_set.request_tool_choice,
+            )
+            round_state.record_token_usage(TOOL_CALL_REQUEST_STAGE, self_consistency_outcome.token_usage)
+            return self_consistency_outcome.message, self_consistency_outcome.parsed_tool_calls
+
+        response = self._chat_client.create_chat_completion(
+            messages=round_state.messages,
+            tools=self._rendered_tool_set.request_tool_schemas,
+            tool_choice=self._rendered_tool_set.request_tool_choice,
+        )
+        round_state.record_token_usage(TOOL_CALL_REQUEST_STAGE, read_token_usage(response))
+        message = response.choices[0].message
+        return message, self._parser.parse_from_message(message)
+
+    def _request_constrained_tool_call_message(
+        self,
+        round_state: _ToolCallRoundState,
+        response_format: dict[str, Any],
+    ) -> tuple[Any, list[ParsedToolCall]]:
+        # Constrained replies carry the call as JSON content, so the native tools list is not sent
+        # (an empty list makes the client omit both tools and tool_choice).
+        if self._self_consistency_sampler is not None:
+            self_consistency_outcome = self._self_consistency_sampler.sample_tool_call_message(
+                messages=round_state.messages,
+                tools=[],
+                tool_choice="none",
+                response_format=response_format,
+            )
+            round_state.record_token_usage(TOOL_CALL_REQUEST_STAGE, self_consistency_outcome.token_usage)
+            return self_consistency_outcome.message, self_consistency_outcome.parsed_tool_calls
+
+        response = self._chat_client.create_chat_completion(
+            messages=round_state.messages,
+            tools=[],
+            tool_choice="none",
+            response_format=response_format,
+        )
+        round_state.record_token_usage(TOOL_CALL_REQUEST_STAGE, read_token_usage(response))
+        message = response.choices[0].message
+        return message, self._parser.parse_from_constrained_message(message)
+
+    def _repair_schema_violations(
+        self,
+        user_prompt: str,
+        parsed_tool_calls: list[ParsedToolCall],
+        repair_attempt_count: int,
+        round_state: _ToolCallRoundState,
+    ) -> tuple[list[ParsedToolCall], int]:
+        repaired_tool_calls = list(parsed_tool_calls)
+        for tool_call_index, parsed_tool_call in enumerate(repaired_tool_calls):
+            violation_report = describe_tool_call_violations(
+                tool_name=parsed_tool_call.tool_name,
+                arguments=parsed_tool_call.arguments,
+                tool_schemas=self._compiled_tool_schemas,
+                enforce_enum_values=self._runtime_configuration.schema_enum_validation_enabled,
+            )
+            # Guard: repairs share the max_repair_attempts budget with parse-failure repairs,
+            # and stop once the token budget is spent (the call then fails with its schema reason).
+            while (
+                violation_report.failure_reason is not None
+                and repair_attempt_count < self._runtime_configuration.max_repair_attempts
+                and not self._is_token_budget_exhausted(round_state)
+            ):
+                repaired_failure_reason = violation_report.failure_reason
+                repair_attempt_count += 1
+                total_tokens_before_repair = count_total_tokens(round_state.token_usage)
+                repaired_tool_call = self._request_schema_violation_repair(
+                    user_prompt,
+                    parsed_tool_call,
+                    violation_report,
+                    round_state,
+                )
+                if repaired_tool_call is not None:
+                    parsed_tool_call = repaired_tool_call
+                    violation_report = describe_tool_call_violations(
+                        tool_name=parsed_tool_call.tool_name,
+                        arguments=parsed_tool_call.arguments,
+                        tool_schemas=self._compiled_tool_schemas,
+                        enforce_enum_values=self._runtime_configuration.schema_enum_validation_enabled,
+                    )
+                round_state.schema_repair_attempts.append(
+                    {
+                        "failure_reason": repaired_failure_reason,
+                        "is_recovered": repaired_tool_call is not None and violation_report.failure_reason is None,
+                        "total_tokens": count_total_tokens(round_state.token_usage) - total_tokens_before_repair,
+                    }
+                )
+            repaired_tool_calls[tool_call_index] = parsed_tool_call
+        return repaired_tool_calls, repair_attempt_count
+
+    def _request_schema_violation_repair(
+        self,
+        user_prompt: str,
+        parsed_tool_call: ParsedToolCall,
+        violation_report: ToolCallViolationReport,
+        round_state: _ToolCallRoundState,
+    ) -> ParsedToolCall | None:
+        # Minimal follow-up: the original turn, the offending call and the precise violation only.
+        offending_tool_call_text = json.dumps(
+            {"name": parsed_tool_call.tool_name, "arguments": parsed_tool_call.arguments},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        repair_messages: list[dict[str, Any]] = [
+            {"role": "system", "content": self._system_prompt_text},
+            {"role": "user", "content": user_prompt},
+            {"role": "assistant", "content": offending_tool_call_text},
+            {"role": "user", "content": build_repair_prompt_for_schema_violation(violation_report)},
+        ]
+
+        target_tool_name = violation_report.nearest_tool_name or violation_report.tool_name
+        target_tool_schema = self._compiled_tool_schemas.tool_schema_by_name.get(target_tool_name)
+        repair_tool_schemas = [target_tool_schema] if target_tool_schema is not None else []
+        repair_tool_choice = "auto"
+        # Guard: without a plausible target tool, fall back to the engine's normal tool rendering.
+        if not repair_tool_schemas:
+            repair_tool_schemas = self._rendered_tool_set.request_tool_schemas
+            repair_tool_choice = self._rendered_tool_set.request_tool_choice
+
+        response = self._chat_client.create_chat_completion(
+            messages=repair_messages,
+            tools=repair_tool_schemas,
+            tool_choice=repair_tool_choice,
+        )
+        round_state.record_token_usage(SCHEMA_REPAIR_STAGE, read_token_usage(response))
+        repaired_tool_calls = self._coerce_tool_call_arguments(self._parser.parse_from_message(response.choices[0].message))
+        return repaired_tool_calls[0] if repaired_tool_calls else None
+
+    def _is_token_budget_exhausted(self, round_state: _ToolCallRoundState) -> bool:
+        max_tokens_per_request = self._runtime_configuration.max_tokens_per_request
+        return max_tokens_per_request is not None and count_total_tokens(round_state.token_usage) >= max_tokens_per_request
 
     def _execute_parsed_tool_calls_sequentially(
         self,
         parsed_tool_calls: list[ParsedToolCall],
-        messages: list[dict[str, Any]],
+        round_state: _ToolCallRoundState,
         tool_call_round_index: int,
-    ) -> dict[str, Any]:
-        executed_tool_calls: list[ParsedToolCall] = []
+    ) -> tuple[ParsedToolCall | None, str | None]:
+        """Validate and run calls in order; returns the rejected call and its reason, or ``(None, None)``."""
         for tool_call_index, parsed_tool_call in enumerate(parsed_tool_calls):
             validation_result = validate_tool_call_against_schema(
                 tool_name=parsed_tool_call.tool_name,
                 arguments=parsed_tool_call.arguments,
-                tool_schemas=self._tool_schemas,
+                tool_schemas=self._compiled_tool_schemas,
+                enforce_enum_values=self._runtime_configuration.schema_enum_validation_enabled,
             )
             if not validation_result.is_success:
-                return {
-                    "is_success": False,
-                    "failure_reason": validation_result.failure_reason,
-                    "source": parsed_tool_call.source,
-                    "tool_name": parsed_tool_call.tool_name,
-                    "arguments": parsed_tool_call.arguments,
-                    "assistant_content": None,
-                    "executed_tool_calls": executed_tool_calls,
-                }
+                return parsed_tool_call, validation_result.failure_reason
 
-            tool_result_payload = self._execute_tool(parsed_tool_call)
+            tool_result_payload = self._claim_or_execute_tool(parsed_tool_call, round_state)
             tool_call_identifier = self._build_tool_call_identifier(tool_call_round_index, tool_call_index)
-            messages.append(self._build_assistant_tool_call_message(parsed_tool_call, tool_call_identifier))
-            messages.append(
+            round_state.messages.append(self._build_assistant_tool_call_message(parsed_tool_call, tool_call_identifier))
+            round_state.messages.append(
                 {
                     "role": "tool",
                     "tool_call_id": tool_call_identifier,
-                    "content": json.dumps(tool_result_payload, ensure_ascii=True),
+                    "content": self._tool_message_encoder.encode_tool_result(
+                        parsed_tool_call.tool_name,
+                        tool_result_payload,
+                    ),
                 }
             )
-            executed_tool_calls.append(parsed_tool_call)
+            round_state.executed_tool_calls.append(parsed_tool_call)
+            round_state.last_tool_result = tool_result_payload
 
-        return {
-            "is_success": True,
-            "failure_reason": None,
-            "source": executed_tool_calls[-1].source if executed_tool_calls else "none",
-            "tool_name": executed_tool_calls[-1].tool_name if executed_tool_calls else None,
-            "arguments": executed_tool_calls[-1].arguments if executed_tool_calls else None,
-            "assistant_content": None,
-            "executed_tool_calls": executed_tool_calls,
-        }
+        return None, None
+
+    def _coerce_tool_call_arguments(self, parsed_tool_calls: list[ParsedToolCall]) -> list[ParsedToolCall]:
+        if self._tool_argument_coercer is None:
+            return parsed_tool_calls
+        coerced_tool_calls = []
+        for parsed_tool_call in parsed_tool_calls:
+            coerced_arguments = self._tool_argument_coercer(parsed_tool_call.tool_name, parsed_tool_call.arguments)
+            if coerced_arguments is not parsed_tool_call.arguments:
+                parsed_tool_call = replace(parsed_tool_call, arguments=coerced_arguments)
+            coerced_tool_calls.append(parsed_tool_call)
+        return coerced_tool_calls
+
+    def _claim_or_execute_tool(
+        self,
+        parsed_tool_call: ParsedToolCall,
+        round_state: _ToolCallRoundState,
+    ) -> dict[str, Any]:
+        speculative_execution = round_state.speculative_execution
+        if speculative_execution is not None:
+            speculated_tool_result = speculative_execution.claim(parsed_tool_call)
+            if speculated_tool_result is not None:
+                round_state.speculative_execution = None
+                return speculated_tool_result
+        return self._execute_tool(parsed_tool_call)
 
     def _execute_tool(self, parsed_tool_call: ParsedToolCall) -> dict[str, Any]:
         tool_name = parsed_tool_call.tool_name
@@ -174,7 +547,7 @@ class ToolCallEngine:
                     "type": "function",
                     "function": {
                         "name": parsed_tool_call.tool_name,
-                        "arguments": json.dumps(parsed_tool_call.arguments, ensure_ascii=True),
+                        "arguments": self._tool_message_encoder.encode_arguments(parsed_tool_call.arguments),
                     },
                 }
             ],
@@ -0,0 +1,338 @@
+"""Responsibility: declare tools once as typed Python functions and derive schemas, executors and coercers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+import inspect
+import re
+import threading
+import types
+from typing import Annotated, Any, Callable, Literal, Union, get_args, get_origin, get_type_hints
+
+from .tool_execution import (
+    INLINE_EXECUTION_LANE,
+    PROCESS_EXECUTION_LANE,
+    ToolExecutionLanes,
+    validate_execution_lane_name,
+)
+
+ToolFunction = Callable[[dict[str, Any]], dict[str, Any]]
+ArgumentCoercer = Callable[[Any], Any]
+JSON_SCHEMA_TYPE_BY_PYTHON_TYPE: dict[type, str] = {
+    str: "string",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    dict: "object",
+    list: "array",
+}
+TRUE_TEXT_VALUES = frozenset({"true", "yes", "1"})
+FALSE_TEXT_VALUES = frozenset({"false", "no", "0"})
+# ASCII digits only: str.isdigit() also accepts "①" or "²", which int() rejects.
+INTEGER_TEXT_PATTERN = re.compile(r"[+-]?[0-9]+")
+
+
+@dataclass(frozen=True)
+class RegisteredTool:
+    """A decorated tool function with everything derived from its signature."""
+
+    tool_name: str
+    tool_function: Callable[..., dict[str, Any]]
+    tool_schema: dict[str, Any]
+    argument_coercer_by_name: dict[str, ArgumentCoercer]
+    dependency_parameter_names: tuple[str, ...]
+    is_read_only: bool
+    execution_lane: str = INLINE_EXECUTION_LANE
+
+
+class ToolRegistry:
+    """Collects ``@registry.tool`` declarations and serves cached schemas, executors and coercers.
+
+    Parameters named in ``dependency_parameter_names`` (for example a data store) are injected
+    when executors are built and never appear in the schema. Modules listed in
+    ``tool_module_names`` are imported on the first lookup, so a large catalogue costs nothing
+    until an engine actually needs it.
+    """
+
+    def __init__(
+        self,
+        tool_module_names: tuple[str, ...] = (),
+        dependency_parameter_names: frozenset[str] = frozenset(),
+    ) -> None:
+        self._tool_module_names = tool_module_names
+        self._dependency_parameter_names = dependency_parameter_names
+        self._registered_tool_by_name: dict[str, RegisteredTool] = {}
+        self._cached_tool_schemas: list[dict[str, Any]] | None = None
+        # Reentrant: a tool module being imported may itself read from the registry; other
+        # threads wait on the lock until every module has finished registering.
+        self._lock = threading.RLock()
+        self._are_tool_modules_loaded = not tool_module_names
+
+    def tool(
+        self,
+        description: str | None = None,
+        *,
+        tool_name: str | None = None,
+        read_only: bool = False,
+        execution_lane: str = INLINE_EXECUTION_LANE,
+    ) -> Callable[[Callable[..., dict[str, Any]]], Callable[..., dict[str, Any]]]:
+        """Register the decorated function; the description defaults to its docstring's first line.
+
+        ``execution_lane`` is ``inline`` (engine thread), ``thread`` or ``process`` for CPU-heavy tools.
+        """
+        validate_execution_lane_name(execution_lane)
+
+        def register_tool_function(tool_function: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+            registered_tool = _build_registered_tool(
+                tool_function=tool_function,
+                tool_name=tool_name or tool_function.__name__,
+                description=description or _read_docstring_summary(tool_function),
+                is_read_only=read_only,
+                dependency_parameter_names=self._dependency_parameter_names,
+                execution_lane=execution_lane,
+            )
+            with self._lock:
+                # Guard: silently replacing a tool would desynchronize schemas already handed out.
+                if registered_tool.tool_name in self._registered_tool_by_name:
+                    raise ValueError(f"Tool already registered: {registered_tool.tool_name}")
+                self._registered_tool_by_name[registered_tool.tool_name] = registered_tool
+                self._cached_tool_schemas = None
+            return tool_function
+
+        return register_tool_function
+
+    @property
+    def tool_names(self) -> list[str]:
+        return list(self._get_registered_tool_by_name())
+
+    @property
+    def read_only_tool_names(self) -> frozenset[str]:
+        return frozenset(
+            tool_name
+            for tool_name, registered_tool in self._get_registered_tool_by_name().items()
+            if registered_tool.is_read_only
+        )
+
+    def get_registered_tool(self, tool_name: str) -> RegisteredTool | None:
+        return self._get_registered_tool_by_name().get(tool_name)
+
+    def build_tool_schemas(self) -> list[dict[str, Any]]:
+        """Return the OpenAI tool schemas in registration order (generated once; treat as read-only)."""
+        registered_tool_by_name = self._get_registered_tool_by_name()
+        with self._lock:
+            if self._cached_tool_schemas is None:
+                self._cached_tool_schemas = [
+                    registered_tool.tool_schema for registered_tool in registered_tool_by_name.values()
+                ]
+            return list(self._cached_tool_schemas)
+
+    def build_tool_executor_map(
+        self,
+        tool_execution_lanes: ToolExecutionLanes | None = None,
+        **dependencies: Any,
+    ) -> dict[str, ToolFunction]:
+        """Bind ``dependencies`` into each tool and return the engine's name -> executor map.
+
+        Without ``tool_execution_lanes`` every tool runs inline; with lanes, each tool runs on
+        its declared (or configured) lane and the pools it needs are started here, warm.
+        """
+        return {
+            tool_name: _bind_tool_executor(registered_tool, dependencies, tool_execution_lanes)
+            for tool_name, registered_tool in self._get_registered_tool_by_name().items()
+        }
+
+    def coerce_arguments(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Convert lossless mismatches such as ``"3"`` for an integer; other values pass through unchanged."""
+        registered_tool = self._get_registered_tool_by_name().get(tool_name)
+        # Guard: unknown tools and non-object arguments are left for validation to report.
+        if registered_tool is None or not isinstance(arguments, dict):
+            return arguments
+
+        coerced_arguments = arguments
+        for argument_name, argument_value in arguments.items():
+            argument_coercer = registered_tool.argument_coercer_by_name.get(argument_name)
+            if argument_coercer is None:
+                continue
+            coerced_value = argument_coercer(argument_value)
+            if coerced_value is not argument_value:
+                if coerced_arguments is arguments:
+                    coerced_arguments = dict(arguments)
+                coerced_arguments[argument_name] = coerced_value
+        return coerced_arguments
+
+    def _get_registered_tool_by_name(self) -> dict[str, RegisteredTool]:
+        if not self._are_tool_modules_loaded:
+            with self._lock:
+                if not self._are_tool_modules_loaded:
+                    for tool_module_name in self._tool_module_names:
+                        import_module(tool_module_name)
+                    self._are_tool_modules_loaded = True
+        return self._registered_tool_by_name
+
+
+def _bind_tool_executor(
+    registered_tool: RegisteredTool,
+    dependencies: dict[str, Any],
+    tool_execution_lanes: ToolExecutionLanes | None,
+) -> ToolFunction:
+    missing_dependency_names = [
+        dependency_name for dependency_name in registered_tool.dependency_parameter_names if dependency_name not in dependencies
+    ]
+    # Guard: fail at wiring time rather than on the first model call.
+    if missing_dependency_names:
+        raise ValueError(f"Tool {registered_tool.tool_name} needs dependencies: {', '.join(missing_dependency_names)}")
+
+    bound_dependencies = {
+        dependency_name: dependencies[dependency_name] for dependency_name in registered_tool.dependency_parameter_names
+    }
+    tool_function = registered_tool.tool_function
+    # Without lanes every tool runs inline on the engine thread, whatever it declared.
+    if tool_execution_lanes is None:
+        return lambda arguments: tool_function(**arguments, **bound_dependencies)
+    lane_name = tool_execution_lanes.resolve_lane(registered_tool.tool_name, registered_tool.execution_lane)
+    if lane_name == INLINE_EXECUTION_LANE:
+        return lambda arguments: tool_function(**arguments, **bound_dependencies)
+
+    # Guard: worker processes import the tool by name and cannot share in-memory dependencies.
+    if lane_name == PROCESS_EXECUTION_LANE and (bound_dependencies or "<locals>" in tool_function.__qualname__):
+        raise ValueError(
+            f"Tool {registered_tool.tool_name} cannot run in a process: it must be a module-level function without dependencies"
+        )
+    tool_execution_lanes.prepare_lane(lane_name, (tool_function.__module__,))
+    return lambda arguments: tool_execution_lanes.run_tool(lane_name, tool_function, arguments, bound_dependencies)
+
+
+def _build_registered_tool(
+    tool_function: Callable[..., dict[str, Any]],
+    tool_name: str,
+    description: str,
+    is_read_only: bool,
+    dependency_parameter_names: frozenset[str],
+    execution_lane: str,
+) -> RegisteredTool:
+    type_hints = get_type_hints(tool_function, include_extras=True)
+    properties: dict[str, Any] = {}
+    required_argument_names: list[str] = []
+    argument_coercer_by_name: dict[str, ArgumentCoercer] = {}
+    bound_dependency_names: list[str] = []
+    for parameter in inspect.signature(tool_function).parameters.values():
+        if parameter.name in dependency_parameter_names:
+            bound_dependency_names.append(parameter.name)
+            continue
+        # Guard: every model-facing argument needs a type to derive its schema from.
+        if parameter.name not in type_hints:
+            raise TypeError(f"Tool {tool_name} argument {parameter.name} has no type annotation")
+
+        property_schema, argument_coercer = _build_property_schema(type_hints[parameter.name])
+        properties[parameter.name] = property_schema
+        if argument_coercer is not None:
+            argument_coercer_by_name[parameter.name] = argument_coercer
+        if parameter.default is inspect.Parameter.empty:
+            required_argument_names.append(parameter.name)
+
+    tool_schema = {
+        "type": "function",
+        "function": {
+            "name": tool_name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": required_argument_names,
+                "additionalProperties": False,
+            },
+        },
+    }
+    return RegisteredTool(
+        tool_name=tool_name,
+        tool_function=tool_function,
+        tool_schema=tool_schema,
+        argument_coercer_by_name=argument_coercer_by_name,
+        dependency_parameter_names=tuple(bound_dependency_names),
+        is_read_only=is_read_only,
+        execution_lane=execution_lane,
+    )
+
+
+def _build_property_schema(annotation: Any) -> tuple[dict[str, Any], ArgumentCoercer | None]:
+    annotation_origin = get_origin(annotation)
+    if annotation_origin is Annotated:
+        annotated_type, *annotation_metadata = get_args(annotation)
+        property_schema, argument_coercer = _build_property_schema(annotated_type)
+        descriptions = [metadata for metadata in annotation_metadata if isinstance(metadata, str)]
+        if descriptions:
+            property_schema = {**property_schema, "description": descriptions[0]}
+        return property_schema, argument_coercer
+
+    if annotation_origin in (Union, types.UnionType):
+        # Optional arguments are expressed through a default value; the schema keeps the inner type.
+        non_none_types = [member_type for member_type in get_args(annotation) if member_type is not type(None)]
+        if len(non_none_types) == 1:
+            return _build_property_schema(non_none_types[0])
+        return {}, None
+
+    if annotation_origin is Literal:
+        enum_values = list(get_args(annotation))
+        property_schema, argument_coercer = _build_property_schema(type(enum_values[0]))
+        return {**property_schema, "enum": enum_values}, argument_coercer
+
+    if annotation_origin is list:
+        item_annotations = get_args(annotation)
+        property_schema: dict[str, Any] = {"type": "array"}
+        if item_annotations:
+            property_schema["items"] = _build_property_schema(item_annotations[0])[0]
+        return property_schema, None
+
+    python_type = annotation_origin or annotation
+    json_schema_type = JSON_SCHEMA_TYPE_BY_PYTHON_TYPE.get(python_type)
+    # Guard: Any and other open types accept every value.
+    if json_schema_type is None:
+        return {}, None
+    return {"type": json_schema_type}, ARGUMENT_COERCER_BY_JSON_SCHEMA_TYPE.get(json_schema_type)
+
+
+def _coerce_integer(argument_value: Any) -> Any:
+    # Guard: anything else is left as is, so validation reports schema_mismatch instead of raising.
+    if isinstance(argument_value, str) and INTEGER_TEXT_PATTERN.fullmatch(argument_value.strip()):
+        return int(argument_value)
+    if isinstance(argument_value, float) and argument_value.is_integer():
+        return int(argument_value)
+    return argument_value
+
+
+def _coerce_number(argument_value: Any) -> Any:
+    if isinstance(argument_value, str):
+        try:
+            return float(argument_value)
+        except ValueError:
+            return argument_value
+    return argument_value
+
+
+def _coerce_boolean(argument_value: Any) -> Any:
+    if isinstance(argument_value, str):
+        normalized_text = argument_value.strip().lower()
+        if normalized_text in TRUE_TEXT_VALUES:
+            return True
+        if normalized_text in FALSE_TEXT_VALUES:
+            return False
+    return argument_value
+
+
+ARGUMENT_COERCER_BY_JSON_SCHEMA_TYPE: dict[str, ArgumentCoercer] = {
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+}
+
+
+def _read_docstring_summary(tool_function: Callable[..., Any]) -> str:
+    docstring = inspect.getdoc(tool_function) or ""
+    return docstring.splitlines()[0] if docstring else ""
+
+
+BUILTIN_TOOL_REGISTRY = ToolRegistry(
+    tool_module_names=(f"{__package__}.tools",),
+    dependency_parameter_names=frozenset({"dummy_data_stores"}),
+)
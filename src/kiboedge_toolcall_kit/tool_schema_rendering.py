@@ -0,0 +1,128 @@
+"""Responsibility: render the tool list in cheaper forms to shrink the prompt the model must prefill."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import threading
+from typing import Any, Callable
+
+from .tool_schemas import build_tool_set_fingerprint
+
+FULL_TOOL_SCHEMA_RENDERING = "full"
+DESCRIPTION_FREE_TOOL_SCHEMA_RENDERING = "description_free"
+MINIFIED_TOOL_SCHEMA_RENDERING = "minified"
+SIGNATURE_TEXT_TOOL_SCHEMA_RENDERING = "signature_text"
+MINIFIED_DROPPED_SCHEMA_KEYS = frozenset({"description", "additionalProperties", "title"})
+
+
+@dataclass(frozen=True)
+class RenderedToolSet:
+    """What the engine sends for one rendering: the ``tools`` list, its tool_choice and system prompt text."""
+
+    rendering_name: str
+    request_tool_schemas: list[dict[str, Any]]
+    request_tool_choice: str
+    system_prompt_suffix: str
+
+    @property
+    def rendered_character_count(self) -> int:
+        """Approximate prompt cost: serialized tools list plus the injected prompt text."""
+        serialized_tool_schemas = json.dumps(self.request_tool_schemas, ensure_ascii=False) if self.request_tool_schemas else ""
+        return len(serialized_tool_schemas) + len(self.system_prompt_suffix)
+
+
+def _render_full(tool_schemas: list[dict[str, Any]]) -> RenderedToolSet:
+    return RenderedToolSet(FULL_TOOL_SCHEMA_RENDERING, tool_schemas, "auto", "")
+
+
+def _render_description_free(tool_schemas: list[dict[str, Any]]) -> RenderedToolSet:
+    return RenderedToolSet(
+        DESCRIPTION_FREE_TOOL_SCHEMA_RENDERING,
+        [_drop_schema_keys(tool_schema, frozenset({"description"})) for tool_schema in tool_schemas],
+        "auto",
+        "",
+    )
+
+
+def _render_minified(tool_schemas: list[dict[str, Any]]) -> RenderedToolSet:
+    # The server serializes `tools` into the chat template itself, so minifying means sending fewer keys.
+    return RenderedToolSet(
+        MINIFIED_TOOL_SCHEMA_RENDERING,
+        [_drop_schema_keys(tool_schema, MINIFIED_DROPPED_SCHEMA_KEYS) for tool_schema in tool_schemas],
+        "auto",
+        "",
+    )
+
+
+def _render_signature_text(tool_schemas: list[dict[str, Any]]) -> RenderedToolSet:
+    # No native tools list: the model answers in text and the parser's content fallbacks extract the call.
+    # The empty list makes LmStudioChatClient omit tools and tool_choice, which strict servers require.
+    signature_lines = [_build_tool_signature_line(tool_schema) for tool_schema in tool_schemas]
+    system_prompt_suffix = (
+        "\nTools (name(argument: type), ? marks optional):\n"
+        + "\n".join(signature_lines)
+        + '\nTo call a tool reply only with {"name":"tool_name","arguments":{...}}.\n'
+    )
+    return RenderedToolSet(SIGNATURE_TEXT_TOOL_SCHEMA_RENDERING, [], "none", system_prompt_suffix)
+
+
+TOOL_SCHEMA_RENDERERS: dict[str, Callable[[list[dict[str, Any]]], RenderedToolSet]] = {
+    FULL_TOOL_SCHEMA_RENDERING: _render_full,
+    DESCRIPTION_FREE_TOOL_SCHEMA_RENDERING: _render_description_free,
+    MINIFIED_TOOL_SCHEMA_RENDERING: _render_minified,
+    SIGNATURE_TEXT_TOOL_SCHEMA_RENDERING: _render_signature_text,
+}
+
+_rendered_tool_set_cache_lock = threading.Lock()
+_rendered_tool_sets_by_key: dict[tuple[str, str], RenderedToolSet] = {}
+
+
+def render_tool_set(tool_schemas: list[dict[str, Any]], rendering_name: str) -> RenderedToolSet:
+    """Render ``tool_schemas`` once per (rendering, schema set) and share the result across engines."""
+    # Guard: unknown renderings should fail loudly before any model request is made.
+    if rendering_name not in TOOL_SCHEMA_RENDERERS:
+        known_rendering_names = ", ".join(sorted(TOOL_SCHEMA_RENDERERS))
+        raise ValueError(f"Unknown tool schema rendering: {rendering_name} (known: {known_rendering_names})")
+
+    cache_key = (rendering_name, build_tool_set_fingerprint(tool_schemas))
+    with _rendered_tool_set_cache_lock:
+        rendered_tool_set = _rendered_tool_sets_by_key.get(cache_key)
+        if rendered_tool_set is None:
+            rendered_tool_set = TOOL_SCHEMA_RENDERERS[rendering_name](tool_schemas)
+            _rendered_tool_sets_by_key[cache_key] = rendered_tool_set
+        return rendered_tool_set
+
+
+def _drop_schema_keys(schema_node: Any, dropped_key_names: frozenset[str]) -> Any:
+    if isinstance(schema_node, list):
+        return [_drop_schema_keys(child_node, dropped_key_names) for child_node in schema_node]
+    if not isinstance(schema_node, dict):
+        return schema_node
+
+    pruned_schema_node: dict[str, Any] = {}
+    for key_name, child_node in schema_node.items():
+        if key_name == "properties" and isinstance(child_node, dict):
+            # Keys under `properties` are argument names (possibly "description"), never schema keywords.
+            pruned_schema_node[key_name] = {
+                property_name: _drop_schema_keys(property_schema, dropped_key_names)
+                for property_name, property_schema in child_node.items()
+            }
+        elif key_name not in dropped_key_names:
+            pruned_schema_node[key_name] = _drop_schema_keys(child_node, dropped_key_names)
+    return pruned_schema_node
+
+
+def _build_tool_signature_line(tool_schema: dict[str, Any]) -> str:
+    function_schema = tool_schema["function"]
+    parameters_schema = function_schema.get("parameters", {})
+    required_argument_names = set(parameters_schema.get("required", []))
+    argument_signatures = []
+    for argument_name, argument_schema in parameters_schema.get("properties", {}).items():
+        optional_marker = "" if argument_name in required_argument_names else "?"
+        if "enum" in argument_schema:
+            argument_type_text = "|".join(str(enum_value) for enum_value in argument_schema["enum"])
+        else:
+            argument_type_text = str(argument_schema.get("type", "any"))
+        argument_signatures.append(f"{argument_name}{optional_marker}: {argument_type_text}")
+    return f"{function_schema['name']}({', '.join(argument_signatures)})"
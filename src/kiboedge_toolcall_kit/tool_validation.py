@@ -1,48 +1,132 @@
 """Responsibility: validate parsed tool calls against available schemas and expectations."""
 
+from collections import OrderedDict
+import difflib
+import threading
 from typing import Any
 
-from .models import ToolValidationResult
+from .models import ToolCallViolationReport, ToolValidationResult
+
+MAX_CACHED_COMPILED_TOOL_SCHEMA_LISTS = 32
+
+
+class CompiledToolSchemas:
+    """Name lookup prepared once per tool schema list instead of on every validation."""
+
+    def __init__(self, tool_schemas: list[dict[str, Any]]) -> None:
+        self.tool_schemas = tool_schemas
+        self.tool_schema_by_name: dict[str, dict[str, Any]] = {
+            tool_schema["function"]["name"]: tool_schema for tool_schema in tool_schemas
+        }
+        self.parameters_schema_by_name: dict[str, dict[str, Any]] = {
+            tool_schema["function"]["name"]: tool_schema["function"]["parameters"] for tool_schema in tool_schemas
+        }
+        self.tool_names = list(self.parameters_schema_by_name)
+
+
+ToolSchemaSource = list[dict[str, Any]] | CompiledToolSchemas
+
+_compiled_tool_schemas_lock = threading.Lock()
+_compiled_tool_schemas_by_list_identifier: OrderedDict[int, CompiledToolSchemas] = OrderedDict()
+
+
+def compile_tool_schemas(tool_schemas: ToolSchemaSource) -> CompiledToolSchemas:
+    """Return the compiled lookups for ``tool_schemas``, reused while the same list object is passed."""
+    if isinstance(tool_schemas, CompiledToolSchemas):
+        return tool_schemas
+
+    with _compiled_tool_schemas_lock:
+        compiled_tool_schemas = _compiled_tool_schemas_by_list_identifier.get(id(tool_schemas))
+        # Guard: the cached entry keeps its list alive, so a matching id is the same list object.
+        if compiled_tool_schemas is not None and compiled_tool_schemas.tool_schemas is tool_schemas:
+            _compiled_tool_schemas_by_list_identifier.move_to_end(id(tool_schemas))
+            return compiled_tool_schemas
+
+        compiled_tool_schemas = CompiledToolSchemas(tool_schemas)
+        _compiled_tool_schemas_by_list_identifier[id(tool_schemas)] = compiled_tool_schemas
+        if len(_compiled_tool_schemas_by_list_identifier) > MAX_CACHED_COMPILED_TOOL_SCHEMA_LISTS:
+            _compiled_tool_schemas_by_list_identifier.popitem(last=False)
+        return compiled_tool_schemas
 
 
 def validate_tool_call_against_schema(
     tool_name: str,
     arguments: dict[str, Any],
-    tool_schemas: list[dict[str, Any]],
+    tool_schemas: ToolSchemaSource,
+    enforce_enum_values: bool = False,
 ) -> ToolValidationResult:
-    schema_by_name = _build_schema_by_name(tool_schemas)
+    violation_report = describe_tool_call_violations(tool_name, arguments, tool_schemas, enforce_enum_values)
+    if violation_report.failure_reason is None:
+        return ToolValidationResult(True, None, tool_name)
+    matched_tool_name = None if violation_report.failure_reason == "hallucinated_tool" else tool_name
+    return ToolValidationResult(False, violation_report.failure_reason, matched_tool_name)
+
+
+def describe_tool_call_violations(
+    tool_name: str,
+    arguments: dict[str, Any],
+    tool_schemas: ToolSchemaSource,
+    enforce_enum_values: bool = False,
+) -> ToolCallViolationReport:
+    """Collect every violation of one call; ``failure_reason`` is None when the call is valid.
+
+    Out-of-enum values are always reported in ``invalid_enum_values`` (the repair prompt quotes
+    them) but only fail the call when ``enforce_enum_values`` is set, so the default keeps the
+    historical strict-success definition.
+    """
+    compiled_tool_schemas = compile_tool_schemas(tool_schemas)
+    schema_by_name = compiled_tool_schemas.parameters_schema_by_name
     if tool_name not in schema_by_name:
-        return ToolValidationResult(False, "hallucinated_tool", None)
+        nearest_tool_names = difflib.get_close_matches(tool_name, compiled_tool_schemas.tool_names, n=1, cutoff=0.6)
+        return ToolCallViolationReport(
+            failure_reason="hallucinated_tool",
+            tool_name=tool_name,
+            nearest_tool_name=nearest_tool_names[0] if nearest_tool_names else None,
+        )
 
     schema = schema_by_name[tool_name]
     if not isinstance(arguments, dict):
-        return ToolValidationResult(False, "schema_mismatch", tool_name)
+        return ToolCallViolationReport("schema_mismatch", tool_name, is_arguments_object=False)
 
     required_argument_names: list[str] = schema["required"]
     properties: dict[str, Any] = schema["properties"]
 
-    missing_required_argument_names = [
+    missing_argument_names = [
         required_argument_name
         for required_argument_name in required_argument_names
         if required_argument_name not in arguments
     ]
-    if missing_required_argument_names:
-        return ToolValidationResult(False, "missing_required", tool_name)
-
+    unknown_argument_names: list[str] = []
     if not schema.get("additionalProperties", True):
         unknown_argument_names = [argument_name for argument_name in arguments if argument_name not in properties]
-        if unknown_argument_names:
-            return ToolValidationResult(False, "schema_mismatch", tool_name)
 
+    mistyped_argument_names: list[str] = []
+    invalid_enum_values: dict[str, tuple[Any, list[Any]]] = {}
     for argument_name, argument_value in arguments.items():
         if argument_name not in properties:
             continue
 
-        expected_type_name = properties[argument_name].get("type")
-        if not _is_argument_type_valid(argument_value, expected_type_name):
-            return ToolValidationResult(False, "schema_mismatch", tool_name)
-
-    return ToolValidationResult(True, None, tool_name)
+        property_schema = properties[argument_name]
+        if not _is_argument_type_valid(argument_value, property_schema.get("type")):
+            mistyped_argument_names.append(argument_name)
+        elif "enum" in property_schema and argument_value not in property_schema["enum"]:
+            invalid_enum_values[argument_name] = (argument_value, list(property_schema["enum"]))
+
+    # Precedence matches the historical single-reason checks: missing keys first, then shape.
+    failure_reason = None
+    if missing_argument_names:
+        failure_reason = "missing_required"
+    elif unknown_argument_names or mistyped_argument_names or (enforce_enum_values and invalid_enum_values):
+        failure_reason = "schema_mismatch"
+
+    return ToolCallViolationReport(
+        failure_reason=failure_reason,
+        tool_name=tool_name,
+        missing_argument_names=missing_argument_names,
+        unknown_argument_names=unknown_argument_names,
+        mistyped_argument_names=mistyped_argument_names,
+        invalid_enum_values=invalid_enum_values,
+    )
 
 
 def validate_case_expected_result(
@@ -54,13 +138,6 @@ def validate_case_expected_result(
     return ToolValidationResult(True, None, parsed_tool_name)
 
 
-def _build_schema_by_name(tool_schemas: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    return {
-        tool_schema["function"]["name"]: tool_schema["function"]["parameters"]
-        for tool_schema in tool_schemas
-    }
-
-
 def _is_argument_type_valid(argument_value: Any, expected_type_name: str | None) -> bool:
     if expected_type_name is None:
         return True
@@ -75,4 +152,6 @@ def _is_argument_type_valid(argument_value: Any, expected_type_name: str | None)
         return isinstance(argument_value, int)
     if expected_type_name == "boolean":
         return isinstance(argument_value, bool)
+    if expected_type_name == "array":
+        return isinstance(argument_value, list)
     return True
@@ -1,10 +1,12 @@
 """Responsibility: provide dummy tool implementations for local deterministic evaluation."""
 
-from dataclasses import dataclass, field
-from typing import Any, Callable
+from __future__ import annotations
 
+from dataclasses import dataclass, field
+from typing import Any, Literal
 
-ToolFunction = Callable[[dict[str, Any]], dict[str, Any]]
+from .tool_execution import ToolExecutionLanes
+from .tool_registry import BUILTIN_TOOL_REGISTRY, ToolFunction
 
 
 @dataclass
@@ -16,105 +18,122 @@ class DummyDataStores:
     database_tables: dict[str, dict[str, Any]] = field(default_factory=dict)
 
 
-def build_tool_executor_map(dummy_data_stores: DummyDataStores) -> dict[str, ToolFunction]:
-    """Create executable tool map."""
-    return {
-        "play_sound_effect": _execute_play_sound_effect,
-        "create_calendar_event": lambda arguments: _execute_create_calendar_event(arguments, dummy_data_stores),
-        "read_calendar_events": lambda arguments: _execute_read_calendar_events(arguments, dummy_data_stores),
-        "create_todo_task": lambda arguments: _execute_create_todo_task(arguments, dummy_data_stores),
-        "read_todo_tasks": lambda arguments: _execute_read_todo_tasks(arguments, dummy_data_stores),
-        "get_weather": _execute_get_weather,
-        "get_news": _execute_get_news,
-        "read_database_record": lambda arguments: _execute_read_database_record(arguments, dummy_data_stores),
-        "write_database_record": lambda arguments: _execute_write_database_record(arguments, dummy_data_stores),
-    }
+def build_tool_executor_map(
+    dummy_data_stores: DummyDataStores,
+    tool_execution_lanes: ToolExecutionLanes | None = None,
+) -> dict[str, ToolFunction]:
+    """Create executable tool map; ``tool_execution_lanes`` moves heavy tools off the engine thread."""
+    return BUILTIN_TOOL_REGISTRY.build_tool_executor_map(
+        tool_execution_lanes=tool_execution_lanes,
+        dummy_data_stores=dummy_data_stores,
+    )
 
 
-def _execute_play_sound_effect(arguments: dict[str, Any]) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Return a sound event to express emotion at appropriate timing.")
+def play_sound_effect(event_name: str, intensity: Literal["low", "medium", "high"]) -> dict[str, Any]:
     return {
         "status": "ok",
-        "event_name": arguments["event_name"],
-        "intensity": arguments["intensity"],
+        "event_name": event_name,
+        "intensity": intensity,
         "playback_mode": "event_only",
     }
 
 
-def _execute_create_calendar_event(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Create a calendar event in the dummy calendar store.")
+def create_calendar_event(
+    title: str,
+    start_datetime: str,
+    end_datetime: str,
+    location: str = "",
+    *,
+    dummy_data_stores: DummyDataStores,
+) -> dict[str, Any]:
     calendar_event = {
-        "title": arguments["title"],
-        "start_datetime": arguments["start_datetime"],
-        "end_datetime": arguments["end_datetime"],
-        "location": arguments.get("location", ""),
+        "title": title,
+        "start_datetime": start_datetime,
+        "end_datetime": end_datetime,
+        "location": location,
     }
     dummy_data_stores.calendar_events.append(calendar_event)
     return {"status": "ok", "created_event": calendar_event}
 
 
-def _execute_read_calendar_events(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Read calendar events by date range.", read_only=True)
+def read_calendar_events(start_date: str, end_date: str, *, dummy_data_stores: DummyDataStores) -> dict[str, Any]:
     return {
         "status": "ok",
-        "start_date": arguments["start_date"],
-        "end_date": arguments["end_date"],
+        "start_date": start_date,
+        "end_date": end_date,
         "events": dummy_data_stores.calendar_events,
     }
 
 
-def _execute_create_todo_task(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Create a task in the dummy todo store.")
+def create_todo_task(
+    task_title: str,
+    priority: Literal["low", "normal", "high"],
+    due_date: str = "",
+    *,
+    dummy_data_stores: DummyDataStores,
+) -> dict[str, Any]:
     todo_task = {
-        "task_title": arguments["task_title"],
-        "priority": arguments["priority"],
-        "due_date": arguments.get("due_date", ""),
+        "task_title": task_title,
+        "priority": priority,
+        "due_date": due_date,
         "status": "open",
     }
     dummy_data_stores.todo_tasks.append(todo_task)
     return {"status": "ok", "created_task": todo_task}
 
 
-def _execute_read_todo_tasks(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
-    task_status = arguments["status"]
-    filter_text = arguments.get("filter_text", "").strip().lower()
-    if task_status == "all":
+@BUILTIN_TOOL_REGISTRY.tool("Read tasks from the dummy todo store by filter.", read_only=True)
+def read_todo_tasks(
+    *,
+    filter_text: str = "",
+    status: Literal["open", "done", "all"],
+    dummy_data_stores: DummyDataStores,
+) -> dict[str, Any]:
+    normalized_filter_text = filter_text.strip().lower()
+    if status == "all":
         candidate_tasks = dummy_data_stores.todo_tasks
     else:
-        candidate_tasks = [
-            todo_task for todo_task in dummy_data_stores.todo_tasks if todo_task["status"] == task_status
-        ]
+        candidate_tasks = [todo_task for todo_task in dummy_data_stores.todo_tasks if todo_task["status"] == status]
 
-    if not filter_text:
+    if not normalized_filter_text:
         return {"status": "ok", "tasks": candidate_tasks}
 
     filtered_tasks = [
-        todo_task for todo_task in candidate_tasks if filter_text in todo_task["task_title"].lower()
+        todo_task for todo_task in candidate_tasks if normalized_filter_text in todo_task["task_title"].lower()
     ]
     return {"status": "ok", "tasks": filtered_tasks}
 
 
-def _execute_get_weather(arguments: dict[str, Any]) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Read weather from a dummy provider.", read_only=True)
+def get_weather(location: str, date: str) -> dict[str, Any]:
     return {
         "status": "ok",
-        "location": arguments["location"],
-        "date": arguments["date"],
+        "location": location,
+        "date": date,
         "forecast": "sunny",
         "temperature_celsius": 22,
     }
 
 
-def _execute_get_news(arguments: dict[str, Any]) -> dict[str, Any]:
+@BUILTIN_TOOL_REGISTRY.tool("Read news from a dummy provider.", read_only=True)
+def get_news(topic: str, timeframe: str) -> dict[str, Any]:
     return {
         "status": "ok",
-        "topic": arguments["topic"],
-        "timeframe": arguments["timeframe"],
+        "topic": topic,
+        "timeframe": timeframe,
         "headlines": [
-            f"Dummy headline about {arguments['topic']} (1)",
-            f"Dummy headline about {arguments['topic']} (2)",
+            f"Dummy headline about {topic} (1)",
+            f"Dummy headline about {topic} (2)",
         ],
     }
 
 
-def _execute_read_database_record(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
-    table_name = arguments["table_name"]
-    key = arguments["key"]
+@BUILTIN_TOOL_REGISTRY.tool("Read one record from a dummy key-value database.", read_only=True)
+def read_database_record(table_name: str, key: str, *, dummy_data_stores: DummyDataStores) -> dict[str, Any]:
     if table_name not in dummy_data_stores.database_tables:
         return {"status": "not_found", "table_name": table_name, "key": key, "payload": None}
 
@@ -125,13 +144,19 @@ def _execute_read_database_record(arguments: dict[str, Any], dummy_data_stores:
     return {"status": "ok", "table_name": table_name, "key": key, "payload": payload}
 
 
-def _execute_write_database_record(arguments: dict[str, Any], dummy_data_stores: DummyDataStores) -> dict[str, Any]:
-    table_name = arguments["table_name"]
-    key = arguments["key"]
-    payload = arguments["payload"]
-
+@BUILTIN_TOOL_REGISTRY.tool("Write one record into a dummy key-value database.")
+def write_database_record(
+    table_name: str,
+    key: str,
+    payload: dict[str, Any],
+    *,
+    dummy_data_stores: DummyDataStores,
+) -> dict[str, Any]:
     if table_name not in dummy_data_stores.database_tables:
         dummy_data_stores.database_tables[table_name] = {}
 
     dummy_data_stores.database_tables[table_name][key] = payload
     return {"status": "ok", "table_name": table_name, "key": key}
+
+
+READ_ONLY_TOOL_NAMES = BUILTIN_TOOL_REGISTRY.read_only_tool_names
@@ -0,0 +1,269 @@
+"""Responsibility: write per-request runtime traces from a background thread into rotating gzip JSONL files."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+import gzip
+import json
+from pathlib import Path
+import queue
+import random
+import threading
+import time
+from typing import Any
+
+from .config import RuntimeConfiguration
+from .io_utils import build_timestamp_suffix
+from .models import EngineRoundResult
+
+OVERLOAD_QUEUE_FILL_RATIO = 0.75
+
+_CLOSE_SENTINEL = object()
+
+
+@dataclass(frozen=True)
+class TraceLoggerStats:
+    """Counters of one ``RuntimeTraceLogger``; dropped and sampled-out records never reached disk."""
+
+    accepted_record_count: int
+    sampled_out_record_count: int
+    dropped_record_count: int
+    written_record_count: int
+    write_error_count: int
+    current_file_path: str | None
+
+
+class RuntimeTraceLogger:
+    """Non-blocking trace sink for ``ToolCallEngine``.
+
+    ``record_engine_round`` only enqueues shallow snapshots; JSON encoding, compression and
+    file I/O happen on one daemon thread. Each batch is appended as its own gzip member, so a crash
+    loses at most the batch in flight and ``gzip.open`` still reads every earlier record.
+    When the queue is more than 75% full only ``overload_sample_rate`` of new records are
+    kept; when it is full they are dropped. The engine is never made to wait.
+    """
+
+    def __init__(
+        self,
+        trace_directory_path: str,
+        queue_capacity: int = 1024,
+        batch_size: int = 64,
+        flush_interval_seconds: float = 1.0,
+        max_file_bytes: int = 16 * 1024 * 1024,
+        max_file_count: int = 20,
+        overload_sample_rate: float = 0.1,
+    ) -> None:
+        self._trace_directory_path = Path(trace_directory_path)
+        self._record_queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, queue_capacity))
+        self._overload_queue_depth = max(1, int(queue_capacity * OVERLOAD_QUEUE_FILL_RATIO))
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_file_bytes = max_file_bytes
+        self._max_file_count = max(1, max_file_count)
+        self._overload_sample_rate = overload_sample_rate
+        self._counter_lock = threading.Lock()
+        self._accepted_record_count = 0
+        self._sampled_out_record_count = 0
+        self._dropped_record_count = 0
+        self._written_record_count = 0
+        self._write_error_count = 0
+        self._written_file_paths: list[Path] = []
+        self._created_file_count = 0
+        self._current_file_bytes = 0
+        self._is_closed = False
+        self._writer_thread = threading.Thread(target=self._run_writer, name="trace-log-writer", daemon=True)
+        self._writer_thread.start()
+
+    @property
+    def stats(self) -> TraceLoggerStats:
+        with self._counter_lock:
+            return TraceLoggerStats(
+                accepted_record_count=self._accepted_record_count,
+                sampled_out_record_count=self._sampled_out_record_count,
+                dropped_record_count=self._dropped_record_count,
+                written_record_count=self._written_record_count,
+                write_error_count=self._write_error_count,
+                current_file_path=str(self._written_file_paths[-1]) if self._written_file_paths else None,
+            )
+
+    def record_engine_round(
+        self,
+        user_prompt: str,
+        messages: list[dict[str, Any]],
+        engine_round_result: EngineRoundResult | None,
+        latency_seconds: float,
+        error_text: str | None = None,
+    ) -> bool:
+        """Queue one round's trace without blocking; False when it was sampled out or dropped."""
+        # Guard: records arriving after close would never be written.
+        if self._is_closed:
+            return False
+
+        if self._record_queue.qsize() >= self._overload_queue_depth and random.random() >= self._overload_sample_rate:
+            with self._counter_lock:
+                self._sampled_out_record_count += 1
+            return False
+
+        try:
+            # Snapshot: tool results can hold live store lists (e.g. calendar events) that keep changing.
+            self._record_queue.put_nowait(
+                (
+                    time.time(),
+                    user_prompt,
+                    list(messages),
+                    _snapshot_engine_round_result(engine_round_result),
+                    latency_seconds,
+                    error_text,
+                )
+            )
+        except queue.Full:
+            with self._counter_lock:
+                self._dropped_record_count += 1
+            return False
+
+        with self._counter_lock:
+            self._accepted_record_count += 1
+        return True
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer thread."""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        # Guard: a full queue drains while the writer is alive; a dead writer must not block close forever.
+        while self._writer_thread.is_alive():
+            try:
+                self._record_queue.put(_CLOSE_SENTINEL, timeout=self._flush_interval_seconds)
+                break
+            except queue.Full:
+                continue
+        self._writer_thread.join()
+
+    def __enter__(self) -> RuntimeTraceLogger:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def _run_writer(self) -> None:
+        pending_records: list[tuple[Any, ...]] = []
+        flush_deadline = time.monotonic() + self._flush_interval_seconds
+        while True:
+            try:
+                queued_item = self._record_queue.get(timeout=max(0.0, flush_deadline - time.monotonic()))
+            except queue.Empty:
+                queued_item = None
+
+            if queued_item is _CLOSE_SENTINEL:
+                self._write_batch(pending_records)
+                return
+            if queued_item is not None:
+                pending_records.append(queued_item)
+
+            if len(pending_records) >= self._batch_size or time.monotonic() >= flush_deadline:
+                self._write_batch(pending_records)
+                pending_records = []
+                flush_deadline = time.monotonic() + self._flush_interval_seconds
+
+    def _write_batch(self, pending_records: list[tuple[Any, ...]]) -> None:
+        if not pending_records:
+            return
+
+        try:
+            encoded_lines = "".join(
+                json.dumps(_build_trace_payload(*pending_record), ensure_ascii=False, default=str) + "\n"
+                for pending_record in pending_records
+            )
+            compressed_member = gzip.compress(encoded_lines.encode("utf-8"))
+            trace_file_path = self._resolve_trace_file_path(len(compressed_member))
+            with trace_file_path.open(mode="ab") as trace_file:
+                trace_file.write(compressed_member)
+            self._current_file_bytes += len(compressed_member)
+        except Exception:
+            # Guard: tracing must never take the engine down; a failed batch is counted and skipped.
+            with self._counter_lock:
+                self._write_error_count += 1
+            return
+
+        with self._counter_lock:
+            self._written_record_count += len(pending_records)
+
+    def _resolve_trace_file_path(self, next_member_bytes: int) -> Path:
+        if self._written_file_paths and self._current_file_bytes + next_member_bytes <= self._max_file_bytes:
+            return self._written_file_paths[-1]
+
+        self._trace_directory_path.mkdir(parents=True, exist_ok=True)
+        trace_file_path = (
+            self._trace_directory_path / f"trace_{build_timestamp_suffix()}_{self._created_file_count:05d}.jsonl.gz"
+        )
+        with self._counter_lock:
+            self._written_file_paths.append(trace_file_path)
+        self._created_file_count += 1
+        self._current_file_bytes = 0
+        # Rotation: only files written by this logger are removed, oldest first.
+        while len(self._written_file_paths) > self._max_file_count:
+            with self._counter_lock:
+                expired_file_path = self._written_file_paths.pop(0)
+            expired_file_path.unlink(missing_ok=True)
+        return trace_file_path
+
+
+def _snapshot_engine_round_result(engine_round_result: EngineRoundResult | None) -> EngineRoundResult | None:
+    if engine_round_result is None:
+        return None
+    tool_result = engine_round_result.tool_result
+    return replace(
+        engine_round_result,
+        tool_result=(
+            {
+                result_key: list(result_value) if isinstance(result_value, list) else result_value
+                for result_key, result_value in tool_result.items()
+            }
+            if tool_result is not None
+            else None
+        ),
+        executed_tool_calls=list(engine_round_result.executed_tool_calls),
+    )
+
+
+def _build_trace_payload(
+    recorded_time: float,
+    user_prompt: str,
+    messages: list[dict[str, Any]],
+    engine_round_result: EngineRoundResult | None,
+    latency_seconds: float,
+    error_text: str | None,
+) -> dict[str, Any]:
+    trace_payload: dict[str, Any] = {
+        "timestamp": datetime.fromtimestamp(recorded_time, tz=timezone.utc).isoformat(),
+        "user_prompt": user_prompt,
+        "latency_seconds": latency_seconds,
+        # The system prompt is identical for every request of an engine, so it is not repeated here.
+        "messages": [message for message in messages if message.get("role") != "system"],
+    }
+    if engine_round_result is not None:
+        trace_payload.update(engine_round_result.to_dict())
+        trace_payload["executed_tool_calls"] = [
+            asdict(executed_tool_call) for executed_tool_call in engine_round_result.executed_tool_calls
+        ]
+        trace_payload["stage_timings_seconds"] = engine_round_result.stage_timings_seconds
+        trace_payload["token_usage"] = engine_round_result.token_usage
+    else:
+        trace_payload.update({"is_success": False, "failure_reason": "request_error", "error": error_text})
+    return trace_payload
+
+
+def build_runtime_trace_logger(runtime_configuration: RuntimeConfiguration) -> RuntimeTraceLogger | None:
+    """Create the trace logger under ``<log_directory_path>/traces``, or None when tracing is off."""
+    if not runtime_configuration.trace_logging_enabled:
+        return None
+    return RuntimeTraceLogger(
+        trace_directory_path=f"{runtime_configuration.log_directory_path}/traces",
+        queue_capacity=runtime_configuration.trace_queue_capacity,
+        batch_size=runtime_configuration.trace_batch_size,
+        flush_interval_seconds=runtime_configuration.trace_flush_interval_seconds,
+        max_file_bytes=runtime_configuration.trace_max_file_bytes,
+        max_file_count=runtime_configuration.trace_max_file_count,
+        overload_sample_rate=runtime_configuration.trace_overload_sample_rate,
+    )